@@ -1,19 +1,108 @@
 import os
+import re
+import copy
+import hashlib
 import logging
 import random
 import json
-from groq import Groq
+import secrets
+import string
+import time
 from translations import localize_suggestions
+from suggestion_cache import SuggestionCache
+from llm_client import CircuitBreaker, LLMUnavailable, ResilientLLMClient
+from llm_providers import build_client, model_name, provider_name
+from single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-# Use Groq's LLama model for better performance
-MODEL = "llama3-70b-8192"
+# The LLM behind the suggestions (Groq's Llama model by default, see llm_providers)
+LLM_PROVIDER = provider_name()
+MODEL = model_name(LLM_PROVIDER)
 
-# Initialize Groq client with the provided API key
-GROQ_API_KEY = "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"
-# Create Groq client
-groq_client = Groq(api_key=GROQ_API_KEY)
+_llm_max_concurrency = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+provider_client = build_client(LLM_PROVIDER, max_connections=_llm_max_concurrency)
+# Deadline, concurrency limit and circuit breaker for every LLM call;
+# None when the provider is the rule-based fallback
+llm_client = None if provider_client is None else ResilientLLMClient(
+    provider_client,
+    deadline_seconds=float(os.environ.get('LLM_TIMEOUT_SECONDS', 8)),
+    max_concurrency=_llm_max_concurrency,
+    max_queue_seconds=float(os.environ.get('LLM_QUEUE_SECONDS', 1)),
+    retries=int(os.environ.get('LLM_RETRIES', 1)),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get('LLM_BREAKER_FAILURES', 5)),
+        reset_seconds=float(os.environ.get('LLM_BREAKER_RESET_SECONDS', 30))
+    )
+)
+
+# Responses reused for passwords with the same weakness profile; size 0 disables it
+_suggestion_cache_size = int(os.environ.get('SUGGESTION_CACHE_SIZE', 2000))
+suggestion_cache = SuggestionCache(
+    _suggestion_cache_size, float(os.environ.get('SUGGESTION_CACHE_TTL', 86400))
+) if _suggestion_cache_size > 0 else None
+
+# Identical requests arriving together share one LLM call
+suggestion_flights = SingleFlight()
+
+SYSTEM_PROMPT = (
+    "You are a password security expert. Your task is to analyze passwords and suggest improvements. "
+    "Always respond with a JSON object containing fields for 'improved_password', 'reasoning', and 'vulnerability_details'."
+)
+
+# Fields worth showing while they are still being written; a half-written
+# improved_password is never shown, since it could be copied
+PROGRESSIVE_FIELDS = ('reasoning', 'vulnerability_details')
+
+# A key at the start of the next member of a JSON object
+_JSON_KEY = re.compile(r'\s*,?\s*"((?:[^"\\]|\\.)*)"\s*:\s*')
+_JSON_SEPARATOR = re.compile(r'\s*,?\s*')
+_JSON_DECODER = json.JSONDecoder()
+
+def _generated_password(length=16):
+    """A random password with every character class, for suggestions served from the cache"""
+    alphabet = string.ascii_letters + string.digits + string.punctuation
+    while True:
+        candidate = ''.join(secrets.choice(alphabet) for _ in range(length))
+        if all(any(c in chars for c in candidate)
+               for chars in (string.ascii_lowercase, string.ascii_uppercase, string.digits, string.punctuation)):
+            return candidate
+
+def _cached_suggestions(password, analysis_results, language):
+    """Suggestions from a stored response for the same weakness profile, or None"""
+    if suggestion_cache is None:
+        return None
+    return suggestion_cache.get(password, analysis_results, language, _generated_password)
+
+def _remember(password, analysis_results, language, suggestions, seconds, parsed):
+    if suggestion_cache is not None:
+        suggestion_cache.record_llm_call(seconds)
+        # Fallback output would be replayed for every password with this profile
+        if parsed:
+            suggestion_cache.put(password, analysis_results, language, suggestions)
+
+def _messages(password, analysis_results, language):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": _build_prompt(password, analysis_results, language)}
+    ]
+
+def _flight_key(password, analysis_results, language):
+    """Identifies requests that would send the LLM the same prompt"""
+    request = json.dumps([MODEL, _messages(password, analysis_results, language), language])
+    return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+def _flight_timeout():
+    """How long requests joining an identical one wait for it: the LLM call's deadline"""
+    return None if llm_client is None else llm_client.deadline_seconds
+
+def _shared_result(future, password, analysis_results, language):
+    """A waiter's own copy of the result of the identical request it joined"""
+    try:
+        return copy.deepcopy(suggestion_flights.wait(future))
+    except Exception as e:
+        logger.warning(f"Shared AI suggestion request failed, using fallback: {e}")
+        return localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
 
 def get_ai_suggestions(password, analysis_results, language='en'):
     """
@@ -27,28 +116,213 @@ def get_ai_suggestions(password, analysis_results, language='en'):
     Returns:
         Dictionary with suggestions and reasoning, localized to the specified language
     """
+    cached = _cached_suggestions(password, analysis_results, language)
+    if cached is not None:
+        return cached
+    
+    # Each caller gets its own copy of a result shared with identical requests
     try:
-        # Build a prompt based on the analysis results
-        prompt = _build_prompt(password, analysis_results, language)
-        
-        # Make the API call with Groq
-        response = groq_client.chat.completions.create(
+        return copy.deepcopy(suggestion_flights.do(
+            _flight_key(password, analysis_results, language),
+            lambda: _fetch_suggestions(password, analysis_results, language),
+            _flight_timeout()
+        ))
+    except LLMUnavailable as e:
+        logger.warning(f"Shared AI suggestion request timed out, using fallback: {e}")
+        return localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+
+async def get_ai_suggestions_async(password, analysis_results, language='en'):
+    """
+    get_ai_suggestions for asyncio callers
+    
+    The LLM call runs in the default executor, and coroutines and threads
+    asking for the same prompt at the same time share a single call.
+    """
+    cached = _cached_suggestions(password, analysis_results, language)
+    if cached is not None:
+        return cached
+    
+    try:
+        return copy.deepcopy(await suggestion_flights.do_async(
+            _flight_key(password, analysis_results, language),
+            lambda: _fetch_suggestions(password, analysis_results, language),
+            _flight_timeout()
+        ))
+    except LLMUnavailable as e:
+        logger.warning(f"Shared AI suggestion request timed out, using fallback: {e}")
+        return localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+
+def _fetch_suggestions(password, analysis_results, language):
+    """One LLM call for get_ai_suggestions, falling back to rule-based suggestions"""
+    if llm_client is None:
+        return localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+    
+    try:
+        # Make the API call
+        start = time.perf_counter()
+        content = llm_client.complete(
             model=MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a password security expert. Your task is to analyze passwords and suggest improvements. "
-                    "Always respond with a JSON object containing fields for 'improved_password', 'reasoning', and 'vulnerability_details'."
-                },
-                {"role": "user", "content": prompt}
-            ],
+            messages=_messages(password, analysis_results, language),
             temperature=0.7,
             max_tokens=500
         )
         
         # Parse the response
-        suggestions = response.choices[0].message.content
+        suggestions, parsed = _parse_suggestions(content, password, analysis_results, language)
+        _remember(password, analysis_results, language, suggestions, time.perf_counter() - start, parsed)
+        return suggestions
         
+    except LLMUnavailable as e:
+        logger.warning(f"AI suggestions unavailable, using fallback: {e}")
+        return localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+    except Exception as e:
+        logger.error(f"Error getting AI suggestions: {e}")
+        fallback_suggestions = _get_fallback_suggestions(password, analysis_results)
+        return localize_suggestions(fallback_suggestions, language)
+
+def stream_ai_suggestions(password, analysis_results, language='en'):
+    """
+    Stream AI-generated suggestions for a password as the model writes them
+    
+    Yields ('partial', fields) each time more of the response's JSON becomes
+    readable, then ('done', suggestions) with the same parsed and localized
+    result get_ai_suggestions would return. Falls back to the rule-based
+    suggestions if the API call fails, times out or is refused by the
+    circuit breaker. A cache hit is a single 'done', and so is joining an
+    identical request that is already streaming.
+    """
+    cached = _cached_suggestions(password, analysis_results, language)
+    if cached is not None:
+        yield 'done', cached
+        return
+    
+    key = _flight_key(password, analysis_results, language)
+    future, leader = suggestion_flights.join(key, _flight_timeout())
+    if not leader:
+        yield 'done', _shared_result(future, password, analysis_results, language)
+        return
+    
+    suggestions = None
+    try:
+        for event, data in _stream_suggestions(password, analysis_results, language):
+            if event == 'done':
+                suggestions = data
+            yield event, data
+    finally:
+        if suggestions is None:
+            # The client went away before the end; waiters use the fallback
+            suggestion_flights.finish(key, future, error=LLMUnavailable("Suggestion stream was abandoned"))
+        else:
+            suggestion_flights.finish(key, future, suggestions)
+
+def _stream_suggestions(password, analysis_results, language):
+    """The events of stream_ai_suggestions for one streaming LLM call"""
+    if llm_client is None:
+        yield 'done', localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+        return
+    
+    text = ''
+    try:
+        start = time.perf_counter()
+        stream = llm_client.stream(
+            model=MODEL,
+            messages=_messages(password, analysis_results, language),
+            temperature=0.7,
+            max_tokens=500
+        )
+        
+        last_partial = {}
+        for delta in stream:
+            text += delta
+            partial = _partial_suggestions(text)
+            if partial != last_partial:
+                last_partial = partial
+                yield 'partial', partial
+    except LLMUnavailable as e:
+        logger.warning(f"AI suggestions unavailable, using fallback: {e}")
+        yield 'done', localize_suggestions(_get_fallback_suggestions(password, analysis_results), language)
+        return
+    except Exception as e:
+        logger.error(f"Error streaming AI suggestions: {e}")
+        fallback_suggestions = _get_fallback_suggestions(password, analysis_results)
+        yield 'done', localize_suggestions(fallback_suggestions, language)
+        return
+    
+    suggestions, parsed = _parse_suggestions(text, password, analysis_results, language)
+    _remember(password, analysis_results, language, suggestions, time.perf_counter() - start, parsed)
+    yield 'done', suggestions
+
+def _partial_suggestions(text):
+    """
+    The suggestion fields readable so far in a JSON object still being written
+    
+    Complete values are decoded as they are. A progressive field cut off
+    mid-way is returned up to where it stops: the text of a string, or the
+    finished items of a list plus the start of the next one.
+    """
+    start = text.find('{')
+    if start < 0:
+        return {}
+    
+    fields = {}
+    pos = start + 1
+    while True:
+        match = _JSON_KEY.match(text, pos)
+        if not match:
+            break
+        try:
+            key = json.loads(f'"{match.group(1)}"')
+        except ValueError:
+            break
+        try:
+            fields[key], pos = _JSON_DECODER.raw_decode(text, match.end())
+        except ValueError:
+            if key in PROGRESSIVE_FIELDS:
+                partial = _partial_value(text[match.end():])
+                if partial:
+                    fields[key] = partial
+            break
+    return fields
+
+def _partial_value(fragment):
+    """Readable start of a string or list of strings that is cut off"""
+    if fragment.startswith('"'):
+        return _partial_string(fragment)
+    if not fragment.startswith('['):
+        return None
+    
+    items = []
+    pos = 1
+    while True:
+        pos = _JSON_SEPARATOR.match(fragment, pos).end()
+        try:
+            item, pos = _JSON_DECODER.raw_decode(fragment, pos)
+        except ValueError:
+            if fragment.startswith('"', pos):
+                partial = _partial_string(fragment[pos:])
+                if partial:
+                    items.append(partial)
+            return items
+        items.append(item)
+
+def _partial_string(fragment):
+    """Decode an unterminated JSON string, dropping a trailing incomplete escape"""
+    body = fragment[1:]
+    # An escape such as \u00e9 is at most six characters long
+    for end in range(len(body), max(-1, len(body) - 7), -1):
+        try:
+            return json.loads(f'"{body[:end]}"')
+        except ValueError:
+            continue
+    return None
+
+def _parse_suggestions(suggestions, password, analysis_results, language):
+    """Turn the model's response text into localized suggestions
+    
+    Returns (suggestions, parsed), where parsed is False when the response
+    was not JSON and the suggestions were pieced together or fell back.
+    """
+    try:
         # Try to extract JSON from the response
         try:
             # Sometimes the model adds extra text before or after the JSON
@@ -62,33 +336,33 @@ def get_ai_suggestions(password, analysis_results, language='en'):
                 
                 # If the language is English, return as is
                 if language == 'en':
-                    return json_suggestions
+                    return json_suggestions, True
                     
                 # For other languages, try to get a multilingual version using our AI model
                 if language != 'en' and json_suggestions and 'vulnerability_details' in json_suggestions:
                     try:
                         # If the language is not English and the Groq model supports it,
                         # we could ask it directly to translate, but for now we'll use our translations
-                        return localize_suggestions(json_suggestions, language)
+                        return localize_suggestions(json_suggestions, language), True
                     except Exception as translation_error:
                         logger.warning(f"Error translating to {language}: {translation_error}")
                         # Fall back to English if there's an error
-                        return json_suggestions
+                        return json_suggestions, True
                 else:
-                    return json_suggestions
+                    return json_suggestions, True
             else:
                 # If no JSON found, create a structured response manually
                 structured_response = _create_structured_response(password, analysis_results, suggestions)
-                return localize_suggestions(structured_response, language)
+                return localize_suggestions(structured_response, language), False
         except json.JSONDecodeError:
             logger.warning("Response is not valid JSON, creating structured response")
             structured_response = _create_structured_response(password, analysis_results, suggestions)
-            return localize_suggestions(structured_response, language)
+            return localize_suggestions(structured_response, language), False
         
     except Exception as e:
-        logger.error(f"Error getting AI suggestions: {e}")
+        logger.error(f"Error parsing AI suggestions: {e}")
         fallback_suggestions = _get_fallback_suggestions(password, analysis_results)
-        return localize_suggestions(fallback_suggestions, language)
+        return localize_suggestions(fallback_suggestions, language), False
 
 def _create_structured_response(password, analysis_results, ai_text):
     """
@@ -0,0 +1,43 @@
+import hashlib
+import hmac
+import os
+
+from ttl_cache import TTLCache
+
+
+class AnalysisCache(TTLCache):
+    """Cache of analysis results that never stores a plaintext password
+
+    Entries are keyed by an HMAC-SHA256 of the password under a random
+    per-process secret, so the keys cannot be reversed or compared across
+    workers. The results themselves hold only derived metrics.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=300, secret=None):
+        super().__init__(max_entries, ttl_seconds)
+        self._secret = secret or os.urandom(32)
+
+    def key_for(self, password):
+        return hmac.new(
+            self._secret, password.encode('utf-8', 'surrogatepass'), hashlib.sha256
+        ).digest()
+
+    def get_result(self, password):
+        """Return a private copy of the cached analysis, or None"""
+        result = self.get(self.key_for(password))
+        return _copy_result(result) if result is not None else None
+
+    def put_result(self, password, result, generation=None):
+        self.put(self.key_for(password), _copy_result(result), generation)
+
+
+def _copy_result(result):
+    """Copy an analysis dict deep enough that callers can mutate it freely
+
+    Results are flat apart from one level of lists and dicts (patterns,
+    features, distributions), so this avoids the cost of copy.deepcopy.
+    """
+    return {
+        key: value.copy() if isinstance(value, (dict, list)) else value
+        for key, value in result.items()
+    }
@@ -1,10 +1,15 @@
 import os
+import hmac
 import logging
-from flask import Flask, render_template, request, jsonify, session
+import secrets
+from flask import Flask, Response, render_template, request, jsonify, session, url_for
 from password_analyzer import PasswordAnalyzer
 from password_generator import PasswordGenerator
-from ai_suggestions import get_ai_suggestions
-from translations import get_strength_label, get_time_unit, get_ui_text
+from ai_suggestions import LLM_PROVIDER, MODEL, get_ai_suggestions, llm_client, suggestion_cache, suggestion_flights
+from live_analysis import LiveAnalysisCoalescer
+from model_registry import ModelRegistry
+from suggestion_stream import SuggestionJobs, stream_events
+from translations import get_strength_label, get_ui_text, localize_crack_time
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -18,6 +23,28 @@ app.secret_key = os.environ.get("SESSION_SECRET", "password-guardian-secret")
 password_analyzer = PasswordAnalyzer()
 password_generator = PasswordGenerator()
 
+# Collapses bursts of live-typing requests from one browser session
+live_coalescer = LiveAnalysisCoalescer(
+    password_analyzer,
+    window_seconds=float(os.environ.get('LIVE_COALESCE_MS', 50)) / 1000
+).start()
+
+# Swaps in model versions published to data/models without a restart;
+# a poll interval of 0 turns watching off (POST /admin/model still works)
+model_registry = ModelRegistry(password_analyzer, poll_seconds=float(os.environ.get('MODEL_POLL_SECONDS', 5)))
+if model_registry.poll_seconds > 0:
+    model_registry.start()
+
+# Analyses whose LLM suggestions are streamed separately, with room for
+# SUGGESTION_HANDLE_RATE analyses per second over the handle TTL
+suggestion_jobs = SuggestionJobs(
+    ttl_seconds=float(os.environ.get('SUGGESTION_HANDLE_TTL', 60)),
+    expected_rate=float(os.environ.get('SUGGESTION_HANDLE_RATE', 50))
+).start()
+
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
 # List of supported languages
 SUPPORTED_LANGUAGES = ['en', 'es', 'fr', 'de', 'zh', 'ja', 'ru']
 
@@ -61,15 +88,26 @@ def analyze_password():
         # Localize strength labels
         results['strength_label'] = get_strength_label(results.get('score', 0), language)
         
-        # Localize time to crack units if present
-        if 'crack_time' in results and 'unit' in results['crack_time']:
-            results['crack_time']['unit'] = get_time_unit(results['crack_time']['unit'], language)
+        # Localize the time to crack estimate
+        if 'crack_time' in results:
+            results['crack_time'] = localize_crack_time(results['crack_time'], language)
+            results['time_to_crack'] = results['crack_time']['display']
         
-        # Get AI-powered improvement suggestions with language support
-        suggestions = get_ai_suggestions(password, results, language)
-        
-        # Combine the results
-        complete_results = {**results, 'suggestions': suggestions}
+        # AI suggestions take a full LLM round-trip, so by default they are
+        # streamed from a separate URL and the analysis returns right away;
+        # if every handle is pending they are fetched here instead
+        handle = None
+        if data.get('stream_suggestions', True):
+            handle = suggestion_jobs.create(password, results, language)
+        if handle is not None:
+            complete_results = {
+                **results,
+                'suggestions': None,
+                'suggestions_url': url_for('stream_suggestions', handle=handle)
+            }
+        else:
+            suggestions = get_ai_suggestions(password, results, language)
+            complete_results = {**results, 'suggestions': suggestions}
         
         # Add UI text in the selected language
         complete_results['ui_text'] = {
@@ -85,6 +123,47 @@ def analyze_password():
         logger.error(f"Error analyzing password: {e}")
         return jsonify({'error': 'Failed to analyze password'}), 500
 
+@app.route('/suggestions/<handle>/stream')
+def stream_suggestions(handle):
+    """Stream the AI suggestions for an analysis as Server-Sent Events"""
+    job = suggestion_jobs.take(handle)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired suggestions handle'}), 404
+    
+    return Response(stream_events(job), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        # Keep reverse proxies from buffering the stream
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/analyze_live', methods=['POST'])
+def analyze_live():
+    """Return the cheap strength metrics while the user is still typing"""
+    try:
+        data = request.get_json()
+        password = data.get('password', '')
+        language = data.get('language', session.get('language', 'en'))
+        
+        # Ensure language is supported
+        if language not in SUPPORTED_LANGUAGES:
+            language = 'en'
+        
+        # Each browser session gets its own coalescing slot
+        if 'live_id' not in session:
+            session['live_id'] = secrets.token_urlsafe(16)
+        
+        # No model and no suggestions here; those come from /analyze_password
+        # once the user stops typing
+        results = live_coalescer.submit(session['live_id'], password, data.get('seq'))
+        results['strength_label'] = get_strength_label(results.get('score', 0), language)
+        results['crack_time'] = localize_crack_time(results['crack_time'], language)
+        results['time_to_crack'] = results['crack_time']['display']
+        
+        return jsonify(results)
+    except Exception as e:
+        logger.error(f"Error analyzing password while typing: {e}")
+        return jsonify({'error': 'Failed to analyze password'}), 500
+
 @app.route('/generate_password', methods=['POST'])
 def generate_password():
     """Generate a strong password based on user preferences"""
@@ -117,9 +196,10 @@ def generate_password():
         # Localize strength labels
         analysis['strength_label'] = get_strength_label(analysis.get('score', 0), language)
         
-        # Localize time to crack units if present
-        if 'crack_time' in analysis and 'unit' in analysis['crack_time']:
-            analysis['crack_time']['unit'] = get_time_unit(analysis['crack_time']['unit'], language)
+        # Localize the time to crack estimate
+        if 'crack_time' in analysis:
+            analysis['crack_time'] = localize_crack_time(analysis['crack_time'], language)
+            analysis['time_to_crack'] = analysis['crack_time']['display']
         
         return jsonify({
             'password': password,
@@ -157,5 +237,53 @@ def set_language():
     session['language'] = language
     return jsonify({'success': True, 'language': language})
 
+def _admin_authorized():
+    supplied = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(supplied.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+@app.route('/admin/model', methods=['GET'])
+def admin_model_status():
+    """Report the served model version and how long it took to load"""
+    if not _admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    return jsonify(model_registry.status())
+
+@app.route('/admin/model', methods=['POST'])
+def admin_model_reload():
+    """Switch to {"version": ...}, or without one follow the newest version again"""
+    if not _admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    version = data.get('version')
+    try:
+        if not version:
+            model_registry.unpin()
+        elif not model_registry.activate(version):
+            return jsonify({**model_registry.status(), 'error': 'Model version failed to load'}), 500
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
+    
+    return jsonify(model_registry.status())
+
+@app.route('/admin/suggestions', methods=['GET'])
+def admin_suggestion_stats():
+    """Report the suggestion cache hit rate and the LLM time it has saved"""
+    if not _admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    if suggestion_cache is None:
+        return jsonify({'enabled': False})
+    return jsonify({'enabled': True, **suggestion_cache.stats()})
+
+@app.route('/admin/llm', methods=['GET'])
+def admin_llm_status():
+    """Report the LLM circuit breaker state, timeouts, rejected and coalesced calls"""
+    if not _admin_authorized():
+        return jsonify({'error': 'Forbidden'}), 403
+    stats = llm_client.stats() if llm_client is not None else {}
+    return jsonify({'provider': LLM_PROVIDER, 'model': MODEL, **stats,
+                    'single_flight': suggestion_flights.stats(),
+                    'suggestion_handles': suggestion_jobs.stats()})
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,217 @@
+"""
+Offline bulk audit of exported password lists.
+
+Streams the input file in chunks through PasswordAnalyzer.analyze_many on a
+process pool, writing one result per password (JSONL or CSV) plus aggregate
+statistics. Only a bounded number of chunks is ever in flight, so memory
+stays constant regardless of file size. The LLM is never called.
+
+    python audit.py passwords.txt -o results.jsonl --summary summary.json
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+
+from password_analyzer import PasswordAnalyzer
+
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = ['line', 'password', 'score', 'strength', 'entropy', 'time_to_crack',
+              'is_common', 'length', 'patterns']
+
+
+def csv_fields(include_password):
+    return CSV_FIELDS if include_password else [f for f in CSV_FIELDS if f != 'password']
+
+
+# Worker-local analyzer; inherited from the parent when the pool forks
+_analyzer = None
+
+
+def _init_worker():
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = PasswordAnalyzer()
+
+
+def iter_chunks(file_path, chunk_size, encoding='latin-1'):
+    """Yield lists of (line number, password) without reading the whole file"""
+    chunk = []
+    with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+        for line_number, line in enumerate(f, 1):
+            password = line.rstrip('\r\n')
+            if not password:
+                continue
+            chunk.append((line_number, password))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def new_stats():
+    return {
+        'total': 0,
+        'common': 0,
+        'entropy_sum': 0.0,
+        'score_histogram': [0] * 10,
+        'strength': Counter(),
+        'patterns': Counter()
+    }
+
+
+def merge_stats(total, partial):
+    total['total'] += partial['total']
+    total['common'] += partial['common']
+    total['entropy_sum'] += partial['entropy_sum']
+    for i, count in enumerate(partial['score_histogram']):
+        total['score_histogram'][i] += count
+    total['strength'].update(partial['strength'])
+    total['patterns'].update(partial['patterns'])
+
+
+def summarize(stats, elapsed):
+    total = stats['total']
+    return {
+        'total': total,
+        'elapsed_seconds': round(elapsed, 3),
+        'passwords_per_second': round(total / elapsed, 1) if elapsed else None,
+        'common_password_rate': round(stats['common'] / total, 4) if total else 0.0,
+        'mean_entropy': round(stats['entropy_sum'] / total, 2) if total else 0.0,
+        'score_histogram': {
+            f"{i * 10}-{i * 10 + 9 if i < 9 else 100}": count
+            for i, count in enumerate(stats['score_histogram'])
+        },
+        'strength': dict(stats['strength'].most_common()),
+        'pattern_frequencies': {
+            pattern: round(count / total, 4) for pattern, count in stats['patterns'].most_common()
+        } if total else {}
+    }
+
+
+def audit_chunk(task):
+    """Analyze one chunk in a worker, returning serialized rows and partial stats
+
+    Rows are formatted in the worker so the parent only concatenates text,
+    which keeps it from becoming the bottleneck as workers are added.
+    """
+    chunk, output_format, include_password = task
+    results = _analyzer.analyze_many([password for _, password in chunk])
+
+    stats = new_stats()
+    buffer = io.StringIO()
+    writer = None
+    if output_format == 'csv':
+        writer = csv.DictWriter(buffer, csv_fields(include_password), extrasaction='ignore')
+
+    for (line_number, password), result in zip(chunk, results):
+        stats['total'] += 1
+        stats['common'] += result['is_common']
+        stats['entropy_sum'] += result['entropy']
+        stats['score_histogram'][min(result['score'] // 10, 9)] += 1
+        stats['strength'][result['strength']] += 1
+        stats['patterns'].update(result['patterns'])
+
+        row = {'line': line_number}
+        if include_password:
+            row['password'] = password
+        row.update(result)
+
+        if writer is not None:
+            row['patterns'] = '; '.join(result['patterns'])
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            buffer.write('\n')
+
+    return buffer.getvalue(), stats
+
+
+def run_audit(input_path, output, output_format='jsonl', workers=None, chunk_size=1000,
+              include_password=False, encoding='latin-1'):
+    """Audit input_path, writing rows to the output file object; returns the summary"""
+    workers = workers or os.cpu_count() or 1
+    stats = new_stats()
+    start = time.perf_counter()
+
+    if output_format == 'csv':
+        csv.writer(output).writerow(csv_fields(include_password))
+
+    tasks = (
+        (chunk, output_format, include_password)
+        for chunk in iter_chunks(input_path, chunk_size, encoding)
+    )
+
+    # Load the model once in the parent so forked workers share its pages
+    _init_worker()
+    _analyzer.model.ensure_loaded()
+
+    if workers == 1:
+        for task in tasks:
+            text, partial = audit_chunk(task)
+            output.write(text)
+            merge_stats(stats, partial)
+    else:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            # Pool.imap would read the whole input ahead; keep a bounded window
+            # of chunks in flight and write results back in input order
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.apply_async(audit_chunk, (task,)))
+                if len(pending) >= workers * 2:
+                    text, partial = pending.popleft().get()
+                    output.write(text)
+                    merge_stats(stats, partial)
+            while pending:
+                text, partial = pending.popleft().get()
+                output.write(text)
+                merge_stats(stats, partial)
+
+    return summarize(stats, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a password list offline")
+    parser.add_argument('input', help="password file, one password per line")
+    parser.add_argument('-o', '--output', help="per-password results (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default='jsonl',
+                        help="per-password output format (default: jsonl)")
+    parser.add_argument('--summary', help="write aggregate statistics as JSON to this file")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=1000,
+                        help="passwords per work unit (default: 1000)")
+    parser.add_argument('--include-password', action='store_true',
+                        help="include the plaintext password in each result row")
+    parser.add_argument('--encoding', default='latin-1', help="input encoding (default: latin-1)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        summary = run_audit(args.input, output, args.format, args.workers, args.chunk_size,
+                            args.include_password, args.encoding)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    logger.info(f"Audited {summary['total']} passwords in {summary['elapsed_seconds']}s "
+                f"({summary['passwords_per_second']}/s)")
+    if not args.summary:
+        print(json.dumps(summary, indent=2, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
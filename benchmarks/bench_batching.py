@@ -0,0 +1,84 @@
+"""
+Load test for the micro-batching inference scheduler.
+
+Runs the same strength predictions from 1, 4, 16 and 32 threads, calling
+the model directly and through InferenceScheduler, and reports throughput,
+latency percentiles and the scheduler's batch fill and queue delay.
+
+Run from the repository root:
+    python benchmarks/bench_batching.py
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_patterns import load_corpus
+from inference_scheduler import InferenceScheduler
+from models import PasswordStrengthModel
+
+
+def run_load(predict, passwords, threads):
+    """Split passwords across threads; returns (seconds, per-call latencies)"""
+    latencies = []
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(threads)
+
+    def worker(chunk):
+        local = []
+        start_barrier.wait()
+        for password in chunk:
+            start = time.perf_counter()
+            predict(password)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(passwords[i::threads],)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare direct and micro-batched inference under load")
+    parser.add_argument('--requests', type=int, default=2000, help="predictions per run (default: 2000)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--wait-ms', type=float, default=1)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    model = PasswordStrengthModel()
+    passwords = load_corpus()[:args.requests]
+
+    print(f"{'threads':>7} {'mode':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'batch':>7} {'queue ms':>9}")
+    for threads in (1, 4, 16, 32):
+        for mode in ('direct', 'batched'):
+            if mode == 'direct':
+                scheduler = None
+                predict = model.predict_strength
+            else:
+                scheduler = InferenceScheduler(model, args.batch_size, args.wait_ms / 1000)
+                predict = scheduler.predict_strength
+
+            elapsed, latencies = run_load(predict, passwords, threads)
+            p50 = statistics.median(latencies) * 1e3
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e3
+            batch = queue = '-'
+            if scheduler is not None:
+                stats = scheduler.stats()
+                batch = f"{stats['mean_batch_size']:.1f}"
+                queue = f"{stats['mean_queue_delay_ms']:.2f}"
+            print(f"{threads:>7} {mode:>9} {len(passwords) / elapsed:>9.0f} {p50:>8.2f} {p99:>8.2f} {batch:>7} {queue:>9}")
+
+
+if __name__ == "__main__":
+    main()
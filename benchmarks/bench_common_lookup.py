@@ -0,0 +1,82 @@
+"""
+Memory size and lookup throughput of the common-password stores: the
+exact in-memory set, the memory-mapped breach index, and both behind the
+Bloom prefilter.
+
+Run from the repository root:
+    python benchmarks/bench_common_lookup.py [wordlist] [--fp-rate 0.001]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bloom_filter import BloomFilter, PrefilteredStore
+from breach_index import BreachIndex, build_index, iter_wordlist
+
+
+def set_size_bytes(store):
+    """Approximate footprint of a set of strings, container plus contents"""
+    return sys.getsizeof(store) + sum(sys.getsizeof(p) for p in store)
+
+
+def lookups_per_second(store, probes, min_time=0.5):
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for password in probes:
+            password in store
+        count += len(probes)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('wordlist', nargs='?', default=os.path.join('data', 'rockyou_sample.txt'))
+    parser.add_argument('--fp-rate', type=float, default=0.001)
+    args = parser.parse_args(argv)
+
+    exact = set(iter_wordlist(args.wordlist))
+
+    rng = random.Random(42)
+    chars = string.ascii_letters + string.digits + string.punctuation
+    misses = [''.join(rng.choice(chars) for _ in range(rng.randint(8, 20))) for _ in range(20000)]
+    misses = [p for p in misses if p not in exact]
+    hits = rng.sample(sorted(exact), min(len(exact), 20000))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, 'wordlist.idx')
+        bloom_path = os.path.join(tmp, 'wordlist.bloom')
+        build_index(args.wordlist, index_path)
+        BloomFilter.from_wordlist(args.wordlist, args.fp_rate).save(bloom_path)
+
+        index = BreachIndex(index_path)
+        bloom = BloomFilter.load(bloom_path)
+        stores = [
+            ('exact set', exact, set_size_bytes(exact)),
+            ('bloom + exact set', PrefilteredStore(bloom, exact), set_size_bytes(exact) + bloom.size_bytes),
+            ('mmap index', index, os.path.getsize(index_path)),
+            ('bloom + mmap index', PrefilteredStore(bloom, index), os.path.getsize(index_path) + bloom.size_bytes),
+        ]
+
+        false_positives = sum(p in bloom for p in misses)
+        print(f"entries: {len(exact)}   bloom: {bloom.size_bytes} bytes, {bloom.num_hashes} hashes, "
+              f"observed false-positive rate {false_positives / len(misses):.4%} (target {args.fp_rate:.4%})")
+        print(f"{'store':<20} {'memory':>12} {'misses/s':>12} {'hits/s':>12}")
+        for name, store, size in stores:
+            print(f"{name:<20} {size:>12,} {lookups_per_second(store, misses):>12,.0f} "
+                  f"{lookups_per_second(store, hits):>12,.0f}")
+
+        # Release the mappings before the directory is removed
+        del stores, index, bloom
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark comparing sklearn's RandomForestClassifier inference with the
+ForestArrays evaluator that serves artifact models (forest_inference.py).
+
+Trains a forest like train_model.py's on the benchmark corpus, since served
+models are loaded from artifacts and have no sklearn object to compare with.
+Checks that both produce bit-identical probabilities, then times the old
+predict + predict_proba pair per password against one NumPy evaluation,
+and whole batches of several sizes. Exits non-zero if ForestArrays is
+slower than sklearn on batches of GATED_BATCH_SIZE rows or more, which
+would make analyze_many and the audit CLI slower than plain sklearn.
+
+Run from the repository root:
+    python benchmarks/bench_forest.py
+"""
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from bench_patterns import load_corpus
+from forest_inference import ForestArrays
+from hashed_featurizer import HashedNgramFeaturizer
+from train_model import assign_labels
+
+# Batches at least this large must not be slower than sklearn
+GATED_BATCH_SIZE = 512
+
+
+class _Model:
+    """The sklearn forest, its NumPy export and featurizer side by side"""
+
+    def __init__(self, passwords):
+        self.vectorizer = HashedNgramFeaturizer()
+        self.model = RandomForestClassifier(n_estimators=100, random_state=42)
+        self.model.fit(self.vectorizer.transform(passwords), assign_labels(passwords))
+        self.forest = ForestArrays.from_sklearn(self.model)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    passwords = load_corpus()
+    model = _Model(passwords)
+    X = model.vectorizer.transform(passwords)
+    expected = model.model.predict_proba(X)
+    actual = model.forest.predict_proba(X)
+    if not np.array_equal(expected, actual):
+        mismatched = int(np.sum(np.any(expected != actual, axis=1)))
+        print(f"{mismatched} passwords get different probabilities")
+        sys.exit(1)
+
+    rows = [model.vectorizer.transform([p]) for p in passwords[:300]]
+    # Single rows take the NumPy path, the batch above the compiled one
+    if not np.array_equal(expected[:len(rows)], np.vstack([model.forest.predict_proba(x) for x in rows])):
+        print("Single-row probabilities differ from sklearn")
+        sys.exit(1)
+
+    def legacy_single():
+        for x in rows:
+            model.model.predict(x)
+            model.model.predict_proba(x)
+
+    def numpy_single():
+        for x in rows:
+            model.forest.predict_proba(x)
+
+    runs = 3
+    legacy = min(timeit.repeat(legacy_single, number=1, repeat=runs)) / len(rows)
+    fast = min(timeit.repeat(numpy_single, number=1, repeat=runs)) / len(rows)
+
+    print(f"trees:                    {len(model.forest.roots)}")
+    print(f"nodes:                    {len(model.forest.threshold)}")
+    print(f"passwords checked:        {len(passwords)} (identical probabilities)")
+    print(f"sklearn, one password:    {legacy * 1e6:.0f} us  (predict + predict_proba)")
+    print(f"numpy, one password:      {fast * 1e6:.0f} us")
+    print(f"speedup per call:         {legacy / fast:.1f}x")
+
+    slower = []
+    for size in (8, 32, 128, 512, 2048):
+        batch = X[:size]
+        sk = min(timeit.repeat(lambda: model.model.predict_proba(batch), number=1, repeat=runs * 2))
+        arrays = min(timeit.repeat(lambda: model.forest.predict_proba(batch), number=1, repeat=runs * 2))
+        print(f"batch of {size:<5}           sklearn {sk * 1e3:8.2f} ms   ForestArrays {arrays * 1e3:8.2f} ms")
+        if size >= GATED_BATCH_SIZE and arrays > sk:
+            slower.append(size)
+
+    if slower:
+        print(f"ForestArrays is slower than sklearn for batches of {', '.join(map(str, slower))} rows")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
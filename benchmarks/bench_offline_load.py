@@ -0,0 +1,154 @@
+"""
+End-to-end load test of /analyze_password against the local stub LLM.
+
+Starts llm_stub_server.py and the Flask app (LLM_PROVIDER=stub) in this
+process, each on its own local port, then sends RockYou passwords from
+several client threads over HTTP. Each request posts to /analyze_password
+and reads its suggestion stream to the 'done' event (or, with --blocking,
+waits for the suggestions in the analysis response). Reports throughput,
+analysis and suggestion latency, and how many suggestions came from the
+LLM rather than the fallback. Runs fully offline.
+
+The suggestion cache is off unless --suggestion-cache is given, so every
+request reaches the stub.
+
+Run from the repository root:
+    python benchmarks/bench_offline_load.py [--requests 200] [--concurrency 16]
+        [--latency 0.5] [--jitter 0.2] [--error-rate 0.05] [--blocking]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from llm_stub_server import StubConfig, start_in_thread
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def start_app(stub_url, args):
+    """Import the app configured for the stub and serve it on a free local port"""
+    os.environ.update({
+        'LLM_PROVIDER': 'stub',
+        'LLM_STUB_URL': stub_url,
+        'LLM_MAX_CONCURRENCY': str(args.concurrency),
+        'MODEL_POLL_SECONDS': '0'
+    })
+    if not args.suggestion_cache:
+        os.environ['SUGGESTION_CACHE_SIZE'] = '0'
+    # The app resolves data/ relative to the working directory
+    os.chdir(ROOT)
+    logging.disable(logging.WARNING)
+    import app as app_module
+    from werkzeug.serving import make_server
+
+    server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return app_module, f"http://127.0.0.1:{server.server_port}"
+
+
+def read_done_event(client, url):
+    """The data of the 'done' event of a suggestion stream"""
+    event = None
+    with client.stream('GET', url) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line.startswith('event: '):
+                event = line[len('event: '):]
+            elif line.startswith('data: ') and event == 'done':
+                return json.loads(line[len('data: '):])
+    raise RuntimeError("Suggestion stream ended without a done event")
+
+
+def run_load(base_url, passwords, concurrency, blocking):
+    """Send every password once from `concurrency` threads; returns per-request records"""
+    records = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency)
+
+    def worker(chunk):
+        local = []
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            barrier.wait()
+            for password in chunk:
+                start = time.perf_counter()
+                response = client.post('/analyze_password', json={
+                    'password': password, 'language': 'en', 'stream_suggestions': not blocking
+                })
+                response.raise_for_status()
+                analyzed = time.perf_counter()
+                data = response.json()
+                suggestions = data['suggestions'] if blocking else read_done_event(client, data['suggestions_url'])
+                local.append({
+                    'analyze_s': analyzed - start,
+                    'suggestions_s': time.perf_counter() - start,
+                    # The stub's canned answers all end this way
+                    'from_llm': str(suggestions.get('improved_password', '')).endswith('-Vault')
+                })
+        with lock:
+            records.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(passwords[i::concurrency],)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end load test of /analyze_password")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.5, help="stub LLM latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.2, help="stub latency jitter in seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of stub requests that fail")
+    parser.add_argument('--chunk-delay', type=float, default=0.01, help="seconds between streamed chunks")
+    parser.add_argument('--blocking', action='store_true', help="suggestions in the analysis response, not streamed")
+    parser.add_argument('--suggestion-cache', action='store_true', help="keep the suggestion cache on")
+    args = parser.parse_args(argv)
+
+    stub_config = StubConfig(args.latency, args.jitter, args.error_rate, chunk_delay=args.chunk_delay, seed=42)
+    stub_server, stub_url = start_in_thread(stub_config)
+    app_module, base_url = start_app(stub_url, args)
+
+    with open(os.path.join('data', 'rockyou_sample.txt'), 'r', encoding='latin-1', errors='ignore') as f:
+        passwords = list(dict.fromkeys(line.strip() for line in f if line.strip()))[:args.requests]
+
+    seconds, records = run_load(base_url, passwords, args.concurrency, args.blocking)
+
+    analyze = sorted(r['analyze_s'] for r in records)
+    done = sorted(r['suggestions_s'] for r in records)
+    from_llm = sum(r['from_llm'] for r in records)
+    mode = 'blocking' if args.blocking else 'streamed'
+    print(f"{len(records)} requests, {args.concurrency} clients, {mode} suggestions, "
+          f"stub latency {args.latency}s +/- {args.jitter}s, error rate {args.error_rate}")
+    print(f"throughput        {len(records) / seconds:8.1f} requests/s over {seconds:.2f}s")
+    print(f"analysis          p50 {percentile(analyze, 0.5) * 1000:8.1f} ms   "
+          f"p99 {percentile(analyze, 0.99) * 1000:8.1f} ms")
+    print(f"suggestions done  p50 {percentile(done, 0.5) * 1000:8.1f} ms   "
+          f"p99 {percentile(done, 0.99) * 1000:8.1f} ms   mean {statistics.mean(done) * 1000:8.1f} ms")
+    print(f"from the LLM      {from_llm} of {len(records)} (the rest used the fallback)")
+    print(f"stub              {stub_config.stats()}")
+    if app_module.llm_client is not None:
+        stats = app_module.llm_client.stats()
+        print(f"llm client        breaker {stats['breaker']['state']}, timeouts {stats['timeouts']}, "
+              f"retries {stats['retries']}, rejected {stats['rejected_open'] + stats['rejected_busy']}")
+    stub_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Micro-benchmark comparing the compiled pattern matcher with the original
+per-call regex and trigram scan of PasswordAnalyzer._identify_patterns.
+
+Run from the repository root:
+    python benchmarks/bench_patterns.py
+"""
+import os
+import random
+import re
+import string
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pattern_matcher import PATTERN_DESCRIPTIONS
+from password_profile import PasswordProfile
+
+
+def legacy_identify_patterns(password):
+    """The original implementation, kept verbatim for comparison"""
+    patterns = []
+
+    for pattern, description in PATTERN_DESCRIPTIONS.items():
+        if re.search(pattern, password, re.IGNORECASE):
+            patterns.append(description)
+
+    for i in range(len(password) - 2):
+        if (ord(password[i+1]) == ord(password[i]) + 1 and
+            ord(password[i+2]) == ord(password[i]) + 2):
+            patterns.append("sequential characters")
+            break
+
+    for i in range(len(password) - 2):
+        if password[i] == password[i+1] == password[i+2]:
+            patterns.append("repeating characters")
+            break
+
+    keyboard_rows = [
+        "qwertyuiop",
+        "asdfghjkl",
+        "zxcvbnm"
+    ]
+
+    for row in keyboard_rows:
+        for i in range(len(row) - 2):
+            if row[i:i+3].lower() in password.lower():
+                patterns.append("keyboard pattern")
+                break
+        if "keyboard pattern" in patterns:
+            break
+
+    if not patterns and len(password) >= 12:
+        patterns.append("no common patterns detected")
+
+    return patterns
+
+
+def load_corpus(seed=1234):
+    """The bundled RockYou sample plus synthetic strong and tricky passwords"""
+    passwords = []
+    file_path = os.path.join('data', 'rockyou_sample.txt')
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
+            passwords = [line.strip() for line in f if line.strip()]
+
+    rng = random.Random(seed)
+    strong_chars = string.ascii_letters + string.digits + string.punctuation
+    tricky_chars = 'passwordqwertyabc123PASSWORDQWERTYABC' + 'ſKİı!\n'
+    for _ in range(1000):
+        passwords.append(''.join(rng.choice(strong_chars) for _ in range(rng.randint(12, 24))))
+        passwords.append(''.join(rng.choice(tricky_chars) for _ in range(rng.randint(1, 16))))
+    return passwords
+
+
+def main():
+    passwords = load_corpus()
+
+    mismatches = [p for p in passwords if legacy_identify_patterns(p) != PasswordProfile(p).patterns]
+    if mismatches:
+        print(f"{len(mismatches)} passwords produce different descriptions, e.g. {mismatches[0]!r}")
+        sys.exit(1)
+
+    runs = 5
+    legacy = min(timeit.repeat(lambda: [legacy_identify_patterns(p) for p in passwords], number=1, repeat=runs))
+    compiled = min(timeit.repeat(lambda: [PasswordProfile(p).patterns for p in passwords], number=1, repeat=runs))
+
+    per_item = 1e6 / len(passwords)
+    print(f"passwords:               {len(passwords)}")
+    print(f"legacy, one call:        {legacy * per_item:.2f} us")
+    print(f"legacy, two per analyze: {2 * legacy * per_item:.2f} us")
+    print(f"profile + matcher:       {compiled * per_item:.2f} us  (includes class counts)")
+    print(f"speedup per analyze:     {2 * legacy / compiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
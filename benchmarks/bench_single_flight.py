@@ -0,0 +1,132 @@
+"""
+Check and measure single-flight coalescing of identical suggestion requests.
+
+Fires N identical requests at once, from threads, from asyncio tasks, from
+both together and as streams, against a stub provider that counts its
+calls and takes a fixed time to answer. Each burst must reach the provider
+exactly once, and every caller must receive the same suggestions. Exits
+non-zero if either does not hold.
+
+Run from the repository root:
+    python benchmarks/bench_single_flight.py [--requests 50] [--delay 0.2]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ai_suggestions
+from llm_client import ResilientLLMClient
+
+PASSWORD = 'summer2024'
+ANALYSIS = {
+    'entropy': 41.4,
+    'patterns': ['common word followed by year'],
+    'is_common': True,
+    'length': len(PASSWORD),
+    'features': {'has_lowercase': True, 'has_uppercase': False, 'has_digit': True, 'has_special': False}
+}
+RESPONSE = json.dumps({
+    'improved_password': 'Summ3r!2024-Tide',
+    'reasoning': 'Adds length, case and symbols around the familiar part.',
+    'vulnerability_details': ['Word plus year is an early guess in dictionary attacks']
+})
+
+
+class StubProvider:
+    """Chat-completions client that counts calls and answers after a delay"""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, timeout=None, stream=False, **params):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if stream:
+            return iter(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=RESPONSE[i:i + 8]))])
+                        for i in range(0, len(RESPONSE), 8))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=RESPONSE))])
+
+
+def burst_threads(n, call=None):
+    call = call or (lambda: ai_suggestions.get_ai_suggestions(PASSWORD, ANALYSIS))
+    results = [None] * n
+    barrier = threading.Barrier(n)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = call()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+async def burst_async(n):
+    return await asyncio.gather(*(ai_suggestions.get_ai_suggestions_async(PASSWORD, ANALYSIS) for _ in range(n)))
+
+
+def burst_mixed(n):
+    """Half the requests from threads, half from coroutines, all at once"""
+    async_results = []
+    runner = threading.Thread(target=lambda: async_results.extend(asyncio.run(burst_async(n - n // 2))))
+    runner.start()
+    thread_results = burst_threads(n // 2)
+    runner.join()
+    return thread_results + async_results
+
+
+def burst_streams(n):
+    def stream():
+        return list(ai_suggestions.stream_ai_suggestions(PASSWORD, ANALYSIS))[-1][1]
+    return burst_threads(n, stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that identical concurrent requests share one upstream call")
+    parser.add_argument('--requests', type=int, default=50, help="concurrent identical requests per burst")
+    parser.add_argument('--delay', type=float, default=0.2, help="stub provider response time in seconds")
+    args = parser.parse_args(argv)
+
+    # Every request must reach the coalescing layer, not the response cache
+    ai_suggestions.suggestion_cache = None
+    expected = json.loads(RESPONSE)
+
+    failures = 0
+    print(f"{'burst':<10}{'requests':>9}{'upstream':>10}{'seconds':>9}  result")
+    for name, burst in (('threads', burst_threads),
+                        ('asyncio', lambda n: asyncio.run(burst_async(n))),
+                        ('mixed', burst_mixed),
+                        ('streams', burst_streams)):
+        provider = StubProvider(args.delay)
+        ai_suggestions.llm_client = ResilientLLMClient(provider, deadline_seconds=10, max_concurrency=args.requests)
+
+        start = time.perf_counter()
+        results = burst(args.requests)
+        seconds = time.perf_counter() - start
+
+        ok = provider.calls == 1 and len(results) == args.requests and all(r == expected for r in results)
+        failures += not ok
+        print(f"{name:<10}{args.requests:>9}{provider.calls:>10}{seconds:>9.2f}  {'ok' if ok else 'FAILED'}")
+
+    print(ai_suggestions.suggestion_flights.stats())
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Cold-start measurement for the web app.
+
+Each scenario starts a fresh interpreter in a scratch working directory and
+times `import app` (which constructs the analyzer) and the first analysis
+(which loads the strength model on first use):
+
+    fallback, first build    no trained model and no cached fallback model
+    fallback, cached         no trained model, fallback artifact on disk
+    trained artifact         a model written by train_model.py
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [--trained data/password_model]
+
+Without --trained, a model is trained into a scratch directory first.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, logging, time
+start = time.perf_counter()
+logging.disable(logging.WARNING)
+import app
+imported = time.perf_counter()
+app.password_analyzer.analyze('Tr0ub4dor&3')
+analyzed = time.perf_counter()
+print(json.dumps({'import_s': imported - start, 'first_analyze_s': analyzed - imported}))
+"""
+
+
+def make_workdir(base, name, artifacts):
+    """Scratch directory with the RockYou sample and the given model directories"""
+    workdir = os.path.join(base, name)
+    data_dir = os.path.join(workdir, 'data')
+    os.makedirs(data_dir)
+    os.symlink(os.path.join(ROOT, 'data', 'rockyou_sample.txt'), os.path.join(data_dir, 'rockyou_sample.txt'))
+    for target, source in artifacts.items():
+        shutil.copytree(source, os.path.join(data_dir, target))
+    return workdir
+
+
+def probe(workdir):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['process_s'] = time.perf_counter() - start
+    return result
+
+
+def train_into(base):
+    """Run train_model.py in a scratch directory; returns the artifact path"""
+    workdir = make_workdir(base, 'training', {})
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, os.path.join(ROOT, 'train_model.py')], cwd=workdir, env=env,
+                   capture_output=True, check=True)
+    return os.path.join(workdir, 'data', 'password_model')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold start of the web app")
+    parser.add_argument('--trained', help="trained model artifact directory (default: train one)")
+    parser.add_argument('--runs', type=int, default=3, help="process starts per scenario (default: 3)")
+    args = parser.parse_args(argv)
+
+    fallback = os.path.join(ROOT, 'data', 'fallback_model')
+    with tempfile.TemporaryDirectory() as base:
+        trained = args.trained or train_into(base)
+        scenarios = [
+            ('fallback, first build', {}),
+            ('fallback, cached', {'fallback_model': fallback}),
+            ('trained artifact', {'password_model': os.path.abspath(trained)})
+        ]
+
+        print(f"{'scenario':<24}{'import app':>12}{'first analyze':>15}{'process':>10}")
+        for name, artifacts in scenarios:
+            runs = []
+            for i in range(args.runs):
+                # A fresh directory each time, so nothing is cached between runs
+                workdir = make_workdir(base, f"{name.replace(' ', '_').replace(',', '')}_{i}", artifacts)
+                runs.append(probe(workdir))
+            median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+            print(f"{name:<24}{median['import_s'] * 1e3:>10.0f}ms{median['first_analyze_s'] * 1e3:>13.0f}ms"
+                  f"{median['process_s'] * 1e3:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
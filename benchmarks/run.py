@@ -0,0 +1,256 @@
+"""
+Reproducible benchmark suite for the analyzer, model, generator and routes.
+
+Every benchmark runs over fixed corpora (the bundled RockYou sample plus
+seeded synthetic long and strong passwords), with the results cache off and
+the LLM replaced by the rule-based fallback. Results are written as JSON and
+compared against a stored baseline; any benchmark slower than the baseline
+by more than the threshold fails the run.
+
+Run from the repository root:
+    python benchmarks/run.py                      # compare with baseline.json
+    python benchmarks/run.py --update-baseline    # record a new baseline
+    python benchmarks/run.py --only analyze --output results.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Measure real work, not cache hits
+os.environ['ANALYSIS_CACHE_SIZE'] = '0'
+# Rule-based suggestions, so the route benchmarks measure only this service
+os.environ['LLM_PROVIDER'] = 'fallback'
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+SCHEMA_VERSION = 1
+
+BENCHMARKS = {}
+
+
+def benchmark(name, corpus, limit=None):
+    """Register fn(context, item) to be timed over a named corpus"""
+    def register(fn):
+        BENCHMARKS[name] = (fn, corpus, limit)
+        return fn
+    return register
+
+
+def load_corpora(seed=20240501):
+    """Fixed inputs: the RockYou sample plus seeded synthetic passwords"""
+    rng = random.Random(seed)
+    with open(os.path.join(ROOT, 'data', 'rockyou_sample.txt'), 'r', encoding='latin-1', errors='ignore') as f:
+        rockyou = [line.strip() for line in f if line.strip()]
+
+    strong_chars = string.ascii_letters + string.digits + string.punctuation
+    strong = [''.join(rng.choice(strong_chars) for _ in range(rng.randint(16, 24))) for _ in range(500)]
+
+    words = [p for p in rockyou if p.isalpha() and 4 <= len(p) <= 8]
+    long_passwords = [
+        '-'.join(rng.choice(words) for _ in range(rng.randint(6, 10))) + str(rng.randint(0, 99))
+        for _ in range(200)
+    ]
+
+    mixed = rockyou[:300] + strong[:100] + long_passwords[:100]
+    rng.shuffle(mixed)
+
+    generator_options = [
+        {'length': length, 'include_uppercase': upper, 'include_lowercase': True,
+         'include_numbers': numbers, 'include_symbols': symbols, 'min_entropy': 80}
+        for length in (12, 16, 32)
+        for upper in (True, False)
+        for numbers in (True, False)
+        for symbols in (True, False)
+    ]
+
+    return {
+        'rockyou': rockyou,
+        'strong': strong,
+        'long': long_passwords,
+        'mixed': mixed,
+        'generator_options': generator_options
+    }
+
+
+def build_context():
+    # The app resolves data/ relative to the working directory
+    os.chdir(ROOT)
+    logging.disable(logging.WARNING)
+    import app as app_module
+
+    return {
+        'analyzer': app_module.password_analyzer,
+        'generator': app_module.password_generator,
+        'client': app_module.app.test_client(),
+        'corpora': load_corpora()
+    }
+
+
+@benchmark('analyze/rockyou', 'rockyou', limit=300)
+def bench_analyze_rockyou(ctx, password):
+    ctx['analyzer'].analyze(password)
+
+
+@benchmark('analyze/strong', 'strong', limit=200)
+def bench_analyze_strong(ctx, password):
+    ctx['analyzer'].analyze(password)
+
+
+@benchmark('analyze/long', 'long', limit=100)
+def bench_analyze_long(ctx, password):
+    ctx['analyzer'].analyze(password)
+
+
+@benchmark('identify_patterns/mixed', 'mixed')
+def bench_identify_patterns(ctx, password):
+    ctx['analyzer']._identify_patterns(password)
+
+
+@benchmark('calculate_entropy/mixed', 'mixed')
+def bench_calculate_entropy(ctx, password):
+    ctx['analyzer']._calculate_entropy(password)
+
+
+@benchmark('predict_strength/mixed', 'mixed', limit=200)
+def bench_predict_strength(ctx, password):
+    ctx['analyzer'].model.predict_strength(password)
+
+
+@benchmark('generate/options', 'generator_options')
+def bench_generate(ctx, options):
+    ctx['generator'].generate(**options)
+
+
+@benchmark('route/analyze_password', 'mixed', limit=100)
+def bench_route_analyze(ctx, password):
+    response = ctx['client'].post('/analyze_password', json={'password': password, 'language': 'en'})
+    assert response.status_code == 200, response.status_code
+
+
+@benchmark('route/generate_password', 'generator_options')
+def bench_route_generate(ctx, options):
+    response = ctx['client'].post('/generate_password', json=options)
+    assert response.status_code == 200, response.status_code
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_benchmark(ctx, fn, items, repeats, warmup=1):
+    """Time fn over every item, repeated; returns per-call statistics in microseconds"""
+    for _ in range(warmup):
+        for item in items[:20]:
+            fn(ctx, item)
+
+    per_call = []
+    pass_means = []
+    for _ in range(repeats):
+        start_pass = time.perf_counter()
+        for item in items:
+            start = time.perf_counter()
+            fn(ctx, item)
+            per_call.append(time.perf_counter() - start)
+        pass_means.append((time.perf_counter() - start_pass) / len(items))
+
+    per_call.sort()
+    return {
+        'calls': len(per_call),
+        'mean_us': round(statistics.median(pass_means) * 1e6, 3),
+        'p50_us': round(percentile(per_call, 0.50) * 1e6, 3),
+        'p95_us': round(percentile(per_call, 0.95) * 1e6, 3),
+        'p99_us': round(percentile(per_call, 0.99) * 1e6, 3)
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return (rows, regressions) comparing mean per-call time with the baseline"""
+    rows = []
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base is None:
+            rows.append((name, stats['mean_us'], None, None))
+            continue
+        change = stats['mean_us'] / base['mean_us'] - 1 if base['mean_us'] else 0.0
+        rows.append((name, stats['mean_us'], base['mean_us'], change))
+        if change > threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument('--output', help="write machine-readable results to this file")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown before failing, as a fraction (default: 0.25)")
+    parser.add_argument('--repeats', type=int, default=3, help="passes over each corpus (default: 3)")
+    parser.add_argument('--only', action='append', default=[],
+                        help="run only benchmarks whose name starts with this prefix")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store these results as the new baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    ctx = build_context()
+    results = {}
+    for name, (fn, corpus, limit) in BENCHMARKS.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        items = ctx['corpora'][corpus][:limit]
+        results[name] = run_benchmark(ctx, fn, items, args.repeats)
+        print(f"{name:<28} mean {results[name]['mean_us']:>12.1f} us   "
+              f"p95 {results[name]['p95_us']:>12.1f} us", file=sys.stderr)
+
+    report = {
+        'schema': SCHEMA_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'benchmarks': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline first", file=sys.stderr)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    rows, regressions = compare(results, baseline, args.threshold)
+    print(f"\n{'benchmark':<28} {'current us':>12} {'baseline us':>12} {'change':>9}")
+    for name, current, base, change in rows:
+        if base is None:
+            print(f"{name:<28} {current:>12.1f} {'-':>12} {'new':>9}")
+        else:
+            flag = '  REGRESSION' if name in regressions else ''
+            print(f"{name:<28} {current:>12.1f} {base:>12.1f} {change:>+9.1%}{flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
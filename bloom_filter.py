@@ -0,0 +1,157 @@
+"""
+Opt-in Bloom filter for the exact common-password store.
+
+A filter miss proves a password is absent without touching the exact
+store. The filter is built offline from the same wordlist as the store:
+    python bloom_filter.py data/rockyou.txt data/rockyou.bloom --fp-rate 0.001
+
+PasswordAnalyzer does not use it. benchmarks/bench_common_lookup.py shows
+no gain: the blake2b hash both lookups need costs more than the index's
+binary search, so PrefilteredStore is slower than the bare mmap index and
+far slower than an in-memory set. Wrap a store in it only where a lookup
+is much more expensive, such as an index on slow storage.
+"""
+import argparse
+import logging
+import math
+import mmap
+import os
+import struct
+from array import array
+
+import numpy as np
+
+from breach_index import iter_wordlist, password_hash
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PWBLM\x00'
+FORMAT_VERSION = 1
+
+# magic, version, hash count, bit count, entry count, padding to 32 bytes
+HEADER = struct.Struct('<6sHIQQ4x')
+
+
+class BloomFilter:
+    """Compact probabilistic set over password_hash values
+
+    Bit positions come from double hashing the 64-bit password hash, so a
+    lookup hashes the password once and the exact store can reuse the value.
+    """
+
+    def __init__(self, num_bits, num_hashes, bits, count=0):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.count = count
+        self._bits = bits
+
+    @staticmethod
+    def optimal_parameters(count, false_positive_rate):
+        """Bit and hash counts giving the requested false-positive rate"""
+        count = max(1, count)
+        num_bits = math.ceil(-count * math.log(false_positive_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / count * math.log(2)))
+        return num_bits, num_hashes
+
+    @classmethod
+    def from_hashes(cls, hashes, false_positive_rate=0.001):
+        """Build a filter from an array of unique password_hash values"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        num_bits, num_hashes = cls.optimal_parameters(len(hashes), false_positive_rate)
+
+        bits = np.zeros((num_bits + 7) // 8, dtype=np.uint8)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        for i in range(num_hashes):
+            positions = (h1 + np.uint64(i) * h2) % np.uint64(num_bits)
+            np.bitwise_or.at(bits, positions >> np.uint64(3),
+                             np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+
+        return cls(num_bits, num_hashes, memoryview(bits.tobytes()), len(hashes))
+
+    @classmethod
+    def from_wordlist(cls, wordlist_path, false_positive_rate=0.001):
+        """Build a filter from the same wordlist used for the exact store"""
+        hashes = array('Q', (password_hash(p) for p in iter_wordlist(wordlist_path)))
+        return cls.from_hashes(np.unique(np.frombuffer(hashes, dtype=np.uint64)), false_positive_rate)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a filter written by save()"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_hashes, num_bits, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} Bloom filter")
+        size = (num_bits + 7) // 8
+        if len(mapped) < HEADER.size + size:
+            raise ValueError(f"{path} is truncated")
+
+        return cls(num_bits, num_hashes, memoryview(mapped)[HEADER.size:HEADER.size + size], count)
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.num_hashes, self.num_bits, self.count))
+            f.write(self._bits)
+        os.replace(tmp_path, path)
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
+
+    def __contains__(self, password):
+        return self.contains_hash(password_hash(password))
+
+    def contains_hash(self, value):
+        """False means definitely absent; True means possibly present"""
+        bits = self._bits
+        num_bits = self.num_bits
+        h1 = value & 0xFFFFFFFF
+        h2 = (value >> 32) | 1
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+
+class PrefilteredStore:
+    """Exact common-password store that only runs lookups the filter lets through"""
+
+    def __init__(self, bloom, store):
+        self.bloom = bloom
+        self.store = store
+        self._store_takes_hash = hasattr(store, 'contains_hash')
+
+    def __len__(self):
+        return len(self.store)
+
+    def __contains__(self, password):
+        value = password_hash(password)
+        if not self.bloom.contains_hash(value):
+            return False
+        if self._store_takes_hash:
+            return self.store.contains_hash(value)
+        return password in self.store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a Bloom prefilter for the common-password store")
+    parser.add_argument('wordlist', help="wordlist with one password per line")
+    parser.add_argument('output', nargs='?', default=os.path.join('data', 'rockyou.bloom'),
+                        help="output filter path (default: data/rockyou.bloom)")
+    parser.add_argument('--fp-rate', type=float, default=0.001,
+                        help="target false-positive rate (default: 0.001)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    bloom = BloomFilter.from_wordlist(args.wordlist, args.fp_rate)
+    bloom.save(args.output)
+    logger.info(f"Wrote {bloom.count} entries in {bloom.size_bytes} bytes "
+                f"({bloom.num_hashes} hashes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compact on-disk index of breached passwords.
+
+The index is a small header followed by the sorted, de-duplicated 64-bit
+BLAKE2b hashes of every wordlist entry. It is memory-mapped read-only, so
+pre-forked workers share the same pages and opening it costs no parsing.
+Membership is a binary search over the mapped array.
+
+Build it offline from a wordlist (one password per line):
+    python breach_index.py data/rockyou.txt data/rockyou.idx
+"""
+import argparse
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PWIDX\x00'
+FORMAT_VERSION = 1
+
+# magic, version, hash width in bytes, entry count, padding to 32 bytes
+HEADER = struct.Struct('<6sHHQ14x')
+HASH_WIDTH = 8
+
+
+def password_hash(password):
+    """64-bit hash used for index entries and lookups"""
+    digest = hashlib.blake2b(
+        password.encode('utf-8', 'surrogatepass'), digest_size=HASH_WIDTH
+    ).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def iter_wordlist(file_path):
+    """Yield the non-empty entries of a wordlist the way the analyzer reads them"""
+    with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
+        for line in f:
+            password = line.strip()
+            if password:
+                yield password
+
+
+def build_index(wordlist_path, index_path):
+    """Hash every wordlist entry and write the sorted index; returns the entry count"""
+    hashes = array('Q')
+    for password in iter_wordlist(wordlist_path):
+        hashes.append(password_hash(password))
+
+    # array('Q') is native-endian; store little-endian regardless of host
+    sorted_hashes = np.unique(np.frombuffer(hashes, dtype=np.uint64)).astype('<u8')
+    del hashes
+
+    tmp_path = index_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, HASH_WIDTH, len(sorted_hashes)))
+        sorted_hashes.tofile(f)
+    os.replace(tmp_path, index_path)
+
+    logger.info(f"Wrote {len(sorted_hashes)} entries to {index_path}")
+    return len(sorted_hashes)
+
+
+class BreachIndex:
+    """Read-only, memory-mapped set of breached password hashes"""
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        with open(index_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, width, count = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or width != HASH_WIDTH:
+            raise ValueError(f"{index_path} is not a version {FORMAT_VERSION} breach index")
+        if len(self._mmap) < HEADER.size + count * HASH_WIDTH:
+            raise ValueError(f"{index_path} is truncated")
+
+        self._count = count
+        body = memoryview(self._mmap)[HEADER.size:HEADER.size + count * HASH_WIDTH]
+        if sys.byteorder == 'little':
+            self._hashes = body.cast('Q')
+        else:
+            # Big-endian hosts pay for a private, byte-swapped copy
+            self._hashes = array('Q', body.tobytes())
+            self._hashes.byteswap()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, password):
+        return self.contains_hash(password_hash(password))
+
+    def contains_hash(self, value):
+        """Membership test for a value already computed with password_hash"""
+        i = bisect_left(self._hashes, value)
+        return i < self._count and self._hashes[i] == value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a memory-mapped breached-password index")
+    parser.add_argument('wordlist', help="wordlist with one password per line")
+    parser.add_argument('index', nargs='?', default=os.path.join('data', 'rockyou.idx'),
+                        help="output index path (default: data/rockyou.idx)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    build_index(args.wordlist, args.index)
+
+
+if __name__ == "__main__":
+    main()
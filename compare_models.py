@@ -0,0 +1,236 @@
+"""
+Model-selection harness: candidate estimator families on one featurized split.
+
+Trains each candidate on the train_model.py dataset (through the dataset
+cache, so every candidate sees identical rows) and measures:
+
+    accuracy and classification report on the test split
+    serialized size (pickle, or the artifact directory)
+    load time and resident memory, in a fresh process per model
+    single-row and batch-of-1000 predict_proba latency, p50 and p99
+
+The forest is also measured as the ForestArrays artifact the app actually
+serves. Results print as a table and are written as JSON, so a run can be
+repeated and compared.
+
+    python compare_models.py [--only random_forest,naive_bayes] [--output data/model_selection.json]
+"""
+import argparse
+import json
+import logging
+import os
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from operator import methodcaller
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.feature_selection import SelectKBest, chi2
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+from forest_inference import ForestArrays
+from hashed_featurizer import HashedNgramFeaturizer
+from model_artifact import save_model
+from train_model import directory_size, load_training_data
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Histogram boosting needs dense input; 65536 hashed columns would not fit,
+# so it sees the most class-dependent ones only
+HGB_FEATURES = 2000
+
+BATCH_SIZE = 1000
+
+
+def candidates():
+    """Name -> unfitted estimator, each accepting the sparse hashed features"""
+    return {
+        'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
+        'hist_gradient_boosting': make_pipeline(
+            SelectKBest(chi2, k=HGB_FEATURES),
+            # methodcaller pickles by value, unlike a function in this script
+            FunctionTransformer(methodcaller('toarray'), accept_sparse=True),
+            HistGradientBoostingClassifier(random_state=42)
+        ),
+        'logistic_regression': LogisticRegression(max_iter=2000),
+        'naive_bayes': MultinomialNB()
+    }
+
+
+# Run in a fresh interpreter. Libraries are imported before measuring, so
+# only the model's own load time and memory are counted
+LOAD_PROBE = """
+import json, pickle, sys, time
+import numpy as np
+import scipy.sparse as sp
+import sklearn.ensemble, sklearn.feature_selection, sklearn.linear_model
+import sklearn.naive_bayes, sklearn.pipeline, sklearn.preprocessing
+sys.path.insert(0, {root!r})
+import model_artifact
+
+def rss_kb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+
+kind, path, features_path = sys.argv[1:4]
+X = sp.load_npz(features_path).tocsr()
+before = rss_kb()
+start = time.perf_counter()
+if kind == 'artifact':
+    model = model_artifact.load_model(path)[0]
+else:
+    with open(path, 'rb') as f:
+        model = pickle.load(f)
+loaded = time.perf_counter()
+model.predict_proba(X)
+print(json.dumps({{'load_s': loaded - start, 'rss_kb': rss_kb() - before}}))
+"""
+
+
+def measure_load(kind, path, features_path):
+    """Load time and resident memory growth (after one prediction) in a new process"""
+    output = subprocess.run(
+        [sys.executable, '-c', LOAD_PROBE.format(root=ROOT), kind, path, features_path],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def percentiles(samples):
+    return {'p50_ms': round(float(np.percentile(samples, 50)) * 1000, 4),
+            'p99_ms': round(float(np.percentile(samples, 99)) * 1000, 4)}
+
+
+def measure_latency(model, X, rows=300, batch_runs=30):
+    """predict_proba latency on single rows and on batches of BATCH_SIZE rows"""
+    single = []
+    for i in range(min(rows, X.shape[0])):
+        x = X[i]
+        start = time.perf_counter()
+        model.predict_proba(x)
+        single.append(time.perf_counter() - start)
+
+    # The test split is smaller than a batch, so its rows are repeated
+    batch = sp.vstack([X] * -(-BATCH_SIZE // X.shape[0]), format='csr')[:BATCH_SIZE]
+    batched = []
+    for _ in range(batch_runs):
+        start = time.perf_counter()
+        model.predict_proba(batch)
+        batched.append(time.perf_counter() - start)
+
+    return {'single_row': percentiles(single), f'batch_{BATCH_SIZE}': percentiles(batched)}
+
+
+def evaluate(name, model, data, workdir, features_path, kind='pickle'):
+    """Every measurement for one fitted model (sklearn estimator or ForestArrays)"""
+    y_pred = np.asarray(model.predict(data['X_test']))
+    report = classification_report(data['y_test'], y_pred, output_dict=True, zero_division=0)
+
+    if kind == 'artifact':
+        path = os.path.join(workdir, name)
+        save_model(path, model, HashedNgramFeaturizer())
+        size = directory_size(path)
+    else:
+        path = os.path.join(workdir, f"{name}.pkl")
+        with open(path, 'wb') as f:
+            pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        size = os.path.getsize(path)
+
+    load = measure_load(kind, path, features_path)
+    return {
+        'model': name,
+        'accuracy': round(accuracy_score(data['y_test'], y_pred), 4),
+        'macro_f1': round(report['macro avg']['f1-score'], 4),
+        'classification_report': report,
+        'size_kb': round(size / 1024, 1),
+        'load_ms': round(load['load_s'] * 1000, 2),
+        'rss_kb': load['rss_kb'],
+        'latency': measure_latency(model, data['X_test'])
+    }
+
+
+def run(names=None):
+    data, _ = load_training_data()
+    models = candidates()
+    names = names or list(models)
+    results = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        features_path = os.path.join(workdir, 'X_test.npz')
+        sp.save_npz(features_path, data['X_test'])
+
+        for name in names:
+            start = time.perf_counter()
+            model = models[name].fit(data['X_train'], data['y_train'])
+            fit_s = time.perf_counter() - start
+            logger.info(f"Fitted {name} in {fit_s:.1f}s")
+
+            result = evaluate(name, model, data, workdir, features_path)
+            result['fit_s'] = round(fit_s, 2)
+            results.append(result)
+
+            # What the app serves: the same forest as a memory-mapped artifact
+            if isinstance(model, RandomForestClassifier):
+                result = evaluate(f"{name}_artifact", ForestArrays.from_sklearn(model), data, workdir,
+                                  features_path, kind='artifact')
+                result['fit_s'] = round(fit_s, 2)
+                results.append(result)
+
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'train_rows': data['X_train'].shape[0],
+        'test_rows': data['X_test'].shape[0],
+        'results': results
+    }
+
+
+def print_table(report, out=sys.stdout):
+    header = (f"{'model':<26}{'accuracy':>9}{'macro F1':>9}{'size KB':>10}{'load ms':>9}{'RSS KB':>9}"
+              f"{'1 row p50':>11}{'p99':>9}{'1000 p50':>10}{'p99':>9}{'fit s':>8}")
+    out.write(header + '\n')
+    for r in report['results']:
+        single, batch = r['latency']['single_row'], r['latency'][f'batch_{BATCH_SIZE}']
+        out.write(f"{r['model']:<26}{r['accuracy']:>9.4f}{r['macro_f1']:>9.4f}{r['size_kb']:>10.1f}"
+                  f"{r['load_ms']:>9.2f}{r['rss_kb']:>9}{single['p50_ms']:>11.3f}{single['p99_ms']:>9.3f}"
+                  f"{batch['p50_ms']:>10.2f}{batch['p99_ms']:>9.2f}{r['fit_s']:>8.2f}\n")
+    out.write("latencies in ms\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare estimator families for the strength model")
+    parser.add_argument('--only', help="comma-separated subset of: " + ', '.join(candidates()))
+    parser.add_argument('--output', default=os.path.join('data', 'model_selection.json'),
+                        help="JSON results (default: data/model_selection.json)")
+    args = parser.parse_args(argv)
+
+    names = args.only.split(',') if args.only else None
+    unknown = set(names or []) - set(candidates())
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+
+    report = run(names)
+    print_table(report)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
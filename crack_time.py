@@ -0,0 +1,127 @@
+"""
+Crack-time estimates for several attacker profiles, computed in log space.
+
+A password with `entropy` bits takes up to 2**entropy guesses. Working with
+log10(seconds) instead of seconds keeps the estimate finite for any entropy
+(2**entropy overflows a float past ~1024 bits) and lets every profile be
+evaluated for a whole batch of passwords in one NumPy expression.
+"""
+import math
+
+import numpy as np
+
+# Guesses per second for each attacker, in display order
+ATTACKER_PROFILES = {
+    # Login form with rate limiting: about 100 attempts per hour
+    'online_throttled': 100 / 3600,
+    # Offline attack on a slow, salted hash such as bcrypt or argon2
+    'offline_slow_hash': 1e4,
+    # Offline attack on a fast unsalted hash (MD5, SHA-1) with modern hardware
+    'offline_fast_hash': 1e10,
+    # Dedicated GPU cluster against a fast hash
+    'gpu_cluster': 1e12
+}
+
+# Profile used for the headline estimate and `time_to_crack`
+DEFAULT_PROFILE = 'offline_fast_hash'
+
+# Units and their length in seconds, smallest first; keys match the
+# 'time_units' translations
+TIME_UNITS = [
+    ('seconds', 1),
+    ('minutes', 60),
+    ('hours', 3600),
+    ('days', 86400),
+    ('months', 2628000),
+    ('years', 31536000),
+    ('centuries', 3153600000)
+]
+
+_PROFILE_NAMES = list(ATTACKER_PROFILES)
+_LOG10_RATES = np.log10(list(ATTACKER_PROFILES.values()))
+_UNIT_NAMES = [unit for unit, _ in TIME_UNITS]
+_LOG10_UNIT_SECONDS = np.log10([seconds for _, seconds in TIME_UNITS])
+_LOG10_2 = math.log10(2)
+
+# Values up to this many digits are returned exactly; larger ones are rounded
+# to three significant figures, and past the float range only the log is kept
+_EXACT_DIGITS = 6
+_MAX_FLOAT_DIGITS = 300
+
+
+def log10_seconds(entropies):
+    """log10 of the seconds needed by each profile, shape (len(entropies), profiles)"""
+    entropies = np.asarray(entropies, dtype=np.float64).reshape(-1, 1)
+    return entropies * _LOG10_2 - _LOG10_RATES
+
+
+def estimate(entropy):
+    """Structured crack-time estimate for a single entropy value"""
+    return estimate_many([entropy])[0]
+
+
+def estimate_many(entropies):
+    """Structured crack-time estimates for a batch of entropy values
+
+    Each estimate describes the default profile (value, unit, log10 values
+    and an English `display` string) and repeats that for every profile
+    under 'profiles'.
+    """
+    log_seconds = log10_seconds(entropies)
+    units = np.maximum(np.searchsorted(_LOG10_UNIT_SECONDS, log_seconds, side='right') - 1, 0)
+    log_values = log_seconds - _LOG10_UNIT_SECONDS[units]
+
+    estimates = []
+    for row_seconds, row_units, row_values in zip(log_seconds.tolist(), units.tolist(), log_values.tolist()):
+        profiles = {
+            name: _entry(log_value, _UNIT_NAMES[unit], seconds)
+            for name, seconds, unit, log_value in zip(_PROFILE_NAMES, row_seconds, row_units, row_values)
+        }
+        estimates.append({
+            'profile': DEFAULT_PROFILE,
+            **profiles[DEFAULT_PROFILE],
+            'profiles': profiles
+        })
+    return estimates
+
+
+def _entry(log_value, unit, log_seconds):
+    if log_seconds < 0:
+        value = 0
+    elif log_value < _EXACT_DIGITS:
+        value = int(10 ** log_value)
+    elif log_value < _MAX_FLOAT_DIGITS:
+        value = float(f"{10 ** log_value:.3g}")
+    else:
+        value = None
+    entry = {
+        'value': value,
+        'unit': unit,
+        'log10_value': round(log_value, 3),
+        'log10_seconds': round(log_seconds, 3)
+    }
+    entry['display'] = format_duration(entry)
+    return entry
+
+
+def format_duration(entry, unit_label=None, sub_second_label=None):
+    """Human-readable duration such as '3 hours' or '4.2e+31 centuries'
+
+    `unit_label` is the localized (plural) unit name and `sub_second_label`
+    the localized phrase for durations under a second; English is used
+    without them.
+    """
+    if entry['log10_seconds'] < 0:
+        return sub_second_label or '< 1 second'
+
+    label = unit_label or entry['unit']
+    value = entry['value']
+    if value is None:
+        exponent = math.floor(entry['log10_value'])
+        mantissa = round(10 ** (entry['log10_value'] - exponent), 2)
+        if mantissa >= 10:
+            mantissa, exponent = mantissa / 10, exponent + 1
+        return f"{mantissa:.3g}e+{exponent} {label}"
+    if isinstance(value, float):
+        return f"{value:.3g} {label}"
+    return f"{value} {label}"
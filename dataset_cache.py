@@ -0,0 +1,105 @@
+"""
+On-disk cache of labeled, featurized training data.
+
+Every training run used to reload the wordlist, label it and hash its
+n-grams before fitting anything. Entries here are keyed by a content hash
+of the wordlist plus the labeler version, featurizer config and sampling
+settings, so changing any of them builds a new entry instead of reusing a
+stale one.
+
+    data/dataset_cache/<key>/
+        dataset.json        the inputs the key was built from, row counts
+        X_train.npz ...     sparse feature matrices (scipy npz)
+        y_train.npy ...     labels
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get('DATASET_CACHE_DIR', os.path.join('data', 'dataset_cache'))
+HEADER_FILE = 'dataset.json'
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dataset_key(inputs):
+    """Short stable key for a JSON-serializable description of a dataset"""
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def save_dataset(directory, splits, inputs):
+    """Write splits (name -> sparse matrix or array), replacing any existing entry"""
+    directory = os.path.normpath(directory)
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    shapes = {}
+    for name, data in splits.items():
+        if sp.issparse(data):
+            sp.save_npz(os.path.join(tmp_dir, f"{name}.npz"), sp.csr_matrix(data))
+        else:
+            data = np.asarray(data)
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), data, allow_pickle=False)
+        shapes[name] = {'sparse': sp.issparse(data), 'shape': list(data.shape)}
+    # The header goes last; a directory without one is never loaded
+    with open(os.path.join(tmp_dir, HEADER_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'inputs': inputs, 'splits': shapes}, f, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(tmp_dir, directory)
+
+
+def load_dataset(directory):
+    """Return the splits saved in a cache entry"""
+    with open(os.path.join(directory, HEADER_FILE), encoding='utf-8') as f:
+        header = json.load(f)
+
+    splits = {}
+    for name, info in header['splits'].items():
+        if info['sparse']:
+            data = sp.load_npz(os.path.join(directory, f"{name}.npz")).tocsr()
+        else:
+            data = np.load(os.path.join(directory, f"{name}.npy"), allow_pickle=False)
+        if list(data.shape) != info['shape']:
+            raise ValueError(f"Split {name} does not match the dataset header")
+        splits[name] = data
+    return splits
+
+
+def cached_dataset(inputs, build, cache_dir=None):
+    """Load the dataset described by `inputs`, calling build() on a miss
+
+    Returns (splits, directory). A corrupt entry is rebuilt; a cache that
+    cannot be written only costs the next run a rebuild.
+    """
+    directory = os.path.join(cache_dir or CACHE_DIR, dataset_key(inputs))
+    if os.path.exists(os.path.join(directory, HEADER_FILE)):
+        try:
+            splits = load_dataset(directory)
+            logger.info(f"Loaded cached dataset from {directory}")
+            return splits, directory
+        except Exception as e:
+            logger.error(f"Error loading cached dataset {directory}: {e}")
+
+    splits = build()
+    try:
+        save_dataset(directory, splits, inputs)
+        logger.info(f"Cached dataset in {directory}")
+    except Exception as e:
+        logger.error(f"Error caching dataset: {e}")
+    return splits, directory
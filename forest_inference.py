@@ -0,0 +1,262 @@
+import logging
+
+import numpy as np
+import scipy.sparse as sp
+
+logger = logging.getLogger(__name__)
+
+# Up to this many rows every tree is walked at once in NumPy. Larger batches
+# go through sklearn's compiled traversal, one tree at a time: the trees are
+# deep (tens of levels for sparse n-gram features), so a step per level in
+# NumPy falls behind compiled code once there are more than a few rows
+NUMPY_BATCH_LIMIT = 4
+
+# Rows of the first large batch walked both ways before trusting the compiled trees
+COMPILED_CHECK_ROWS = 16
+
+
+class ForestArrays:
+    """A fitted random forest flattened into NumPy arrays for fast inference
+
+    Every tree's nodes are stored back to back in shared arrays (feature,
+    threshold, left/right child and per-class leaf probabilities), and all
+    trees are walked at once, one level per step, for as long as any
+    (row, tree) pair has not reached a leaf. This skips the input
+    validation and joblib dispatch that sklearn performs on every
+    predict_proba call, which dominates the cost of scoring a single
+    password, while producing the same probabilities.
+
+    Batches above NUMPY_BATCH_LIMIT rows find their leaves with sklearn's
+    compiled Tree.apply instead, on trees rebuilt from these arrays the
+    first time one is needed (about 64 bytes per node of private memory)
+    and checked against the NumPy walk on the first rows of that batch.
+    Either way the leaf values are summed here, so the probabilities are
+    the same.
+
+    The arrays are everything inference reads, so they can be saved and
+    memory-mapped back as they are (see model_artifact.py).
+    """
+
+    # Arrays that fully describe the forest, in artifact order
+    ARRAY_NAMES = ('node_column', 'used_features', 'threshold', 'left', 'right', 'is_leaf', 'value', 'roots')
+
+    def __init__(self, node_column, used_features, threshold, left, right, is_leaf, value, roots,
+                 classes, n_features):
+        # Only features used by some split are materialized for each row;
+        # node_column indexes into the sorted used_features
+        self.node_column = node_column
+        self.used_features = used_features
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.is_leaf = is_leaf
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features = n_features
+        # sklearn trees for large batches and the feature -> used column table
+        # they need, built on first use; False if unavailable
+        self._compiled = None
+        self._used_column = None
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Export a fitted RandomForestClassifier (or ExtraTreesClassifier)"""
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be exported")
+
+        n_classes = len(forest.classes_)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n_nodes = tree.node_count
+            is_leaf = tree.children_left == -1
+
+            # Child indices are shifted into the shared arrays; leaves keep -1
+            left = np.where(is_leaf, -1, tree.children_left + offset)
+            right = np.where(is_leaf, -1, tree.children_right + offset)
+            feature = np.where(is_leaf, 0, tree.feature)
+
+            # Normalize the same way DecisionTreeClassifier.predict_proba does
+            value = tree.value[:, 0, :n_classes].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value /= normalizer
+
+            features.append(feature)
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+            offset += n_nodes
+
+        return cls._from_parts(features, thresholds, lefts, rights, values, roots,
+                               np.asarray(forest.classes_), forest.n_features_in_)
+
+    @classmethod
+    def concatenate(cls, forests, classes):
+        """One forest holding every tree of `forests`, each weighted equally
+
+        Used to combine forests trained on separate chunks of data. Leaf
+        probabilities are widened to `classes`, so a chunk that never saw a
+        class simply gives it zero probability.
+        """
+        classes = np.asarray(classes)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for forest in forests:
+            if not np.isin(forest.classes_, classes).all():
+                raise ValueError(f"Forest classes {forest.classes_.tolist()} are not all in {classes.tolist()}")
+            n_nodes = len(forest.threshold)
+            value = np.zeros((n_nodes, len(classes)), dtype=np.float64)
+            value[:, np.searchsorted(classes, forest.classes_)] = forest.value
+
+            features.append(np.where(forest.is_leaf, 0, np.asarray(forest.used_features)[forest.node_column]))
+            thresholds.append(np.asarray(forest.threshold))
+            lefts.append(np.where(forest.is_leaf, -1, np.asarray(forest.left) + offset))
+            rights.append(np.where(forest.is_leaf, -1, np.asarray(forest.right) + offset))
+            values.append(value)
+            roots.extend((np.asarray(forest.roots) + offset).tolist())
+            offset += n_nodes
+
+        n_features = max(forest.n_features for forest in forests)
+        return cls._from_parts(features, thresholds, lefts, rights, values, roots, classes, n_features)
+
+    @classmethod
+    def _from_parts(cls, features, thresholds, lefts, rights, values, roots, classes, n_features):
+        feature = np.concatenate(features)
+        used_features = np.unique(feature).astype(np.int64)
+        left = np.concatenate(lefts).astype(np.int64)
+        return cls(
+            node_column=np.searchsorted(used_features, feature).astype(np.int64),
+            used_features=used_features,
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=left,
+            right=np.concatenate(rights).astype(np.int64),
+            is_leaf=left < 0,
+            value=np.concatenate(values),
+            roots=np.array(roots, dtype=np.int64),
+            classes=classes,
+            n_features=n_features
+        )
+
+    def _dense_used_columns(self, X):
+        """Dense float32 matrix of the used feature columns of a sparse or dense X"""
+        if hasattr(X, 'tocsr'):
+            X = X.tocsr()
+            if not X.has_canonical_format:
+                X = X.copy()
+                X.sum_duplicates()
+            rows = np.repeat(np.arange(X.shape[0]), np.diff(X.indptr))
+            columns = np.minimum(np.searchsorted(self.used_features, X.indices), len(self.used_features) - 1)
+            keep = self.used_features[columns] == X.indices
+            dense = np.zeros((X.shape[0], len(self.used_features)), dtype=np.float32)
+            dense[rows[keep], columns[keep]] = X.data[keep]
+            return dense
+        return np.asarray(X, dtype=np.float32)[:, self.used_features]
+
+    def _compiled_trees(self, sample):
+        """(first node, sklearn Tree) per tree, splitting on used-feature columns
+
+        Built from sklearn's private node layout, so the first time they are
+        checked against the NumPy walk on the `sample` rows; on any mismatch
+        or error every batch stays on NumPy.
+        """
+        if self._compiled is None:
+            try:
+                compiled = self._build_compiled()
+                if not np.array_equal(self._apply_compiled(sample, compiled), self._apply_numpy(sample)):
+                    raise ValueError("leaves differ from the NumPy traversal")
+                self._compiled = compiled
+            except Exception as e:
+                logger.warning(f"Compiled tree traversal unavailable, using NumPy for all batches: {e}")
+                self._compiled = False
+        return self._compiled
+
+    def _build_compiled(self):
+        # Imported here so small batches and startup never load sklearn
+        from sklearn.tree._tree import NODE_DTYPE, Tree
+
+        compiled = []
+        bounds = np.append(self.roots, len(self.threshold))
+        for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+            leaf = self.is_leaf[start:end]
+            nodes = np.zeros(end - start, dtype=NODE_DTYPE)
+            nodes['left_child'] = np.where(leaf, -1, self.left[start:end] - start)
+            nodes['right_child'] = np.where(leaf, -1, self.right[start:end] - start)
+            nodes['feature'] = np.where(leaf, -2, self.node_column[start:end])
+            nodes['threshold'] = np.where(leaf, -2.0, self.threshold[start:end])
+            # Only the structure is used; leaf values stay in self.value
+            tree = Tree(len(self.used_features), np.array([1], dtype=np.intp), 1)
+            tree.__setstate__({'max_depth': 0, 'node_count': end - start, 'nodes': nodes,
+                               'values': np.zeros((end - start, 1, 1))})
+            compiled.append((start, tree))
+        used_column = np.full(max(self.n_features, int(self.used_features[-1]) + 1), -1, dtype=np.int32)
+        used_column[self.used_features] = np.arange(len(self.used_features), dtype=np.int32)
+        self._used_column = used_column
+        return compiled
+
+    def _sparse_used_columns(self, X):
+        """float32 CSR matrix of the used feature columns of a sparse X"""
+        X = X.tocsr()
+        if not X.has_canonical_format:
+            X = X.copy()
+            X.sum_duplicates()
+        columns = self._used_column[X.indices]
+        keep = columns >= 0
+        kept_before = np.zeros(len(keep) + 1, dtype=np.int32)
+        np.cumsum(keep, out=kept_before[1:])
+        return sp.csr_matrix((X.data[keep].astype(np.float32), columns[keep], kept_before[X.indptr]),
+                             shape=(X.shape[0], len(self.used_features)))
+
+    def _apply_compiled(self, X, compiled):
+        if hasattr(X, 'tocsr'):
+            X = self._sparse_used_columns(X)
+        else:
+            X = np.ascontiguousarray(np.asarray(X, dtype=np.float32)[:, self.used_features])
+        leaves = np.empty((len(compiled), X.shape[0]), dtype=np.int64)
+        for i, (start, tree) in enumerate(compiled):
+            np.add(tree.apply(X), start, out=leaves[i])
+        return leaves.T
+
+    def apply(self, X):
+        """Index of the leaf reached in every tree, shape (n_samples, n_trees)"""
+        if X.shape[0] > NUMPY_BATCH_LIMIT:
+            compiled = self._compiled_trees(X[:COMPILED_CHECK_ROWS])
+            if compiled:
+                return self._apply_compiled(X, compiled)
+        return self._apply_numpy(X)
+
+    def _apply_numpy(self, X):
+        dense = self._dense_used_columns(X)
+        n_samples, n_trees = dense.shape[0], len(self.roots)
+        nodes = np.tile(self.roots, n_samples)
+        samples = np.repeat(np.arange(n_samples), n_trees)
+
+        # Only (row, tree) pairs still at a split node are advanced
+        active = np.flatnonzero(~self.is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            # float32 inputs compared against float64 thresholds, as in sklearn
+            go_left = dense[samples[active], self.node_column[current]] <= self.threshold[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[~self.is_leaf[current]]
+        return nodes.reshape(n_samples, n_trees)
+
+    def predict_proba(self, X):
+        """Class probabilities averaged over the trees, matching sklearn's forest"""
+        leaves = self.apply(X)
+        # Sum tree by tree in estimator order, as sklearn accumulates them,
+        # so the result is identical to the last bit
+        probs = self.value[leaves.T].sum(axis=0)
+        probs /= len(self.roots)
+        return probs
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class _Request:
+    """One caller's password and, once the batch has run, its result"""
+
+    __slots__ = ('password', 'enqueued_at', 'done', 'result', 'error')
+
+    def __init__(self, password):
+        self.password = password
+        self.enqueued_at = time.monotonic()
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class InferenceScheduler:
+    """Micro-batches concurrent strength predictions into one model call
+
+    Callers queue their password; one of them becomes the leader and runs
+    predict_strength_many for everything queued, up to max_batch_size, while
+    the rest wait for their result. A leader that finds itself alone runs
+    immediately, so light traffic pays no extra latency. When other requests
+    are already queued it waits up to max_wait_seconds for the batch to fill,
+    as long as new requests keep arriving. Requests arriving while a batch
+    runs form the next batch.
+    """
+
+    def __init__(self, model, max_batch_size=32, max_wait_seconds=0.001):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._running = False
+
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.queue_delay_total = 0.0
+        self.queue_delay_max = 0.0
+
+    def predict_strength(self, password):
+        """Same result as model.predict_strength, computed in a shared batch"""
+        if not password:
+            return self.model.predict_strength(password)
+
+        request = _Request(password)
+        with self._condition:
+            self._queue.append(request)
+            self._condition.notify_all()
+            while self._running and not request.done:
+                self._condition.wait()
+            if not request.done:
+                self._lead(request)
+
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _lead(self, request):
+        """Run batches until this caller's request is served (lock held on entry)"""
+        self._running = True
+        try:
+            while not request.done:
+                # Others are already waiting, so traffic is heavy enough to
+                # make it worth holding the batch open briefly. Stop early once
+                # arrivals pause, since every caller may already be queued.
+                if len(self._queue) > 1 and self.max_wait_seconds > 0:
+                    deadline = time.monotonic() + self.max_wait_seconds
+                    idle_gap = self.max_wait_seconds / 4
+                    while len(self._queue) < self.max_batch_size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        queued = len(self._queue)
+                        self._condition.wait(min(remaining, idle_gap))
+                        if len(self._queue) == queued:
+                            break
+
+                batch = [self._queue.popleft() for _ in range(min(self.max_batch_size, len(self._queue)))]
+                self._condition.release()
+                try:
+                    self._run_batch(batch)
+                finally:
+                    self._condition.acquire()
+                self._condition.notify_all()
+        finally:
+            self._running = False
+            self._condition.notify_all()
+
+    def _run_batch(self, batch):
+        started = time.monotonic()
+        try:
+            results = self.model.predict_strength_many([r.password for r in batch])
+        except Exception as e:
+            logger.error(f"Error in batched strength prediction: {e}")
+            results = None
+            for r in batch:
+                r.error = e
+
+        delays = [started - r.enqueued_at for r in batch]
+        with self._condition:
+            for i, r in enumerate(batch):
+                if results is not None:
+                    r.result = results[i]
+                r.done = True
+            self.requests += len(batch)
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+            self.queue_delay_total += sum(delays)
+            self.queue_delay_max = max(self.queue_delay_max, max(delays))
+
+    def stats(self):
+        """Batch fill and queue delay since startup"""
+        with self._condition:
+            mean_batch = self.requests / self.batches if self.batches else 0.0
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_seconds * 1000,
+                'mean_batch_size': round(mean_batch, 2),
+                'mean_batch_fill': round(mean_batch / self.max_batch_size, 4),
+                'largest_batch': self.largest_batch,
+                'mean_queue_delay_ms': round(self.queue_delay_total / self.requests * 1000, 3) if self.requests else 0.0,
+                'max_queue_delay_ms': round(self.queue_delay_max * 1000, 3)
+            }
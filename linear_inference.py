@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class LinearArrays:
+    """A multinomial linear model over hashed n-grams, stored as plain arrays
+
+    The compact alternative to ForestArrays: scoring is one sparse-dense
+    product and a softmax, so a single password costs a few microseconds
+    and the model is a weight per (feature, class). train_model.py fits it
+    to the forest's probabilities (see distill_model).
+    """
+
+    # Arrays that fully describe the model, in artifact order
+    ARRAY_NAMES = ('coef', 'intercept')
+
+    def __init__(self, coef, intercept, classes, n_features):
+        # coef is (n_features, n_classes) so X @ coef needs no transpose
+        self.coef = coef
+        self.intercept = intercept
+        self.classes_ = classes
+        self.n_features = n_features
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_NAMES}
+
+    @classmethod
+    def from_sklearn(cls, model, dtype=np.float32):
+        """Export a fitted multinomial LogisticRegression"""
+        if len(model.classes_) < 3:
+            raise ValueError("Only multinomial models with three or more classes can be exported")
+        return cls(
+            coef=np.ascontiguousarray(model.coef_.T, dtype=dtype),
+            intercept=np.asarray(model.intercept_, dtype=dtype),
+            classes=np.asarray(model.classes_),
+            n_features=model.coef_.shape[1]
+        )
+
+    def predict_proba(self, X):
+        """Class probabilities for each row of a sparse feature matrix"""
+        # X @ coef by hand over the CSR arrays: scipy's sparse-dense product
+        # costs tens of microseconds of dispatch for a single row
+        X = X.tocsr()
+        contributions = self.coef[X.indices].astype(np.float64) * X.data[:, np.newaxis]
+        scores = np.zeros((X.shape[0], len(self.intercept)), dtype=np.float64)
+        non_empty = np.diff(X.indptr) > 0
+        if contributions.shape[0]:
+            scores[non_empty] = np.add.reduceat(contributions, X.indptr[:-1][non_empty], axis=0)
+        scores += self.intercept
+        scores -= scores.max(axis=1, keepdims=True)
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -0,0 +1,174 @@
+import logging
+import threading
+import time
+
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class _LiveSession:
+    """Per-session state: the latest keystroke and the last evaluated profile"""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.latest_seq = 0
+        self.pending = None
+        self.pending_tag = None
+        self.evaluating = False
+        self.result_seq = 0
+        self.result = None
+        self.profile = None
+        self.last_arrival = 0.0
+        # Requests inside submit(); the sweeper leaves busy sessions alone
+        self.active = 0
+
+
+class LiveAnalysisCoalescer:
+    """Collapses bursts of live-typing requests from one session into one evaluation
+
+    A request arriving on its own is evaluated at once. Within a burst (a
+    request following another by less than the window, or one that had to
+    wait for a running evaluation) the leading request waits the window for
+    further keystrokes, then evaluates only the newest password and hands
+    that result to every request that arrived in the meantime. The previous profile is kept so
+    the evaluation only scans newly typed characters.
+
+    Sessions hold the typed password, so once started a sweeper thread
+    clears it from every session idle for longer than the window and drops
+    expired sessions every sweep_seconds.
+    """
+
+    def __init__(self, analyzer, window_seconds=0.05, max_sessions=10000,
+                 session_ttl=120, wait_timeout=2.0, sweep_seconds=1.0):
+        self.analyzer = analyzer
+        self.window_seconds = window_seconds
+        self.wait_timeout = wait_timeout
+        self.sweep_seconds = sweep_seconds
+        self._sessions = TTLCache(max_sessions, session_ttl)
+        self._sessions_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.requests = 0
+        self.evaluations = 0
+        self.cleared = 0
+
+    def _session(self, session_id):
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = _LiveSession()
+            # Re-put on every request so active sessions keep their TTL fresh
+            self._sessions.put(session_id, session)
+            self.requests += 1
+            return session
+
+    def submit(self, session_id, password, tag=None):
+        """Return the live metrics for the newest password typed in this session
+
+        `tag` is an opaque client value (such as a keystroke counter) echoed
+        back in the result. A coalesced request receives the result of a newer
+        keystroke, and the tag tells the client which one it describes.
+        """
+        session = self._session(session_id)
+        with session.condition:
+            session.active += 1
+        try:
+            return self._submit(session, password, tag)
+        finally:
+            with session.condition:
+                session.active -= 1
+
+    def _submit(self, session, password, tag):
+        with session.condition:
+            session.latest_seq += 1
+            seq = session.latest_seq
+            session.pending = password
+            session.pending_tag = tag
+            now = time.monotonic()
+            burst = now - session.last_arrival < self.window_seconds or session.evaluating
+            session.last_arrival = now
+
+            deadline = now + self.wait_timeout
+            while session.evaluating:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                session.condition.wait(remaining)
+                if session.result_seq >= seq:
+                    return dict(session.result)
+            session.evaluating = True
+
+        try:
+            # Give the rest of a burst a moment to arrive before evaluating
+            if burst and self.window_seconds > 0:
+                time.sleep(self.window_seconds)
+
+            with session.condition:
+                password = session.pending
+                tag = session.pending_tag
+                seq = session.latest_seq
+                previous = session.profile
+
+            metrics, profile = self.analyzer.analyze_live(password, previous)
+            with self._sessions_lock:
+                self.evaluations += 1
+            result = {**metrics, 'tag': tag}
+
+            with session.condition:
+                if seq > session.result_seq:
+                    session.result_seq = seq
+                    session.result = result
+                    session.profile = profile
+                return dict(result)
+        finally:
+            with session.condition:
+                session.evaluating = False
+                session.condition.notify_all()
+
+    def sweep(self):
+        """Drop expired sessions and forget the password of idle ones; returns how many were cleared"""
+        self._sessions.purge_expired()
+        now = time.monotonic()
+        cleared = 0
+        for session in self._sessions.values():
+            with session.condition:
+                if session.active or session.pending is None or now - session.last_arrival <= self.window_seconds:
+                    continue
+                # The next keystroke is analyzed from scratch
+                session.pending = None
+                session.pending_tag = None
+                session.profile = None
+                session.result = None
+                cleared += 1
+        with self._sessions_lock:
+            self.cleared += cleared
+        return cleared
+
+    def start(self):
+        """Start sweeping in a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sweep_loop, name='live-sessions', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_seconds):
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.error(f"Error sweeping live sessions: {e}")
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'evaluations': self.evaluations,
+            'active_sessions': len(self._sessions),
+            'cleared': self.cleared
+        }
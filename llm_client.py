@@ -0,0 +1,279 @@
+"""
+Resilient wrapper around the LLM chat-completions client.
+
+Every call gets a total deadline, waits for one of a bounded number of
+concurrency slots, reuses pooled keep-alive connections and goes through
+a circuit breaker. After repeated failures the breaker opens and calls
+fail at once with LLMUnavailable, so callers serve their fallback without
+tying up a worker thread on a provider that is down. Once reset_seconds
+have passed a single probe call is let through (half-open); its success
+closes the breaker again.
+
+Only timeouts, connection errors, 429 and 5xx responses are retried and
+count toward the breaker. Any other error response (a bad request, an
+invalid key) is raised at once, since a retry cannot fix it and the
+provider itself is up.
+"""
+import logging
+import threading
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class LLMUnavailable(Exception):
+    """The call was not attempted or did not finish within its deadline"""
+
+
+class DeadlineExceeded(LLMUnavailable):
+    pass
+
+
+def pooled_http_client(max_connections=8, keepalive_seconds=30.0, connect_timeout=3.0):
+    """httpx client keeping connections to the provider alive between calls"""
+    return httpx.Client(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections,
+                            keepalive_expiry=keepalive_seconds),
+        timeout=httpx.Timeout(30.0, connect=connect_timeout)
+    )
+
+
+def _transient_error(error):
+    """Whether an error may go away on retry: timeouts, connection errors, 429 and 5xx"""
+    if isinstance(error, (httpx.TimeoutException, httpx.TransportError, DeadlineExceeded)):
+        return True
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status == 429 or status >= 500
+    # The SDKs wrap timeouts and connection errors without a status code
+    name = type(error).__name__.lower()
+    return 'timeout' in name or 'connection' in name
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe"""
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self):
+        """Whether a call may go ahead now; an allowed half-open call is the probe"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self.opened_at >= self.reset_seconds:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("LLM circuit breaker closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning(f"LLM circuit breaker opened after {self.consecutive_failures} failures")
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = self._clock()
+
+    def release_probe(self):
+        """Give up a probe slot without a verdict (the call was never made)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(0.0, self.reset_seconds - (self._clock() - self.opened_at)), 2)
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_seconds': self.reset_seconds,
+                'times_opened': self.times_opened,
+                'probe_in_seconds': retry_in
+            }
+
+
+class ResilientLLMClient:
+    """Deadline, concurrency limit, retry and circuit breaker around a chat client
+
+    `client` is an OpenAI-style SDK client (client.chat.completions.create),
+    ideally built with max_retries=0 and a pooled_http_client(), since
+    retries are done here within the deadline.
+    """
+
+    def __init__(self, client, deadline_seconds=8.0, max_concurrency=8, max_queue_seconds=1.0,
+                 retries=1, breaker=None):
+        self.client = client
+        self.deadline_seconds = deadline_seconds
+        self.max_concurrency = max_concurrency
+        self.max_queue_seconds = max_queue_seconds
+        self.retries = retries
+        self.breaker = breaker or CircuitBreaker()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.counts = {'calls': 0, 'succeeded': 0, 'failed': 0, 'timeouts': 0, 'retries': 0,
+                       'not_retried': 0, 'rejected_open': 0, 'rejected_busy': 0}
+
+    def _count(self, name, delta=1):
+        with self._lock:
+            self.counts[name] += delta
+
+    def _acquire(self, deadline):
+        """Take a concurrency slot, or raise LLMUnavailable without calling out"""
+        self._count('calls')
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise LLMUnavailable("LLM circuit breaker is open")
+        wait = min(self.max_queue_seconds, deadline - time.monotonic())
+        if wait <= 0 or not self._slots.acquire(timeout=wait):
+            self.breaker.release_probe()
+            self._count('rejected_busy')
+            raise LLMUnavailable(f"All {self.max_concurrency} LLM slots are busy")
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _failed(self, error):
+        if isinstance(error, (httpx.TimeoutException, DeadlineExceeded)) or 'timeout' in type(error).__name__.lower():
+            self._count('timeouts')
+        self._count('failed')
+        self.breaker.record_failure()
+
+    def _give_up(self, error):
+        """Account for an error that ends the call; the caller re-raises it"""
+        if _transient_error(error):
+            self._failed(error)
+        else:
+            # The provider answered; leave the breaker as it was
+            self._count('not_retried')
+            self.breaker.release_probe()
+
+    def _retry(self, error, attempt, deadline):
+        """Whether to try again, while there is time left for a useful answer"""
+        return (attempt < self.retries and not isinstance(error, DeadlineExceeded) and _transient_error(error)
+                and deadline - time.monotonic() > self.deadline_seconds / 4)
+
+    def complete(self, **params):
+        """Text of one chat completion, or LLMUnavailable/the client's error"""
+        deadline = time.monotonic() + self.deadline_seconds
+        self._acquire(deadline)
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    error = DeadlineExceeded(f"LLM call exceeded {self.deadline_seconds}s")
+                    self._failed(error)
+                    raise error
+                try:
+                    response = self.client.chat.completions.create(timeout=httpx.Timeout(remaining), **params)
+                except Exception as e:
+                    if self._retry(e, attempt, deadline):
+                        attempt += 1
+                        self._count('retries')
+                        logger.warning(f"Retrying LLM call after error: {e}")
+                        continue
+                    self._give_up(e)
+                    raise
+                self._count('succeeded')
+                self.breaker.record_success()
+                return response.choices[0].message.content
+        finally:
+            self._release()
+
+    def stream(self, **params):
+        """Yield the text deltas of a streamed chat completion
+
+        The deadline covers the whole stream; a stream that is still running
+        when it passes is closed and DeadlineExceeded is raised. Each read
+        waits at most the deadline left when the request was sent. A failed
+        call is retried only if nothing has been yielded yet.
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        self._acquire(deadline)
+        try:
+            attempt = 0
+            yielded = False
+            while True:
+                stream = None
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise DeadlineExceeded(f"LLM call exceeded {self.deadline_seconds}s")
+                    # Connect and every read are bounded by the deadline left now,
+                    # so a stalled chunk fails instead of waiting on the pool's 30s
+                    stream = self.client.chat.completions.create(timeout=httpx.Timeout(remaining), stream=True,
+                                                                 **params)
+                    for chunk in stream:
+                        if time.monotonic() > deadline:
+                            raise DeadlineExceeded(f"LLM stream exceeded {self.deadline_seconds}s")
+                        delta = chunk.choices[0].delta.content if chunk.choices else None
+                        if delta:
+                            yielded = True
+                            yield delta
+                except GeneratorExit:
+                    # The consumer went away; not the provider's fault
+                    self.breaker.release_probe()
+                    raise
+                except Exception as e:
+                    if not yielded and self._retry(e, attempt, deadline):
+                        attempt += 1
+                        self._count('retries')
+                        logger.warning(f"Retrying LLM stream after error: {e}")
+                        continue
+                    self._give_up(e)
+                    raise
+                finally:
+                    if stream is not None and hasattr(stream, 'close'):
+                        stream.close()
+                self._count('succeeded')
+                self.breaker.record_success()
+                return
+        finally:
+            self._release()
+
+    def stats(self):
+        """Breaker state, timeout and rejection counts, and current load"""
+        with self._lock:
+            counts = dict(self.counts)
+            in_flight = self.in_flight
+        return {
+            'breaker': self.breaker.snapshot(),
+            **counts,
+            'in_flight': in_flight,
+            'max_concurrency': self.max_concurrency,
+            'deadline_seconds': self.deadline_seconds
+        }
@@ -0,0 +1,81 @@
+"""
+Selection of the LLM that writes the password suggestions.
+
+LLM_PROVIDER picks one of:
+
+    groq      Groq's API (GROQ_API_KEY)
+    openai    any OpenAI-compatible chat-completions endpoint (LLM_BASE_URL, LLM_API_KEY)
+    stub      the bundled llm_stub_server.py at LLM_STUB_URL, for offline load tests
+    fallback  no LLM; every request gets the rule-based suggestions
+
+API keys are only read from the environment. A groq or openai provider
+without one is served by fallback. LLM_MODEL overrides the provider's
+default model. Every provider except fallback is a client with the
+OpenAI-style chat.completions.create interface that
+llm_client.ResilientLLMClient wraps.
+"""
+import logging
+import os
+
+from llm_client import pooled_http_client
+
+logger = logging.getLogger(__name__)
+
+LLM_PROVIDERS = ('groq', 'openai', 'stub', 'fallback')
+
+DEFAULT_OPENAI_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_STUB_URL = "http://127.0.0.1:8001/v1"
+
+DEFAULT_MODELS = {
+    'groq': "llama3-70b-8192",
+    'openai': "gpt-4o-mini",
+    'stub': "stub"
+}
+
+
+def _api_key(provider):
+    if provider == 'groq':
+        return os.environ.get('GROQ_API_KEY')
+    if provider == 'openai':
+        return os.environ.get('LLM_API_KEY', os.environ.get('OPENAI_API_KEY'))
+    return 'stub'
+
+
+def provider_name():
+    """The configured provider: groq if LLM_PROVIDER is unknown, fallback if it has no API key"""
+    provider = os.environ.get('LLM_PROVIDER', 'groq').lower()
+    if provider not in LLM_PROVIDERS:
+        logger.warning(f"Unknown LLM_PROVIDER {provider!r}, using groq")
+        provider = 'groq'
+    if provider != 'fallback' and not _api_key(provider):
+        logger.warning(f"No API key set for LLM provider {provider}, using the rule-based fallback")
+        provider = 'fallback'
+    return provider
+
+
+def model_name(provider):
+    return os.environ.get('LLM_MODEL', DEFAULT_MODELS.get(provider))
+
+
+def build_client(provider, max_connections=8):
+    """Chat-completions client for a provider, or None for fallback
+
+    SDK retries are off because llm_client retries within each call's
+    deadline. Every provider gets a pooled_http_client() limited to
+    max_connections, the same as llm_client's concurrency limit.
+    """
+    if provider not in ('groq', 'openai', 'stub'):
+        return None
+    http_client = pooled_http_client(max_connections=max_connections)
+
+    if provider == 'groq':
+        from groq import Groq
+        return Groq(api_key=_api_key(provider), max_retries=0, http_client=http_client)
+
+    # Only needed for the openai and stub providers
+    from openai import OpenAI
+    if provider == 'stub':
+        base_url = os.environ.get('LLM_STUB_URL', DEFAULT_STUB_URL)
+    else:
+        base_url = os.environ.get('LLM_BASE_URL', DEFAULT_OPENAI_BASE_URL)
+    return OpenAI(api_key=_api_key(provider), base_url=base_url, max_retries=0, http_client=http_client)
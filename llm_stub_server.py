@@ -0,0 +1,207 @@
+"""
+Local stand-in for an OpenAI-compatible chat-completions API, for load tests.
+
+Answers POST /v1/chat/completions with a canned suggestion JSON after a
+configurable latency and jitter, fails a configurable share of requests,
+and streams the answer in chunks when asked to. Nothing leaves the machine,
+so the app can be load tested offline with:
+
+    python llm_stub_server.py --port 8001 --latency 0.8 --jitter 0.3 --error-rate 0.02
+    LLM_PROVIDER=stub LLM_STUB_URL=http://127.0.0.1:8001/v1 python main.py
+
+GET /stats reports how many requests were served, streamed and failed.
+"""
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+_PROMPT_PASSWORD = re.compile(r'Analyze this password: (.*)')
+
+
+class StubConfig:
+    """Behaviour of the stub; shared by every request"""
+
+    def __init__(self, latency=0.5, jitter=0.0, error_rate=0.0, error_status=503,
+                 chunk_size=16, chunk_delay=0.02, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'streamed': 0, 'errors': 0}
+
+    def draw(self):
+        """(delay before answering, whether to fail) for one request"""
+        with self._lock:
+            self.counts['requests'] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self._rng.random() < self.error_rate
+            if failed:
+                self.counts['errors'] += 1
+            suffix = self._rng.randint(10, 99)
+        return delay, failed, suffix
+
+    def count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+
+def canned_suggestions(messages, suffix):
+    """The suggestion JSON a real model would return, built from the prompt's password"""
+    prompt = next((m.get('content', '') for m in messages if m.get('role') == 'user'), '')
+    match = _PROMPT_PASSWORD.search(prompt)
+    password = match.group(1).strip() if match else 'password'
+    return json.dumps({
+        'improved_password': f"{password[:1].upper()}{password[1:]}#{suffix}-Vault",
+        'reasoning': "Adding length, an uppercase letter, a symbol and an unrelated word "
+                     "moves the password out of reach of dictionary and mask attacks.",
+        'vulnerability_details': [
+            "Short or common passwords are among the first guesses in dictionary attacks",
+            "Predictable character classes shrink the search space for brute force"
+        ]
+    })
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.config.stats())
+        else:
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'Invalid JSON', 'type': 'invalid_request_error'}})
+            return
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+            return
+
+        delay, failed, suffix = self.config.draw()
+        time.sleep(delay)
+        if failed:
+            self._send_json(self.config.error_status,
+                            {'error': {'message': 'Stub server injected error', 'type': 'server_error'}})
+            return
+
+        content = canned_suggestions(request.get('messages', []), suffix)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = request.get('model', 'stub')
+        if request.get('stream'):
+            self.config.count('streamed')
+            self._stream(completion_id, model, content)
+            return
+
+        self._send_json(200, {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content},
+                         'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0}
+        })
+
+    def _stream(self, completion_id, model, content):
+        """Send the content as Server-Sent Events chunks, then [DONE]"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        # No length is known up front, so the end of the stream ends the connection
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        size = max(1, self.config.chunk_size)
+        for i in range(0, len(content), size):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': content[i:i + size]}, 'finish_reason': None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            if self.config.chunk_delay > 0:
+                time.sleep(self.config.chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+def make_server(config, host='127.0.0.1', port=8001):
+    """A threaded stub server; port 0 picks a free one (see server.server_port)"""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'config': config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(config, host='127.0.0.1', port=0):
+    """Serve in a background thread; returns the server and its /v1 base URL"""
+    server = make_server(config, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub LLM for load tests")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.5, help="seconds before the first byte")
+    parser.add_argument('--jitter', type=float, default=0.0, help="latency varies uniformly by +/- this much")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=503, help="HTTP status of injected errors")
+    parser.add_argument('--chunk-size', type=int, default=16, help="characters per streamed chunk")
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument('--seed', type=int, help="seed for reproducible latency and errors")
+    args = parser.parse_args(argv)
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.error_status,
+                        args.chunk_size, args.chunk_delay, args.seed)
+    server = make_server(config, args.host, args.port)
+    logger.info(f"Stub LLM listening on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Served {config.stats()}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
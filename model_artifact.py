@@ -0,0 +1,165 @@
+"""
+Pickle-free, memory-mappable artifact for the password strength model.
+
+An artifact is a directory holding a small JSON header (model.json) and
+one .npy file per model array: ForestArrays for the random forest, or
+LinearArrays for the distilled student model. Loading memory-maps the arrays
+read-only, so load time hardly depends on model size and pre-forked
+workers share the same physical pages instead of each unpickling a copy.
+
+    data/password_model/
+        model.json          format, version, model type, classes, featurizer settings
+        threshold.npy ...   one file per entry in the model's ARRAY_NAMES
+        vocabulary.json     only for models converted from a vocabulary vectorizer
+"""
+import json
+import logging
+import os
+import shutil
+
+import numpy as np
+
+from forest_inference import ForestArrays
+from hashed_featurizer import HashedNgramFeaturizer
+from linear_inference import LinearArrays
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = 'password-strength-forest'
+FORMAT_VERSION = 1
+HEADER_FILE = 'model.json'
+VOCABULARY_FILE = 'vocabulary.json'
+
+# Header 'model' value for each model class; headers without one are forests
+MODEL_TYPES = {'forest': ForestArrays, 'linear': LinearArrays}
+
+
+def featurizer_config(featurizer):
+    """JSON description of a featurizer, plus its vocabulary if it has one"""
+    if isinstance(featurizer, HashedNgramFeaturizer):
+        return {
+            'type': 'hashed_ngram',
+            'n_features': featurizer.n_features,
+            'ngram_range': list(featurizer.ngram_range),
+            'lowercase': featurizer.lowercase
+        }, None
+
+    # A fitted CountVectorizer from models trained before hashing
+    if getattr(featurizer, 'analyzer', None) != 'char' or not hasattr(featurizer, 'vocabulary_'):
+        raise ValueError(f"Cannot store featurizer {type(featurizer).__name__}")
+    return {
+        'type': 'char_vocabulary',
+        'ngram_range': list(featurizer.ngram_range),
+        'lowercase': featurizer.lowercase
+    }, {term: int(index) for term, index in featurizer.vocabulary_.items()}
+
+
+def build_featurizer(config, vocabulary=None):
+    if config['type'] == 'hashed_ngram':
+        return HashedNgramFeaturizer(
+            n_features=config['n_features'],
+            ngram_range=tuple(config['ngram_range']),
+            lowercase=config['lowercase']
+        )
+    if config['type'] == 'char_vocabulary':
+        from sklearn.feature_extraction.text import CountVectorizer
+        return CountVectorizer(
+            analyzer='char',
+            ngram_range=tuple(config['ngram_range']),
+            lowercase=config['lowercase'],
+            vocabulary=vocabulary
+        )
+    raise ValueError(f"Unknown featurizer type {config['type']!r}")
+
+
+def model_type(model):
+    for name, cls in MODEL_TYPES.items():
+        if isinstance(model, cls):
+            return name
+    raise ValueError(f"Cannot store model {type(model).__name__}")
+
+
+def describe(header):
+    """Short human-readable summary of an artifact header, for logs"""
+    if header.get('model', 'forest') == 'forest':
+        return f"{header['n_trees']} trees, {header['n_nodes']} nodes"
+    return f"linear, {header['n_features']} features"
+
+
+def save_model(directory, model, featurizer, metadata=None):
+    """Write the artifact, replacing any existing one in a single rename"""
+    config, vocabulary = featurizer_config(featurizer)
+    header = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'model': model_type(model),
+        'classes': model.classes_.tolist(),
+        'n_features': int(model.n_features)
+    }
+    if isinstance(model, ForestArrays):
+        header['n_trees'] = len(model.roots)
+        header['n_nodes'] = len(model.threshold)
+    header.update({
+        'featurizer': config,
+        'arrays': {
+            name: {'dtype': str(array.dtype), 'shape': list(array.shape)}
+            for name, array in model.arrays().items()
+        },
+        'metadata': metadata or {}
+    })
+
+    directory = os.path.normpath(directory)
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, array in model.arrays().items():
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+    if vocabulary is not None:
+        with open(os.path.join(tmp_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(vocabulary, f, ensure_ascii=False)
+    # The header goes last; a directory without one is never loaded
+    with open(os.path.join(tmp_dir, HEADER_FILE), 'w', encoding='utf-8') as f:
+        json.dump(header, f, indent=2)
+
+    old_dir = f"{directory}.old-{os.getpid()}"
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return header
+
+
+def load_model(directory, mmap=True):
+    """Return (model, featurizer, header) from an artifact directory"""
+    with open(os.path.join(directory, HEADER_FILE), encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('format') != FORMAT_NAME:
+        raise ValueError(f"{directory} is not a {FORMAT_NAME} artifact")
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact version {header.get('version')}")
+    model_class = MODEL_TYPES.get(header.get('model', 'forest'))
+    if model_class is None:
+        raise ValueError(f"Unknown model type {header['model']!r}")
+
+    arrays = {}
+    for name in model_class.ARRAY_NAMES:
+        array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None,
+                        allow_pickle=False)
+        expected = header['arrays'][name]
+        if str(array.dtype) != expected['dtype'] or list(array.shape) != expected['shape']:
+            raise ValueError(f"Array {name} does not match the artifact header")
+        arrays[name] = array
+
+    model = model_class(
+        classes=np.array(header['classes']),
+        n_features=header['n_features'],
+        **arrays
+    )
+
+    vocabulary = None
+    if header['featurizer']['type'] == 'char_vocabulary':
+        with open(os.path.join(directory, VOCABULARY_FILE), encoding='utf-8') as f:
+            vocabulary = json.load(f)
+    featurizer = build_featurizer(header['featurizer'], vocabulary)
+
+    return model, featurizer, header
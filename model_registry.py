@@ -0,0 +1,183 @@
+"""
+Versioned strength models, swapped in without a restart.
+
+Each subdirectory of the registry directory (data/models by default) is
+one model version: a complete artifact as written by model_artifact.py,
+for example by `train_model.py --publish`. A background thread polls the
+directory; when a newer version appears it is loaded and warmed off the
+request path and only then handed to PasswordAnalyzer.swap_model, which
+replaces the served model in a single assignment. Requests already
+running finish on the model they started with, so none ever sees a
+partly loaded one.
+
+    data/models/
+        20261017-101500/    model.json, threshold.npy, ...
+        20261018-093000/
+
+Versions are ordered by name, so the timestamped names publish() uses
+order by age. A version that fails to load is skipped until it is
+activated explicitly.
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+
+import model_artifact
+from models import PasswordStrengthModel
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = os.environ.get('MODEL_REGISTRY_DIR', os.path.join('data', 'models'))
+
+
+def publish(artifact_dir, root=None, version=None):
+    """Copy an artifact into the registry as a new version; returns its name"""
+    root = root or REGISTRY_DIR
+    version = version or time.strftime('%Y%m%d-%H%M%S')
+    target = os.path.join(root, version)
+    if os.path.exists(target):
+        raise ValueError(f"Model version {version} already exists")
+
+    # Copied under a hidden name and renamed, so watchers never see half a copy
+    os.makedirs(root, exist_ok=True)
+    tmp_dir = os.path.join(root, f".{version}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    shutil.copytree(artifact_dir, tmp_dir)
+    os.replace(tmp_dir, target)
+    return version
+
+
+class ModelRegistry:
+    """Watches a directory of model versions and keeps the analyzer on the newest"""
+
+    def __init__(self, analyzer, root=None, poll_seconds=5.0):
+        self.analyzer = analyzer
+        self.root = root or REGISTRY_DIR
+        self.poll_seconds = poll_seconds
+
+        # None until a registry version is active; the analyzer then serves
+        # the model it was built with (data/password_model or the fallback)
+        self.active_version = None
+        self.activated_at = None
+        self.load_seconds = None
+        self.warm_seconds = None
+        self.description = None
+        self.swaps = 0
+        self.last_error = None
+        # Set by an explicit activate(); the watcher then stops advancing
+        self.pinned = None
+
+        self._failed = set()
+        self._load_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def versions(self):
+        """Names of the complete versions in the registry, oldest first"""
+        try:
+            entries = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            name for name in entries
+            if not name.startswith('.')
+            and os.path.exists(os.path.join(self.root, name, model_artifact.HEADER_FILE))
+        )
+
+    def check(self):
+        """Swap to the newest version if it is not already active; True if it swapped"""
+        if self.pinned is not None:
+            return False
+        candidates = [v for v in self.versions() if v not in self._failed]
+        if not candidates or candidates[-1] == self.active_version:
+            return False
+        return self._load_and_swap(candidates[-1], follow_newest=True)
+
+    def activate(self, version):
+        """Load a specific version now and keep serving it until unpinned; True once it serves"""
+        if version not in self.versions():
+            raise ValueError(f"Unknown model version {version!r}")
+        self._failed.discard(version)
+        # Pinned first, so a watcher tick cannot move past it while it loads
+        previous_pin, self.pinned = self.pinned, version
+        if self._load_and_swap(version):
+            return True
+        self.pinned = previous_pin
+        return False
+
+    def unpin(self):
+        """Follow the newest version again"""
+        self.pinned = None
+        return self.check()
+
+    def _load_and_swap(self, version, follow_newest=False):
+        # One load at a time; a watcher tick and an admin call could overlap
+        with self._load_lock:
+            if version == self.active_version:
+                return True
+            if follow_newest and self.pinned is not None:
+                return False
+            path = os.path.join(self.root, version)
+            try:
+                start = time.perf_counter()
+                model = PasswordStrengthModel.from_artifact(path)
+                loaded = time.perf_counter()
+                model.warm_up()
+                warmed = time.perf_counter()
+            except Exception as e:
+                logger.error(f"Error loading model version {version}: {e}")
+                self._failed.add(version)
+                self.last_error = {'version': version, 'error': str(e), 'at': time.time()}
+                return False
+
+            self.analyzer.swap_model(model)
+            self.active_version = version
+            self.activated_at = time.time()
+            self.load_seconds = loaded - start
+            self.warm_seconds = warmed - loaded
+            self.description = model_artifact.describe(model.header)
+            self.swaps += 1
+            logger.info(f"Serving model version {version} (loaded in {self.load_seconds * 1000:.1f} ms, "
+                        f"warmed in {self.warm_seconds * 1000:.1f} ms)")
+            return True
+
+    def start(self):
+        """Start watching in a daemon thread; the first check runs immediately"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='model-registry', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self):
+        while True:
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Error checking model registry: {e}")
+            if self._stop.wait(self.poll_seconds):
+                return
+
+    def status(self):
+        """Active version, its load timings and what else is available"""
+        return {
+            'active_version': self.active_version,
+            'description': self.description,
+            'activated_at': self.activated_at,
+            'load_ms': round(self.load_seconds * 1000, 2) if self.load_seconds is not None else None,
+            'warm_ms': round(self.warm_seconds * 1000, 2) if self.warm_seconds is not None else None,
+            'pinned': self.pinned,
+            'swaps': self.swaps,
+            'available_versions': self.versions(),
+            'failed_versions': sorted(self._failed),
+            'last_error': self.last_error,
+            'registry_dir': self.root,
+            'poll_seconds': self.poll_seconds
+        }
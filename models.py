@@ -1,42 +1,179 @@
 import os
 import pickle
+import threading
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import CountVectorizer
 import logging
+from password_profile import PasswordProfile
+from hashed_featurizer import HashedNgramFeaturizer
+from forest_inference import ForestArrays
+import model_artifact
 
 logger = logging.getLogger(__name__)
 
+# Which trained model to serve: the random forest, or the compact linear
+# student distilled from it by train_model.py
+STRENGTH_MODELS = ('forest', 'distilled')
+
+# Exercised by warm_up before a model starts serving
+WARMUP_PASSWORDS = ('password', 'Summer2024!', 'x7#Qm9!vLp2@Rz')
+
 class PasswordStrengthModel:
     """Machine learning model for predicting password strength"""
     
-    def __init__(self):
+    def __init__(self, kind=None):
         self.model = None
         self.vectorizer = None
+        self.forest = None
+        # Header of the loaded artifact, if the model came from one
+        self.header = None
+        # Set instead of forest when the distilled model is served
+        self.student = None
+        self.kind = kind or os.environ.get('STRENGTH_MODEL', 'forest')
+        if self.kind not in STRENGTH_MODELS:
+            logger.warning(f"Unknown STRENGTH_MODEL {self.kind!r}, using the forest")
+            self.kind = 'forest'
+        self.artifact_path = os.path.join('data', 'password_model')
+        self.distilled_path = os.path.join('data', 'password_model_distilled')
+        # Pickles written before the artifact format; converted on first load
         self.model_path = os.path.join('data', 'password_model.pkl')
         self.vectorizer_path = os.path.join('data', 'vectorizer.pkl')
-        self.load_model()
+        # Built once from the simple training set and reused by every process
+        self.fallback_path = os.path.join('data', 'fallback_model')
+        
+        # The model is loaded on first use, so constructing this is instant
+        self._loaded = False
+        self._load_lock = threading.Lock()
+    
+    @classmethod
+    def from_artifact(cls, path):
+        """A model serving exactly the artifact at path; raises instead of falling back"""
+        model = cls()
+        model._load_artifact(path)
+        model._loaded = True
+        return model
+    
+    def warm_up(self, passwords=WARMUP_PASSWORDS):
+        """Fault in every model page and run one prediction, so the first request pays neither"""
+        loaded = self.student if self.student is not None else self.forest
+        if loaded is not None:
+            for array in loaded.arrays().values():
+                np.asarray(array).sum()
+        return self.predict_strength_many(list(passwords))
+    
+    def ensure_loaded(self):
+        """Load the model if that has not happened yet; safe to call from any thread"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_model()
     
     def load_model(self):
         """Load the trained model if available, otherwise create a simple model"""
         try:
-            if os.path.exists(self.model_path) and os.path.exists(self.vectorizer_path):
-                with open(self.model_path, 'rb') as f:
-                    self.model = pickle.load(f)
-                with open(self.vectorizer_path, 'rb') as f:
-                    self.vectorizer = pickle.load(f)
-                logger.info("Loaded pre-trained password strength model")
+            if self.kind == 'distilled' and self._has_artifact(self.distilled_path):
+                self._load_artifact(self.distilled_path)
+            elif self._has_artifact(self.artifact_path):
+                self._load_artifact(self.artifact_path)
+            elif os.path.exists(self.model_path):
+                self._convert_legacy_model()
             else:
                 logger.warning("Pre-trained model not found, using a simple model")
-                self._create_simple_model()
+                self._load_fallback_model()
+            if self.kind == 'distilled' and self.student is None:
+                logger.warning("Distilled model not found, using the forest; run train_model.py to build it")
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             self._create_simple_model()
+        self._loaded = True
+    
+    def _has_artifact(self, path):
+        return os.path.exists(os.path.join(path, model_artifact.HEADER_FILE))
+    
+    def _load_artifact(self, path):
+        """Memory-map the model arrays; forked workers share their pages"""
+        loaded, vectorizer, header = model_artifact.load_model(path)
+        self.model = None
+        if isinstance(loaded, ForestArrays):
+            self.forest, self.student = loaded, None
+        else:
+            self.forest, self.student = None, loaded
+        self.vectorizer = vectorizer
+        self.header = header
+        logger.info(f"Loaded password strength model ({model_artifact.describe(header)})")
+    
+    def _convert_legacy_model(self):
+        """Load the pickled model and rewrite it as an artifact for next time"""
+        with open(self.model_path, 'rb') as f:
+            model = pickle.load(f)
+        self.model = model
+        self.vectorizer = self._load_featurizer()
+        self.forest = ForestArrays.from_sklearn(model)
+        
+        try:
+            model_artifact.save_model(self.artifact_path, self.forest, self.vectorizer,
+                                      {'converted_from': os.path.basename(self.model_path)})
+            logger.info(f"Converted {self.model_path} to {self.artifact_path}")
+            self._load_artifact(self.artifact_path)
+        except Exception as e:
+            # Keep serving the unpickled model if the data directory is read-only
+            logger.error(f"Error converting legacy model: {e}")
+    
+    def _load_featurizer(self):
+        """Featurizer matching the loaded model's input width"""
+        n_features = self.model.n_features_in_
+        if os.path.exists(self.vectorizer_path):
+            with open(self.vectorizer_path, 'rb') as f:
+                vectorizer = pickle.load(f)
+            # Only trust the vocabulary if it is the one this model was trained on
+            if len(vectorizer.vocabulary_) == n_features:
+                logger.warning("Using a legacy vocabulary vectorizer; retrain with train_model.py to drop it")
+                return vectorizer
+        return HashedNgramFeaturizer(n_features=n_features)
+    
+    def _export_forest(self):
+        """Flatten the forest into NumPy arrays, or None to keep using sklearn"""
+        try:
+            return ForestArrays.from_sklearn(self.model)
+        except Exception as e:
+            logger.warning(f"Model cannot be exported for fast inference, using sklearn: {e}")
+            return None
+    
+    def _predict_proba(self, X):
+        """Class probabilities for each row of X, identical to the model's predict_proba"""
+        if self.student is not None:
+            return self.student.predict_proba(X)
+        if self.forest is not None:
+            # Picks NumPy or compiled traversal by batch size (see forest_inference.py)
+            return self.forest.predict_proba(X)
+        return self.model.predict_proba(X)
+    
+    def _classes(self):
+        if self.student is not None:
+            return self.student.classes_
+        return self.forest.classes_ if self.forest is not None else self.model.classes_
+    
+    def _load_fallback_model(self):
+        """Use the cached fallback artifact, building and caching it the first time"""
+        if self._has_artifact(self.fallback_path):
+            self._load_artifact(self.fallback_path)
+            return
+        
+        self._create_simple_model()
+        try:
+            model_artifact.save_model(self.fallback_path, self.forest, self.vectorizer, {'fallback': True})
+            logger.info(f"Cached the fallback model in {self.fallback_path}")
+        except Exception as e:
+            logger.error(f"Error caching fallback model: {e}")
     
     def _create_simple_model(self):
         """Create a simple model for fallback"""
-        self.vectorizer = CountVectorizer(analyzer='char', ngram_range=(1, 3))
-        self.model = RandomForestClassifier()
+        # Imported here so processes serving a saved artifact never load sklearn
+        from sklearn.ensemble import RandomForestClassifier
+        
+        self.vectorizer = HashedNgramFeaturizer()
+        self.student = None
+        # Seeded so the fallback model, and its cached artifact, are reproducible
+        self.model = RandomForestClassifier(random_state=42)
         
         # Simple training data
         passwords = [
@@ -50,39 +187,62 @@ class PasswordStrengthModel:
         # Fit the vectorizer and model
         X = self.vectorizer.fit_transform(passwords)
         self.model.fit(X, strengths)
+        self.forest = self._export_forest()
     
     def predict_strength(self, password):
         """Predict the strength class of a password"""
         if not password:
             return 0
         
+        self.ensure_loaded()
+        
         # Feature extraction
         X = self.vectorizer.transform([password])
         
-        # Predict strength (0=weak, 1=medium, 2=strong)
-        strength_class = self.model.predict(X)[0]
-        
-        # Get prediction probabilities
-        probs = self.model.predict_proba(X)[0]
+        # One probability computation; the class is the argmax, exactly as
+        # the forest's own predict does it (0=weak, 1=medium, 2=strong)
+        probs = self._predict_proba(X)[0]
+        strength_class = self._classes()[np.argmax(probs)]
         
         return {
             'strength_class': int(strength_class),
             'probabilities': probs.tolist()
         }
     
-    def extract_features(self, password):
+    def predict_strength_many(self, passwords):
+        """Predict the strength classes of a batch of passwords in one model call"""
+        if not passwords:
+            return []
+        
+        self.ensure_loaded()
+        
+        # One sparse matrix and one probability computation for the whole batch;
+        # the class is the argmax, exactly as the forest's own predict does it
+        X = self.vectorizer.transform(passwords)
+        probs = self._predict_proba(X)
+        strength_classes = self._classes().take(np.argmax(probs, axis=1))
+        
+        return [
+            {'strength_class': int(strength_class), 'probabilities': row.tolist()}
+            for strength_class, row in zip(strength_classes, probs)
+        ]
+    
+    def extract_features(self, password, profile=None):
         """Extract features for a password to help determine why it's weak"""
+        if profile is None:
+            profile = PasswordProfile(password)
+        
         features = {}
         
         # Length-based features
-        features['length'] = len(password)
-        features['too_short'] = len(password) < 8
+        features['length'] = profile.length
+        features['too_short'] = profile.length < 8
         
         # Character class features
-        features['has_lowercase'] = any(c.islower() for c in password)
-        features['has_uppercase'] = any(c.isupper() for c in password)
-        features['has_digit'] = any(c.isdigit() for c in password)
-        features['has_special'] = any(not c.isalnum() for c in password)
+        features['has_lowercase'] = profile.has_lowercase
+        features['has_uppercase'] = profile.has_uppercase
+        features['has_digit'] = profile.has_digit
+        features['has_special'] = profile.has_special
         
         # Pattern features
         features['only_letters'] = password.isalpha()
@@ -96,8 +256,6 @@ class PasswordStrengthModel:
         features['is_uppercase'] = password.isupper()
         
         # Repeating characters
-        features['has_repeating_chars'] = any(
-            password[i] == password[i+1] for i in range(len(password)-1)
-        )
+        features['has_repeating_chars'] = profile.has_adjacent_repeat
         
         return features
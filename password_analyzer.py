@@ -1,13 +1,21 @@
 import math
 import hashlib
-import re
 import os
 import logging
+import numpy as np
 from models import PasswordStrengthModel
-from collections import Counter
+from breach_index import BreachIndex
+from analysis_cache import AnalysisCache
+from inference_scheduler import InferenceScheduler
+from password_profile import PasswordProfile
+from pattern_matcher import PATTERN_DESCRIPTIONS
+import crack_time
 
 logger = logging.getLogger(__name__)
 
+# Strength labels indexed by the model's strength class
+STRENGTH_LABELS = ['Weak', 'Medium', 'Strong']
+
 class PasswordAnalyzer:
     """Analyzes password strength and vulnerability"""
     
@@ -15,20 +23,18 @@ class PasswordAnalyzer:
         self.model = PasswordStrengthModel()
         self.common_passwords = self._load_common_passwords()
         
+        # Results cache keyed by an HMAC of the password; size 0 disables it
+        cache_size = int(os.environ.get('ANALYSIS_CACHE_SIZE', 10000))
+        cache_ttl = float(os.environ.get('ANALYSIS_CACHE_TTL', 300))
+        self.cache = AnalysisCache(cache_size, cache_ttl) if cache_size > 0 else None
+        
+        # Concurrent model calls are micro-batched; a batch size of 1 disables it
+        batch_size = int(os.environ.get('INFERENCE_BATCH_SIZE', 32))
+        batch_wait = float(os.environ.get('INFERENCE_BATCH_WAIT_MS', 1)) / 1000
+        self.inference = InferenceScheduler(self.model, batch_size, batch_wait) if batch_size > 1 else None
+        
         # Map known patterns to their descriptions
-        self.pattern_descriptions = {
-            r'^[a-z]+$': 'lowercase letters only',
-            r'^[A-Z]+$': 'uppercase letters only',
-            r'^[0-9]+$': 'digits only',
-            r'^[a-zA-Z]+$': 'letters only (no numbers or symbols)',
-            r'^[a-z]+[0-9]+$': 'lowercase letters followed by numbers',
-            r'^[A-Z][a-z]+[0-9]+$': 'capitalized word followed by numbers',
-            r'^[A-Z][a-z]+[0-9]{1,4}$': 'capitalized word followed by 1-4 numbers (common pattern)',
-            r'password': 'contains the word "password"',
-            r'123': 'contains the sequence "123"',
-            r'qwerty': 'contains the keyboard pattern "qwerty"',
-            r'abc': 'contains the alphabet sequence "abc"',
-        }
+        self.pattern_descriptions = PATTERN_DESCRIPTIONS
         
         # Define character sets for entropy calculation
         self.char_sets = {
@@ -39,7 +45,19 @@ class PasswordAnalyzer:
         }
     
     def _load_common_passwords(self):
-        """Load a set of common passwords from the RockYou dataset sample"""
+        """Load common passwords, preferring the memory-mapped breach index"""
+        # A prebuilt index (see breach_index.py) is mapped instead of parsed,
+        # so full-size breach lists cost neither startup time nor private memory
+        index_path = os.path.join('data', 'rockyou.idx')
+        if os.path.exists(index_path):
+            try:
+                index = BreachIndex(index_path)
+                logger.info(f"Loaded breached-password index with {len(index)} entries")
+                return index
+            except Exception as e:
+                logger.error(f"Error opening breached-password index: {e}")
+        
+        # Otherwise load a set of common passwords from the RockYou dataset sample
         common_passwords = set()
         try:
             file_path = os.path.join('data', 'rockyou_sample.txt')
@@ -70,50 +88,91 @@ class PasswordAnalyzer:
     def analyze(self, password):
         """Perform a comprehensive analysis of password strength"""
         if not password:
-            return {
-                'score': 0,
-                'strength': 'No password provided',
-                'entropy': 0,
-                'time_to_crack': '< 1 second',
-                'patterns': ['No password provided'],
-                'is_common': False,
-                'features': {}
-            }
+            return self._empty_result()
+        
+        if self.cache is None:
+            return self._analyze_uncached(password)
+        
+        # Repeat queries skip the model, pattern matching and entropy math
+        cached = self.cache.get_result(password)
+        if cached is not None:
+            return cached
+        
+        generation = self.cache.generation
+        results = self._analyze_uncached(password)
+        self.cache.put_result(password, results, generation)
+        return results
+    
+    def reload_model(self):
+        """Reload the strength model and drop results computed with the old one"""
+        model = PasswordStrengthModel()
+        model.ensure_loaded()
+        self.swap_model(model)
+    
+    def swap_model(self, model):
+        """Serve predictions from an already loaded model; returns the previous one
+        
+        The reference is replaced in one assignment, so a request (or batch)
+        uses either the old model or the new one throughout. Results cached
+        under the old model are dropped, and ones still being computed with
+        it are refused by the cache's generation check.
+        """
+        previous = self.model
+        self.model = model
+        if self.inference is not None:
+            self.inference.model = model
+        self._invalidate_cache()
+        return previous
+    
+    def reload_common_passwords(self):
+        """Reload the common-password store and drop results that used the old one"""
+        self.common_passwords = self._load_common_passwords()
+        self._invalidate_cache()
+    
+    def _invalidate_cache(self):
+        if self.cache is not None:
+            self.cache.clear()
+    
+    def _analyze_uncached(self, password):
+        """Analyze a non-empty password without consulting the cache"""
+        # Walk the password once; every stage below reads from this profile
+        profile = PasswordProfile(password)
         
         # Check if it's a common password
         is_common = password.lower() in self.common_passwords
         
         # Calculate entropy
-        entropy = self._calculate_entropy(password)
+        entropy = self._calculate_entropy(password, profile)
         
         # Estimate time to crack
-        time_to_crack = self._calculate_crack_time(entropy)
+        crack = self._calculate_crack_time(entropy)
         
         # Get ML model prediction
-        ml_results = self.model.predict_strength(password)
+        if self.inference is not None:
+            ml_results = self.inference.predict_strength(password)
+        else:
+            ml_results = self.model.predict_strength(password)
         strength_class = ml_results['strength_class']
         
         # Map strength class to label
-        strength_labels = ['Weak', 'Medium', 'Strong']
-        strength = strength_labels[strength_class]
+        strength = STRENGTH_LABELS[strength_class]
         
         # Calculate numeric score (0-100)
-        score = min(100, max(0, int(entropy * 3.3)))
-        if is_common:
-            score = min(score, 10)  # Cap score for common passwords
+        score = self._calculate_score(entropy, is_common)
         
         # Extract features and patterns
-        features = self.model.extract_features(password)
-        patterns = self._identify_patterns(password)
+        features = self.model.extract_features(password, profile)
+        patterns = profile.patterns
         
         # Calculate character distribution
-        char_distribution = self._analyze_character_distribution(password)
+        char_distribution = self._analyze_character_distribution(password, profile)
         
         return {
             'score': score,
             'strength': strength,
             'entropy': round(entropy, 2),
-            'time_to_crack': time_to_crack,
+            'time_to_crack': crack['display'],
+            'crack_time': crack,
             'patterns': patterns,
             'is_common': is_common,
             'features': features,
@@ -121,26 +180,162 @@ class PasswordAnalyzer:
             'length': len(password)
         }
     
-    def _calculate_entropy(self, password):
+    def analyze_live(self, password, previous=None):
+        """Compute the cheap metrics shown while the user is still typing
+        
+        Skips the model and the suggestions. When the password extends the
+        one behind `previous` (a profile returned by an earlier call), only
+        the added characters are scanned.
+        
+        Returns a (metrics, profile) tuple; pass the profile back next time.
+        """
+        if not password:
+            empty = self._empty_result()
+            keys = ('score', 'entropy', 'time_to_crack', 'crack_time', 'patterns', 'is_common')
+            return {key: empty[key] for key in keys}, None
+        
+        if previous is not None and password.startswith(previous.password):
+            profile = previous.extend(password[len(previous.password):])
+        else:
+            profile = PasswordProfile(password)
+        
+        is_common = password.lower() in self.common_passwords
+        entropy = self._calculate_entropy(password, profile)
+        crack = self._calculate_crack_time(entropy)
+        
+        return {
+            'score': self._calculate_score(entropy, is_common),
+            'entropy': round(entropy, 2),
+            'time_to_crack': crack['display'],
+            'crack_time': crack,
+            'patterns': profile.patterns,
+            'is_common': is_common,
+            'char_distribution': self._analyze_character_distribution(password, profile),
+            'length': profile.length
+        }, profile
+    
+    def analyze_many(self, passwords):
+        """Analyze a batch of passwords, returning the same dicts as analyze()
+        
+        Featurization and model inference run once over the whole batch, and
+        entropy, score and character distribution are computed over NumPy arrays.
+        """
+        results = [None] * len(passwords)
+        indices = []
+        for i, password in enumerate(passwords):
+            if password:
+                indices.append(i)
+            else:
+                results[i] = self._empty_result()
+        if not indices:
+            return results
+        
+        batch = [passwords[i] for i in indices]
+        profiles = [PasswordProfile(password) for password in batch]
+        ml_results = self.model.predict_strength_many(batch)
+        
+        lengths = np.array([profile.length for profile in profiles], dtype=np.int64)
+        class_counts = np.array([
+            (profile.lowercase_count, profile.uppercase_count, profile.digit_count, profile.special_count)
+            for profile in profiles
+        ], dtype=np.int64)
+        repeats = np.array([profile.repeats for profile in profiles], dtype=np.float64)
+        pattern_counts = np.array([len(profile.patterns) for profile in profiles], dtype=np.int64)
+        
+        # Pool size and its log come from a table over the four class flags,
+        # using the same math.log2 values as the scalar path
+        class_mask = (class_counts > 0) @ np.array([1, 2, 4, 8])
+        pool_sizes, log_pools = self._pool_size_table()
+        pool_size = pool_sizes[class_mask]
+        entropy = lengths * log_pools[class_mask] - repeats * 0.5 - pattern_counts * 4
+        entropy = np.where(pool_size == 0, 0.0, np.maximum(0.0, entropy))
+        
+        scores = np.clip((entropy * 3.3).astype(np.int64), 0, 100)
+        crack_times = crack_time.estimate_many(entropy)
+        percentages = np.round(class_counts / lengths[:, None] * 100).astype(np.int64)
+        
+        for j, (i, password, profile) in enumerate(zip(indices, batch, profiles)):
+            is_common = password.lower() in self.common_passwords
+            score = int(scores[j])
+            if is_common:
+                score = min(score, 10)  # Cap score for common passwords
+            
+            # The scalar path returns an integer 0 when there is no entropy
+            entropy_bits = float(entropy[j]) or 0
+            lowercase, uppercase, digits, special = percentages[j].tolist()
+            
+            results[i] = {
+                'score': score,
+                'strength': STRENGTH_LABELS[ml_results[j]['strength_class']],
+                'entropy': round(entropy_bits, 2),
+                'time_to_crack': crack_times[j]['display'],
+                'crack_time': crack_times[j],
+                'patterns': profile.patterns,
+                'is_common': is_common,
+                'features': self.model.extract_features(password, profile),
+                'char_distribution': {
+                    'lowercase': lowercase,
+                    'uppercase': uppercase,
+                    'digits': digits,
+                    'special': special
+                },
+                'length': profile.length
+            }
+        
+        return results
+    
+    def _empty_result(self):
+        """Result returned for an empty password"""
+        return {
+            'score': 0,
+            'strength': 'No password provided',
+            'entropy': 0,
+            'time_to_crack': '< 1 second',
+            'crack_time': crack_time.estimate(0),
+            'patterns': ['No password provided'],
+            'is_common': False,
+            'features': {}
+        }
+    
+    def _pool_size_table(self):
+        """Character pool size and its log2 for every combination of class flags"""
+        sizes = [
+            self.char_sets['lowercase'],
+            self.char_sets['uppercase'],
+            self.char_sets['digits'],
+            self.char_sets['symbols']
+        ]
+        pool_sizes = np.array([
+            sum(size for bit, size in enumerate(sizes) if mask & (1 << bit))
+            for mask in range(16)
+        ], dtype=np.int64)
+        log_pools = np.array([math.log2(size) if size else 0.0 for size in pool_sizes])
+        return pool_sizes, log_pools
+    
+    def _calculate_score(self, entropy, is_common):
+        """Calculate the numeric score (0-100) shown on the strength meter"""
+        score = min(100, max(0, int(entropy * 3.3)))
+        if is_common:
+            score = min(score, 10)  # Cap score for common passwords
+        return score
+    
+    def _calculate_entropy(self, password, profile=None):
         """Calculate the entropy (bits) of a password"""
         if not password:
             return 0
         
-        # Count character types
-        has_lowercase = any(c.islower() for c in password)
-        has_uppercase = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(not c.isalnum() for c in password)
+        if profile is None:
+            profile = PasswordProfile(password)
         
         # Calculate character pool size
         char_pool_size = 0
-        if has_lowercase:
+        if profile.has_lowercase:
             char_pool_size += self.char_sets['lowercase']
-        if has_uppercase:
+        if profile.has_uppercase:
             char_pool_size += self.char_sets['uppercase']
-        if has_digit:
+        if profile.has_digit:
             char_pool_size += self.char_sets['digits']
-        if has_special:
+        if profile.has_special:
             char_pool_size += self.char_sets['symbols']
         
         # Calculate base entropy
@@ -150,12 +345,10 @@ class PasswordAnalyzer:
         base_entropy = len(password) * math.log2(char_pool_size)
         
         # Penalty for repeating characters
-        char_counts = Counter(password)
-        repeats = sum(count - 1 for count in char_counts.values() if count > 1)
-        repeat_penalty = repeats * 0.5
+        repeat_penalty = profile.repeats * 0.5
         
         # Penalty for patterns
-        pattern_penalty = len(self._identify_patterns(password)) * 4
+        pattern_penalty = len(profile.patterns) * 4
         
         # Calculate final entropy
         final_entropy = max(0, base_entropy - repeat_penalty - pattern_penalty)
@@ -163,83 +356,30 @@ class PasswordAnalyzer:
         return final_entropy
     
     def _calculate_crack_time(self, entropy):
-        """Estimate the time it would take to crack a password with the given entropy"""
-        # Assuming 10 billion guesses per second (modern hardware)
-        guesses_per_second = 10_000_000_000
-        
-        # Calculate the total possible guesses needed (2^entropy)
-        total_guesses = 2 ** entropy
-        
-        # Calculate seconds to crack
-        seconds = total_guesses / guesses_per_second
-        
-        # Convert to human-readable format
-        if seconds < 1:
-            return "< 1 second"
-        elif seconds < 60:
-            return f"{int(seconds)} seconds"
-        elif seconds < 3600:
-            return f"{int(seconds / 60)} minutes"
-        elif seconds < 86400:
-            return f"{int(seconds / 3600)} hours"
-        elif seconds < 31536000:
-            return f"{int(seconds / 86400)} days"
-        elif seconds < 31536000 * 100:
-            return f"{int(seconds / 31536000)} years"
-        else:
-            return f"{int(seconds / 31536000)} years (effectively uncrackable)"
+        """Estimate the time it would take to crack a password with the given entropy
+        
+        Returns the structured estimate from crack_time.estimate, covering
+        every attacker profile; see that module for the assumed guess rates.
+        """
+        return crack_time.estimate(entropy)
     
-    def _identify_patterns(self, password):
+    def _identify_patterns(self, password, profile=None):
         """Identify common patterns in the password"""
-        patterns = []
-        
-        # Check for common patterns
-        for pattern, description in self.pattern_descriptions.items():
-            if re.search(pattern, password, re.IGNORECASE):
-                patterns.append(description)
-        
-        # Check for sequential characters
-        for i in range(len(password) - 2):
-            if (ord(password[i+1]) == ord(password[i]) + 1 and 
-                ord(password[i+2]) == ord(password[i]) + 2):
-                patterns.append("sequential characters")
-                break
-        
-        # Check for repeating characters
-        for i in range(len(password) - 2):
-            if password[i] == password[i+1] == password[i+2]:
-                patterns.append("repeating characters")
-                break
-        
-        # Check for keyboard patterns (horizontal)
-        keyboard_rows = [
-            "qwertyuiop",
-            "asdfghjkl",
-            "zxcvbnm"
-        ]
-        
-        for row in keyboard_rows:
-            for i in range(len(row) - 2):
-                if row[i:i+3].lower() in password.lower():
-                    patterns.append("keyboard pattern")
-                    break
-            if "keyboard pattern" in patterns:
-                break
-        
-        # If no patterns found
-        if not patterns and len(password) >= 12:
-            patterns.append("no common patterns detected")
-        
-        return patterns
+        if profile is None:
+            profile = PasswordProfile(password)
+        return list(profile.patterns)
     
-    def _analyze_character_distribution(self, password):
+    def _analyze_character_distribution(self, password, profile=None):
         """Analyze the distribution of characters in the password"""
-        lowercase_count = sum(1 for c in password if c.islower())
-        uppercase_count = sum(1 for c in password if c.isupper())
-        digit_count = sum(1 for c in password if c.isdigit())
-        special_count = sum(1 for c in password if not c.isalnum())
+        if profile is None:
+            profile = PasswordProfile(password)
+        
+        lowercase_count = profile.lowercase_count
+        uppercase_count = profile.uppercase_count
+        digit_count = profile.digit_count
+        special_count = profile.special_count
         
-        total_len = len(password)
+        total_len = profile.length
         if total_len == 0:
             return {
                 'lowercase': 0,
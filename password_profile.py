@@ -0,0 +1,159 @@
+from pattern_matcher import DEFAULT_MATCHER, KEYBOARD_PATTERN
+
+
+class PasswordProfile:
+    """Single-pass summary of a password shared by every analysis stage"""
+
+    __slots__ = (
+        'password', 'length', 'lowercase_count', 'uppercase_count',
+        'digit_count', 'special_count', 'repeats', 'has_adjacent_repeat',
+        'has_triple_repeat', 'has_sequence', 'has_keyboard_pattern',
+        'pattern_hits', 'patterns',
+        # Scan state kept so a longer password can resume from this one
+        '_matcher', '_seen', '_prev', '_prev2', '_prev_code', '_prev2_code', '_state'
+    )
+
+    def __init__(self, password, matcher=None):
+        self._matcher = matcher if matcher is not None else DEFAULT_MATCHER
+        self.password = ''
+        self.lowercase_count = self.uppercase_count = 0
+        self.digit_count = self.special_count = self.repeats = 0
+        self.has_adjacent_repeat = self.has_triple_repeat = self.has_sequence = False
+        self.pattern_hits = 0
+        self._seen = set()
+        self._prev = self._prev2 = None
+        self._prev_code = self._prev2_code = -10
+        self._state = 0
+        self._scan(password)
+
+    def extend(self, suffix):
+        """Profile of password + suffix, resuming from this profile's scan state
+
+        Used for live typing, where each request usually appends a few
+        characters to the previous one. Non-ASCII input is rescanned from the
+        start because its keyboard check depends on the whole lowercased text.
+        """
+        password = self.password + suffix
+        if not password.isascii():
+            return PasswordProfile(password, self._matcher)
+
+        profile = PasswordProfile.__new__(PasswordProfile)
+        for name in PasswordProfile.__slots__:
+            setattr(profile, name, getattr(self, name))
+        profile._seen = set(self._seen)
+        profile._scan(suffix)
+        return profile
+
+    def _scan(self, chars):
+        """Fold chars into the profile in a single pass"""
+        matcher = self._matcher
+        lowercase = self.lowercase_count
+        uppercase = self.uppercase_count
+        digits = self.digit_count
+        special = self.special_count
+        repeats = self.repeats
+        hits = self.pattern_hits
+        adjacent = self.has_adjacent_repeat
+        triple = self.has_triple_repeat
+        sequence = self.has_sequence
+        seen = self._seen
+
+        # The automaton reads the case-folded password, which always has the
+        # same length as the original, alongside the raw characters
+        folded = matcher.fold(chars)
+        transitions = matcher.transitions
+        outputs = matcher.outputs
+        state = self._state
+
+        prev, prev2 = self._prev, self._prev2
+        prev_code, prev2_code = self._prev_code, self._prev2_code
+        for c, f in zip(chars, folded):
+            if c.islower():
+                lowercase += 1
+            elif c.isupper():
+                uppercase += 1
+            elif c.isdigit():
+                digits += 1
+            if not c.isalnum():
+                special += 1
+
+            if c in seen:
+                repeats += 1
+            else:
+                seen.add(c)
+
+            code = ord(c)
+            if c == prev:
+                adjacent = True
+                if c == prev2:
+                    triple = True
+            if code == prev_code + 1 and code == prev2_code + 2:
+                sequence = True
+
+            state = transitions[state].get(f, 0)
+            hits |= outputs[state]
+
+            prev2, prev = prev, c
+            prev2_code, prev_code = prev_code, code
+
+        password = self.password + chars
+        self.password = password
+        self.length = len(password)
+        self.lowercase_count = lowercase
+        self.uppercase_count = uppercase
+        self.digit_count = digits
+        self.special_count = special
+        self.repeats = repeats
+        self.has_adjacent_repeat = adjacent
+        self.has_triple_repeat = triple
+        self.has_sequence = sequence
+        self.pattern_hits = hits
+        self._prev, self._prev2 = prev, prev2
+        self._prev_code, self._prev2_code = prev_code, prev2_code
+        self._state = state
+
+        # Keyboard walks follow str.lower(), which only differs from the
+        # regex-style fold for a handful of non-ASCII letters
+        if not password.isascii() and matcher.fold(password) != password.lower():
+            hits = (hits & ~KEYBOARD_PATTERN) | matcher.keyboard_hits(password)
+
+        self.has_keyboard_pattern = bool(hits & KEYBOARD_PATTERN)
+        self.patterns = self._identify_patterns(matcher, hits)
+
+    @property
+    def has_lowercase(self):
+        return self.lowercase_count > 0
+
+    @property
+    def has_uppercase(self):
+        return self.uppercase_count > 0
+
+    @property
+    def has_digit(self):
+        return self.digit_count > 0
+
+    @property
+    def has_special(self):
+        return self.special_count > 0
+
+    def _identify_patterns(self, matcher, hits):
+        """Identify common patterns in the password"""
+        # Anchored patterns only accept letters and digits, with at most a
+        # trailing newline that "$" is allowed to skip
+        could_be_anchored = self.special_count == 0 or (
+            self.special_count == 1 and self.password.endswith('\n')
+        )
+        patterns = matcher.describe(self.password, hits, could_be_anchored)
+
+        if self.has_sequence:
+            patterns.append("sequential characters")
+        if self.has_triple_repeat:
+            patterns.append("repeating characters")
+        if self.has_keyboard_pattern:
+            patterns.append("keyboard pattern")
+
+        # If no patterns found
+        if not patterns and self.length >= 12:
+            patterns.append("no common patterns detected")
+
+        return patterns
@@ -0,0 +1,145 @@
+import re
+from collections import deque
+
+# Map known patterns to their descriptions
+PATTERN_DESCRIPTIONS = {
+    r'^[a-z]+$': 'lowercase letters only',
+    r'^[A-Z]+$': 'uppercase letters only',
+    r'^[0-9]+$': 'digits only',
+    r'^[a-zA-Z]+$': 'letters only (no numbers or symbols)',
+    r'^[a-z]+[0-9]+$': 'lowercase letters followed by numbers',
+    r'^[A-Z][a-z]+[0-9]+$': 'capitalized word followed by numbers',
+    r'^[A-Z][a-z]+[0-9]{1,4}$': 'capitalized word followed by 1-4 numbers (common pattern)',
+    r'password': 'contains the word "password"',
+    r'123': 'contains the sequence "123"',
+    r'qwerty': 'contains the keyboard pattern "qwerty"',
+    r'abc': 'contains the alphabet sequence "abc"',
+}
+
+# Horizontal keyboard rows used to detect keyboard walks
+KEYBOARD_ROWS = [
+    "qwertyuiop",
+    "asdfghjkl",
+    "zxcvbnm"
+]
+
+# Bit reported by the automaton when any keyboard-row trigram is seen
+KEYBOARD_PATTERN = 1
+
+# Characters that re.IGNORECASE equates with an ASCII letter but str.lower()
+# does not map onto one (U+0130 also lowercases to two characters)
+_IGNORECASE_FOLD = str.maketrans({'ſ': 's', 'ı': 'i', 'İ': 'i'})
+
+
+class PatternMatcher:
+    """Reports every known password pattern from a single linear scan
+
+    Literal patterns and keyboard-row trigrams are compiled into one
+    Aho-Corasick automaton; anchored patterns are compiled once and only
+    run when the password could possibly match them.
+    """
+
+    def __init__(self, pattern_descriptions=None, keyboard_rows=None):
+        if pattern_descriptions is None:
+            pattern_descriptions = PATTERN_DESCRIPTIONS
+        if keyboard_rows is None:
+            keyboard_rows = KEYBOARD_ROWS
+
+        # Each check is (automaton bit, compiled regex, description), kept in
+        # table order so the reported descriptions match the original order
+        self.checks = []
+        keywords = []
+        next_bit = KEYBOARD_PATTERN << 1
+        for pattern, description in pattern_descriptions.items():
+            if re.escape(pattern) == pattern and pattern.isascii():
+                keywords.append((pattern.lower(), next_bit))
+                self.checks.append((next_bit, None, description))
+                next_bit <<= 1
+            else:
+                self.checks.append((0, re.compile(pattern, re.IGNORECASE), description))
+
+        for row in keyboard_rows:
+            row = row.lower()
+            for i in range(len(row) - 2):
+                keywords.append((row[i:i + 3], KEYBOARD_PATTERN))
+
+        self.transitions, self.outputs = self._build_automaton(keywords)
+
+    @staticmethod
+    def _build_automaton(keywords):
+        """Build a deterministic Aho-Corasick automaton over the keywords"""
+        goto = [{}]
+        outputs = [0]
+        for keyword, bit in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append(0)
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state] |= bit
+
+        # Breadth-first pass resolving failure links into full transitions,
+        # so scanning costs exactly one dict lookup per character
+        alphabet = {ch for keyword, _ in keywords for ch in keyword}
+        fail = [0] * len(goto)
+        transitions = [dict() for _ in goto]
+        transitions[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            for ch in alphabet:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    target = transitions[fail[state]].get(ch, 0)
+                    if target:
+                        transitions[state][ch] = target
+                else:
+                    fail[nxt] = transitions[fail[state]].get(ch, 0)
+                    transitions[state][ch] = nxt
+                    queue.append(nxt)
+
+        return transitions, outputs
+
+    def fold(self, password):
+        """Case-fold the password the way re.IGNORECASE compares ASCII letters"""
+        if password.isascii():
+            return password.lower()
+        return password.translate(_IGNORECASE_FOLD).lower()
+
+    def scan(self, text, state=0):
+        """Run already-folded text through the automaton
+
+        Returns the bitmask of matched keywords and the final state, so a
+        longer text sharing this prefix can resume from it.
+        """
+        transitions = self.transitions
+        outputs = self.outputs
+        hits = 0
+        for ch in text:
+            state = transitions[state].get(ch, 0)
+            hits |= outputs[state]
+        return hits, state
+
+    def keyboard_hits(self, password):
+        """Keyboard trigram bit for passwords whose fold differs from lower()"""
+        return self.scan(password.lower())[0] & KEYBOARD_PATTERN
+
+    def describe(self, password, hits, could_be_anchored=True):
+        """Translate automaton hits plus anchored regexes into descriptions"""
+        patterns = []
+        for bit, regex, description in self.checks:
+            if bit:
+                if hits & bit:
+                    patterns.append(description)
+            elif could_be_anchored or not regex.pattern.startswith('^'):
+                if regex.search(password):
+                    patterns.append(description)
+        return patterns
+
+
+DEFAULT_MATCHER = PatternMatcher()
@@ -0,0 +1,121 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+While a call for a key is running, further calls for the same key do not
+start their own; they wait for the running one and all receive its result
+(or its exception). Once it finishes the key is forgotten, so results are
+never reused after the fact, which is what caching is for.
+
+Thread and asyncio callers share the same flights: a flight is a
+concurrent.futures.Future, which threads block on and coroutines await
+through asyncio.wrap_future. A flight started with a timeout carries its
+deadline, and callers joining it wait only for what is left of it before
+raising DeadlineExceeded.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+from llm_client import DeadlineExceeded
+
+
+class _Flight(Future):
+    """A future that is due by a monotonic deadline (None: no limit)"""
+
+    def __init__(self, timeout=None):
+        super().__init__()
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+    def remaining(self):
+        return None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+
+class SingleFlight:
+    """In-flight calls keyed by what they compute"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def join(self, key, timeout=None):
+        """(future, is_leader) for key; the leader must call finish() exactly once
+
+        timeout is how long the leader's call may take; it is ignored when
+        joining a flight that is already running.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = _Flight(timeout)
+            self._flights[key] = future
+            self.leaders += 1
+            return future, True
+
+    def finish(self, key, future, result=None, error=None):
+        """Release a flight, handing its waiters the result or the error"""
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _run(self, key, future, fn):
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, future, error=e)
+            raise
+        self.finish(key, future, result)
+        return result
+
+    def wait(self, future):
+        """Outcome of a joined flight, or DeadlineExceeded once its deadline passes"""
+        try:
+            return future.result(future.remaining())
+        except TimeoutError:
+            if future.done():
+                raise
+            raise DeadlineExceeded("Identical call did not finish within its deadline")
+
+    async def wait_async(self, future):
+        """wait() for coroutines"""
+        try:
+            # Shielded: a waiter giving up must not cancel the flight for the others
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), future.remaining())
+        except TimeoutError:
+            if future.done():
+                raise
+            raise DeadlineExceeded("Identical call did not finish within its deadline")
+
+    def do(self, key, fn, timeout=None):
+        """fn() for the first caller of key; later concurrent callers share its outcome
+
+        Callers that join wait at most until `timeout` seconds after the
+        first one started.
+        """
+        future, leader = self.join(key, timeout)
+        if leader:
+            return self._run(key, future, fn)
+        return self.wait(future)
+
+    async def do_async(self, key, fn, timeout=None):
+        """do() for coroutines: a leading call runs the blocking fn in the default executor"""
+        future, leader = self.join(key, timeout)
+        if leader:
+            return await asyncio.get_running_loop().run_in_executor(None, self._run, key, future, fn)
+        return await self.wait_async(future)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._flights),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced
+            }
@@ -31,6 +31,18 @@ document.addEventListener('DOMContentLoaded', function() {
     let chart = null;
     let currentLanguage = window.currentLanguage || 'en';
     
+    // Live typing: cheap metrics after a short pause between keystrokes,
+    // full analysis with AI suggestions once the user stops typing
+    const LIVE_DEBOUNCE_MS = 80;
+    const IDLE_ANALYZE_MS = 1200;
+    let liveSeq = 0;
+    let lastRenderedSeq = 0;
+    let liveTimer = null;
+    let idleTimer = null;
+    
+    // AI suggestions arrive over Server-Sent Events after the analysis
+    let suggestionStream = null;
+    
     // Set up language selector
     if (languageMenu) {
         // Add event listeners to language menu items
@@ -79,6 +91,19 @@ document.addEventListener('DOMContentLoaded', function() {
         analyzePassword(password);
     });
     
+    // Show live metrics while typing and analyze fully when typing stops
+    passwordInput.addEventListener('input', function() {
+        const password = passwordInput.value;
+        clearTimeout(liveTimer);
+        clearTimeout(idleTimer);
+        if (!password) {
+            return;
+        }
+        
+        liveTimer = setTimeout(() => analyzeLive(password), LIVE_DEBOUNCE_MS);
+        idleTimer = setTimeout(() => analyzePassword(passwordInput.value, false), IDLE_ANALYZE_MS);
+    });
+    
     // Analyze the password when pressing Enter in the input
     passwordInput.addEventListener('keypress', function(e) {
         if (e.key === 'Enter') {
@@ -160,10 +185,46 @@ document.addEventListener('DOMContentLoaded', function() {
         }, 400);
     }
     
+    // Fetch the cheap metrics for the password being typed
+    function analyzeLive(password) {
+        const seq = ++liveSeq;
+        
+        fetch('/analyze_live', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                password: password,
+                seq: seq,
+                language: currentLanguage
+            })
+        })
+        .then(response => response.ok ? response.json() : null)
+        .then(data => {
+            // The server may answer a burst with the result of a later keystroke;
+            // never render anything older than what is already shown
+            if (!data || data.tag === null || data.tag <= lastRenderedSeq) {
+                return;
+            }
+            lastRenderedSeq = data.tag;
+            updateLiveMetrics(data);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+        });
+    }
+    
     // Analyze the input password
-    function analyzePassword(password) {
+    function analyzePassword(password, scrollToResults = true) {
+        clearTimeout(idleTimer);
+        if (!password) {
+            return;
+        }
+        
         // Show loading state with animation
         showLoading();
+        closeSuggestionStream();
         
         // Make API request to analyze the password
         fetch('/analyze_password', {
@@ -184,7 +245,10 @@ document.addEventListener('DOMContentLoaded', function() {
         })
         .then(data => {
             hideLoading();
-            updateAnalysisResults(data);
+            updateAnalysisResults(data, scrollToResults);
+            if (data.suggestions_url) {
+                streamSuggestions(data.suggestions_url);
+            }
             
             // Celebrate if it's a strong password
             if (data.score >= 80) {
@@ -200,6 +264,48 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
+    // Render AI suggestions progressively as the server streams them
+    function streamSuggestions(url) {
+        const stream = new EventSource(url);
+        suggestionStream = stream;
+        let rendered = false;
+        
+        stream.addEventListener('partial', event => {
+            if (stream !== suggestionStream) {
+                return;
+            }
+            // Only the first render animates; later ones update in place
+            updateSuggestions(JSON.parse(event.data), !rendered);
+            rendered = true;
+        });
+        
+        stream.addEventListener('done', event => {
+            if (stream !== suggestionStream) {
+                return;
+            }
+            updateSuggestions(JSON.parse(event.data), !rendered);
+            closeSuggestionStream();
+        });
+        
+        // Handles are single-use, so never let EventSource reconnect
+        stream.onerror = () => {
+            if (stream !== suggestionStream) {
+                return;
+            }
+            closeSuggestionStream();
+            if (!rendered) {
+                suggestions.innerHTML = '<div class="alert alert-info">No specific suggestions available.</div>';
+            }
+        };
+    }
+    
+    function closeSuggestionStream() {
+        if (suggestionStream) {
+            suggestionStream.close();
+            suggestionStream = null;
+        }
+    }
+    
     // Generate a strong password based on user preferences
     function generateStrongPassword() {
         // Show loading state
@@ -270,74 +376,48 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // Update the UI with analysis results
-    function updateAnalysisResults(data) {
-        // Update strength meter with animation
-        strengthMeter.style.transition = 'width 1s cubic-bezier(0.19, 1, 0.22, 1)';
-        setTimeout(() => {
-            strengthMeter.style.width = data.score + '%';
-            strengthMeter.setAttribute('aria-valuenow', data.score);
-        }, 100);
+    // Update only the metrics returned by the live-typing endpoint
+    function updateLiveMetrics(data) {
+        updateStrengthMeter(data);
+        entropyValue.textContent = data.entropy;
+        lengthValue.textContent = data.length;
+        updateTimeToCrack(data.crack_time);
         
-        // Set the appropriate color based on score
-        if (data.score < 20) {
-            strengthMeter.className = 'progress-bar bg-danger';
-            strengthLabel.textContent = 'Very Weak';
-            strengthLabel.className = 'badge bg-danger';
-        } else if (data.score < 40) {
-            strengthMeter.className = 'progress-bar bg-danger';
-            strengthLabel.textContent = 'Weak';
-            strengthLabel.className = 'badge bg-danger';
-        } else if (data.score < 60) {
-            strengthMeter.className = 'progress-bar bg-warning';
-            strengthLabel.textContent = 'Moderate';
-            strengthLabel.className = 'badge bg-warning';
-        } else if (data.score < 80) {
-            strengthMeter.className = 'progress-bar bg-success';
-            strengthLabel.textContent = 'Strong';
-            strengthLabel.className = 'badge bg-success';
+        patternsFound.innerHTML = '';
+        const patterns = data.patterns && data.patterns.length > 0 ? data.patterns : null;
+        if (patterns) {
+            patterns.forEach(pattern => {
+                const listItem = document.createElement('li');
+                listItem.className = 'list-group-item';
+                listItem.innerHTML = `<i class="fas fa-exclamation-triangle me-2 text-warning"></i>${pattern}`;
+                patternsFound.appendChild(listItem);
+            });
         } else {
-            strengthMeter.className = 'progress-bar bg-success';
-            strengthLabel.textContent = 'Very Strong';
-            strengthLabel.className = 'badge bg-success';
+            const listItem = document.createElement('li');
+            listItem.className = 'list-group-item';
+            listItem.innerHTML = '<i class="fas fa-check-circle me-2 text-success"></i>No common patterns detected';
+            patternsFound.appendChild(listItem);
         }
-        
-        // Update security rating stars
-        if (securityRating) {
-            const stars = securityRating.querySelectorAll('.rating-star');
-            let ratingStars = 1;
-            
-            if (data.score >= 80) ratingStars = 5;
-            else if (data.score >= 60) ratingStars = 4;
-            else if (data.score >= 40) ratingStars = 3;
-            else if (data.score >= 20) ratingStars = 2;
-            
-            stars.forEach((star, index) => {
-                if (index < ratingStars) {
-                    star.classList.add('active');
-                } else {
-                    star.classList.remove('active');
-                }
-            });
+        if (data.is_common) {
+            const listItem = document.createElement('li');
+            listItem.className = 'list-group-item';
+            listItem.innerHTML = '<i class="fas fa-exclamation-circle me-2 text-danger"></i><strong>Warning:</strong> This is a commonly used password found in data breaches';
+            patternsFound.appendChild(listItem);
         }
         
+        updateDistributionChart(data.char_distribution, true);
+        document.getElementById('results-section').classList.remove('d-none');
+    }
+    
+    // Update the UI with analysis results
+    function updateAnalysisResults(data, scrollToResults = true) {
+        updateStrengthMeter(data);
+        
         // Update detailed stats with animation
         animateCountUp(entropyValue, data.entropy);
         animateCountUp(lengthValue, data.length);
         
-        // Style time to crack based on security level
-        timeToCrack.textContent = data.time_to_crack;
-        timeToCrack.className = 'badge rounded-pill';
-        
-        if (data.time_to_crack.includes('century') || data.time_to_crack.includes('million')) {
-            timeToCrack.classList.add('bg-success');
-        } else if (data.time_to_crack.includes('year') || data.time_to_crack.includes('month')) {
-            timeToCrack.classList.add('bg-info');
-        } else if (data.time_to_crack.includes('week') || data.time_to_crack.includes('day')) {
-            timeToCrack.classList.add('bg-warning');
-        } else {
-            timeToCrack.classList.add('bg-danger');
-        }
+        updateTimeToCrack(data.crack_time);
         
         // Update patterns found with animation
         patternsFound.innerHTML = '';
@@ -386,7 +466,16 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         
         // Update suggestions if available
-        if (data.suggestions) {
+        if (data.suggestions_url) {
+            // Streamed separately; show a placeholder until the first part arrives
+            const loadingText = (data.ui_text && data.ui_text.loading) || 'Generating suggestions...';
+            suggestions.innerHTML = '';
+            const placeholder = document.createElement('div');
+            placeholder.className = 'alert alert-info';
+            placeholder.innerHTML = '<span class="spinner-border spinner-border-sm me-2" role="status"></span>';
+            placeholder.appendChild(document.createTextNode(loadingText));
+            suggestions.appendChild(placeholder);
+        } else if (data.suggestions) {
             if (typeof data.suggestions === 'string') {
                 try {
                     const suggestionsObj = JSON.parse(data.suggestions);
@@ -416,21 +505,100 @@ document.addEventListener('DOMContentLoaded', function() {
         setTimeout(() => {
             resultsSection.style.opacity = '1';
             resultsSection.style.transform = 'translateY(0)';
-            // Scroll to results
-            resultsSection.scrollIntoView({ behavior: 'smooth' });
+            // Scroll to results unless the user is still at the keyboard
+            if (scrollToResults) {
+                resultsSection.scrollIntoView({ behavior: 'smooth' });
+            }
         }, 100);
     }
     
-    // Update the suggestions panel with enhanced UI
-    function updateSuggestions(suggestionsData) {
+    // Update the strength meter, label and rating stars for a score
+    function updateStrengthMeter(data) {
+        // Update strength meter with animation
+        strengthMeter.style.transition = 'width 1s cubic-bezier(0.19, 1, 0.22, 1)';
+        setTimeout(() => {
+            strengthMeter.style.width = data.score + '%';
+            strengthMeter.setAttribute('aria-valuenow', data.score);
+        }, 100);
+        
+        // Set the appropriate color based on score
+        if (data.score < 20) {
+            strengthMeter.className = 'progress-bar bg-danger';
+            strengthLabel.textContent = 'Very Weak';
+            strengthLabel.className = 'badge bg-danger';
+        } else if (data.score < 40) {
+            strengthMeter.className = 'progress-bar bg-danger';
+            strengthLabel.textContent = 'Weak';
+            strengthLabel.className = 'badge bg-danger';
+        } else if (data.score < 60) {
+            strengthMeter.className = 'progress-bar bg-warning';
+            strengthLabel.textContent = 'Moderate';
+            strengthLabel.className = 'badge bg-warning';
+        } else if (data.score < 80) {
+            strengthMeter.className = 'progress-bar bg-success';
+            strengthLabel.textContent = 'Strong';
+            strengthLabel.className = 'badge bg-success';
+        } else {
+            strengthMeter.className = 'progress-bar bg-success';
+            strengthLabel.textContent = 'Very Strong';
+            strengthLabel.className = 'badge bg-success';
+        }
+        
+        // Update security rating stars
+        if (securityRating) {
+            const stars = securityRating.querySelectorAll('.rating-star');
+            let ratingStars = 1;
+            
+            if (data.score >= 80) ratingStars = 5;
+            else if (data.score >= 60) ratingStars = 4;
+            else if (data.score >= 40) ratingStars = 3;
+            else if (data.score >= 20) ratingStars = 2;
+            
+            stars.forEach((star, index) => {
+                if (index < ratingStars) {
+                    star.classList.add('active');
+                } else {
+                    star.classList.remove('active');
+                }
+            });
+        }
+    }
+    
+    // Badge color for each crack-time unit; shorter units are shown in red
+    const CRACK_TIME_CLASSES = {
+        centuries: 'bg-success',
+        years: 'bg-info',
+        months: 'bg-info',
+        days: 'bg-warning'
+    };
+    
+    // Show the time to crack, colored by security level
+    function updateTimeToCrack(crackTime) {
+        timeToCrack.textContent = crackTime.display;
+        timeToCrack.className = 'badge rounded-pill';
+        timeToCrack.classList.add(CRACK_TIME_CLASSES[crackTime.unit] || 'bg-danger');
+        
+        // List every attacker profile in the tooltip
+        if (crackTime.profiles) {
+            timeToCrack.title = Object.entries(crackTime.profiles)
+                .map(([name, estimate]) => `${name.replace(/_/g, ' ')}: ${estimate.display}`)
+                .join('\n');
+        }
+    }
+    
+    // Update the suggestions panel with enhanced UI; without animation when
+    // re-rendering suggestions that are still streaming in
+    function updateSuggestions(suggestionsData, animate = true) {
         suggestions.innerHTML = '';
         
         // Create the main card with animation
         const card = document.createElement('div');
         card.className = 'card';
-        card.style.opacity = '0';
-        card.style.transform = 'translateY(20px)';
-        card.style.transition = 'all 0.5s ease';
+        if (animate) {
+            card.style.opacity = '0';
+            card.style.transform = 'translateY(20px)';
+            card.style.transition = 'all 0.5s ease';
+        }
         
         // Add the award ribbon
         const ribbon = document.createElement('div');
@@ -550,10 +718,12 @@ document.addEventListener('DOMContentLoaded', function() {
                     const listItem = document.createElement('li');
                     listItem.className = 'list-group-item';
                     listItem.innerHTML = `<i class="fas fa-exclamation-circle me-2 text-warning"></i>${detail}`;
-                    listItem.style.opacity = '0';
-                    listItem.style.transform = 'translateY(10px)';
-                    listItem.style.transition = 'all 0.3s ease';
-                    listItem.style.transitionDelay = `${index * 0.1}s`;
+                    if (animate) {
+                        listItem.style.opacity = '0';
+                        listItem.style.transform = 'translateY(10px)';
+                        listItem.style.transition = 'all 0.3s ease';
+                        listItem.style.transitionDelay = `${index * 0.1}s`;
+                    }
                     vulList.appendChild(listItem);
                     
                     // Animation will be triggered after card is added to DOM
@@ -567,6 +737,10 @@ document.addEventListener('DOMContentLoaded', function() {
         card.appendChild(cardBody);
         suggestions.appendChild(card);
         
+        if (!animate) {
+            return;
+        }
+        
         // Trigger animations after card is in DOM
         setTimeout(() => {
             card.style.opacity = '1';
@@ -611,11 +785,25 @@ document.addEventListener('DOMContentLoaded', function() {
     }
     
     // Update the character distribution chart with enhanced visuals
-    function updateDistributionChart(distribution) {
+    function updateDistributionChart(distribution, inPlace = false) {
         if (!distribution || !charDistributionChart) {
             return;
         }
         
+        const values = [
+            distribution.lowercase || 0,
+            distribution.uppercase || 0,
+            distribution.digits || 0,
+            distribution.special || 0
+        ];
+        
+        // While typing, update the existing chart instead of rebuilding it
+        if (inPlace && chart) {
+            chart.data.datasets[0].data = values;
+            chart.update('none');
+            return;
+        }
+        
         // Destroy existing chart if it exists
         if (chart) {
             chart.destroy();
@@ -633,12 +821,7 @@ document.addEventListener('DOMContentLoaded', function() {
             labels: ['Lowercase', 'Uppercase', 'Digits', 'Special'],
             datasets: [{
                 label: 'Character Distribution',
-                data: [
-                    distribution.lowercase || 0,
-                    distribution.uppercase || 0,
-                    distribution.digits || 0,
-                    distribution.special || 0
-                ],
+                data: values,
                 backgroundColor: backgroundColors,
                 borderColor: backgroundColors.map(color => color.replace('0.8', '1')),
                 borderWidth: 2,
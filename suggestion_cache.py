@@ -0,0 +1,171 @@
+"""
+Reuse of LLM suggestions across passwords with the same weakness profile.
+
+The prompt sent to the LLM is built from a handful of analysis fields, and
+most passwords share one of a small number of combinations of them. A
+response is stored as a template under a fingerprint of those fields and
+the language; a later password with the same fingerprint gets the template
+filled in for it instead of a Groq call.
+
+Templates never hold a password. The password, the suggested replacement
+and the exact entropy are swapped for placeholders, and a response that
+still quotes part of the password (any three characters of it in a row,
+symbols included) is too specific to share and is not stored.
+
+The LLM's replacement was made for the password it saw, so a hit gets a
+freshly generated one, and sentences that talk about the LLM's own
+replacement are dropped before a response is stored.
+"""
+import hashlib
+import json
+import re
+import threading
+
+from ttl_cache import TTLCache
+
+PASSWORD_PLACEHOLDER = '{password}'
+IMPROVED_PLACEHOLDER = '{improved_password}'
+ENTROPY_PLACEHOLDER = '{entropy}'
+
+# Characters of the password in a row that a shared template may not contain
+MIN_QUOTED_LENGTH = 3
+
+# A sentence with its closing punctuation and the space after it
+_SENTENCE = re.compile(r'.*?(?:[.!?](?=\s|$)|[。！？]|$)\s*', re.DOTALL)
+
+
+def _length_bucket(length):
+    """Exact below 13 characters, where responses tend to cite the length"""
+    if length <= 12:
+        return str(length)
+    if length <= 15:
+        return '13-15'
+    return '16-19' if length <= 19 else '20+'
+
+
+def fingerprint(analysis_results, language):
+    """Key for the prompt-relevant parts of an analysis, without the password"""
+    features = analysis_results.get('features', {})
+    profile = {
+        'language': language,
+        'patterns': sorted(analysis_results.get('patterns', [])),
+        'is_common': bool(analysis_results.get('is_common', False)),
+        'length': _length_bucket(analysis_results.get('length', 0)),
+        'entropy': int(analysis_results.get('entropy', 0) // 5) * 5,
+        'classes': [bool(features.get(name, False))
+                    for name in ('has_lowercase', 'has_uppercase', 'has_digit', 'has_special')]
+    }
+    return hashlib.sha256(json.dumps(profile, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _quotes_password(text, password):
+    """Whether text contains MIN_QUOTED_LENGTH or more consecutive characters of password"""
+    for placeholder in (PASSWORD_PLACEHOLDER, IMPROVED_PLACEHOLDER, ENTROPY_PLACEHOLDER):
+        text = text.replace(placeholder, ' ')
+    text, password = text.lower(), password.lower()
+    size = min(MIN_QUOTED_LENGTH, len(password))
+    return size > 0 and any(password[i:i + size] in text for i in range(len(password) - size + 1))
+
+
+def _drop_improved_sentences(text):
+    """text without the sentences that mention the LLM's replacement password"""
+    sentences = _SENTENCE.findall(text)
+    return ''.join(s for s in sentences if IMPROVED_PLACEHOLDER not in s).strip()
+
+
+def _replace_whole(text, old, new, word_chars=r'[^\W_]'):
+    """Replace occurrences of old that are not part of a longer word or number"""
+    if not old:
+        return text
+    pattern = rf'(?<!{word_chars}){re.escape(old)}(?!{word_chars})'
+    return re.sub(pattern, lambda _: new, text, flags=re.IGNORECASE)
+
+
+class SuggestionCache:
+    """LRU/TTL store of suggestion templates, with hit and latency accounting"""
+
+    def __init__(self, max_entries=2000, ttl_seconds=86400):
+        self._templates = TTLCache(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.too_specific = 0
+
+    def get(self, password, analysis_results, language, improve):
+        """Suggestions for this password from a stored template, or None
+
+        The LLM's improved password was specific to the password it saw, so
+        improve() supplies a new one on a hit.
+        """
+        template = self._templates.get(fingerprint(analysis_results, language))
+        if template is None:
+            return None
+
+        improved_password = improve()
+        entropy = str(analysis_results.get('entropy', ''))
+
+        def fill(text):
+            return (text.replace(PASSWORD_PLACEHOLDER, password)
+                    .replace(IMPROVED_PLACEHOLDER, improved_password)
+                    .replace(ENTROPY_PLACEHOLDER, entropy))
+
+        details = template['vulnerability_details']
+        return {
+            'improved_password': improved_password,
+            'reasoning': fill(template['reasoning']),
+            'vulnerability_details': [fill(d) for d in details] if isinstance(details, list) else fill(details)
+        }
+
+    def put(self, password, analysis_results, language, suggestions):
+        """Store suggestions as a template; False if they are specific to this password"""
+        template = self._make_template(password, analysis_results, suggestions)
+        if template is None:
+            with self._lock:
+                self.too_specific += 1
+            return False
+        self._templates.put(fingerprint(analysis_results, language), template)
+        return True
+
+    def _make_template(self, password, analysis_results, suggestions):
+        improved = str(suggestions.get('improved_password') or '')
+        entropy = str(analysis_results.get('entropy', ''))
+
+        def generalize(text):
+            text = _replace_whole(str(text), improved, IMPROVED_PLACEHOLDER)
+            text = _replace_whole(text, password, PASSWORD_PLACEHOLDER)
+            text = _replace_whole(text, entropy, ENTROPY_PLACEHOLDER, word_chars=r'[\d.]')
+            # A hit gets a different replacement, which these would not describe
+            return _drop_improved_sentences(text)
+
+        reasoning = generalize(suggestions.get('reasoning', ''))
+        details = suggestions.get('vulnerability_details', [])
+        if isinstance(details, list):
+            details = [d for d in (generalize(d) for d in details) if d]
+        else:
+            details = generalize(details)
+        if not reasoning or not details:
+            return None
+
+        # Anything still quoting the password would leak it to other users
+        text = ' '.join([reasoning] + (details if isinstance(details, list) else [details]))
+        if _quotes_password(text, password):
+            return None
+        return {'reasoning': reasoning, 'vulnerability_details': details}
+
+    def record_llm_call(self, seconds):
+        """Count one completed LLM call, to estimate the latency each hit avoids"""
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    def stats(self):
+        stats = self._templates.stats()
+        with self._lock:
+            mean_llm = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+            stats.update({
+                'llm_calls': self.llm_calls,
+                'mean_llm_latency_ms': round(mean_llm * 1000, 1),
+                'avoided_llm_seconds': round(stats['hits'] * mean_llm, 2),
+                'too_specific_to_cache': self.too_specific
+            })
+        return stats
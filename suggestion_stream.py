@@ -0,0 +1,100 @@
+"""
+Server-Sent Events delivery of LLM suggestions.
+
+/analyze_password answers as soon as the local analysis is done, with a
+one-time URL for its suggestions instead of waiting for the LLM. The
+browser opens that URL with EventSource and receives:
+
+    event: partial      the suggestion fields readable so far (JSON)
+    event: done         the final suggestions, parsed and localized (JSON)
+
+The password waits in memory only until its stream is opened or the
+handle expires (expired handles are purged by a sweeper thread), and
+each handle can be streamed once.
+"""
+import json
+import logging
+import math
+import secrets
+import threading
+
+from ai_suggestions import stream_ai_suggestions
+from ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SuggestionJobs:
+    """Analyses waiting for their suggestion stream, keyed by a random handle
+
+    There is room for expected_rate new analyses per second over the TTL.
+    When it is full, create() refuses the job rather than evicting a handle
+    a browser may be about to open. Once started, a sweeper thread purges
+    expired jobs every sweep_seconds, so the password of a handle that is
+    never opened is gone within ttl_seconds + sweep_seconds.
+    """
+
+    def __init__(self, ttl_seconds=60, expected_rate=50, max_jobs=None, sweep_seconds=1.0):
+        self.max_jobs = max_jobs or math.ceil(expected_rate * ttl_seconds)
+        self.sweep_seconds = sweep_seconds
+        self._jobs = TTLCache(self.max_jobs, ttl_seconds)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.rejected = 0
+
+    def create(self, password, analysis_results, language):
+        """A handle for streaming this job's suggestions, or None when full"""
+        with self._lock:
+            if len(self._jobs) >= self.max_jobs and not self._jobs.purge_expired():
+                self.rejected += 1
+                logger.warning(f"All {self.max_jobs} suggestion handles are pending, not streaming")
+                return None
+            handle = secrets.token_urlsafe(16)
+            self._jobs.put(handle, (password, analysis_results, language))
+            return handle
+
+    def take(self, handle):
+        """The job for a handle, or None if unknown, expired or already streamed"""
+        return self._jobs.pop(handle)
+
+    def start(self):
+        """Start purging expired jobs in a daemon thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sweep_loop, name='suggestion-jobs', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_seconds):
+            try:
+                self._jobs.purge_expired()
+            except Exception as e:
+                logger.error(f"Error purging suggestion handles: {e}")
+
+    def stats(self):
+        return {
+            'pending': len(self._jobs),
+            'max_jobs': self.max_jobs,
+            'ttl_seconds': self._jobs.ttl_seconds,
+            'rejected': self.rejected,
+            'expired': self._jobs.expirations
+        }
+
+
+def sse_event(name, data):
+    # json.dumps escapes newlines, so the payload always fits one data line
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def stream_events(job):
+    """Server-Sent Events text for one job, as the LLM produces it"""
+    password, analysis_results, language = job
+    for name, data in stream_ai_suggestions(password, analysis_results, language):
+        yield sse_event(name, data)
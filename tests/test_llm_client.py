@@ -0,0 +1,160 @@
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from llm_client import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, DeadlineExceeded, LLMUnavailable,
+                        ResilientLLMClient)
+
+
+class StatusError(Exception):
+    """An SDK-style error response"""
+
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedClient:
+    """OpenAI-style chat client that counts calls and plays back a list of outcomes
+
+    An outcome is an exception to raise, a string to answer with, or, for
+    streams, a list of (delay seconds, text) chunks.
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, timeout=None, stream=False, **params):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        if stream:
+            return self._chunks(outcome)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=outcome))])
+
+    def _chunks(self, chunks):
+        for delay, text in chunks:
+            time.sleep(delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+def resilient(client, clock=None, **kwargs):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30.0, clock=clock or FakeClock())
+    return ResilientLLMClient(client, deadline_seconds=kwargs.pop('deadline_seconds', 2.0),
+                              retries=kwargs.pop('retries', 0), breaker=breaker, **kwargs)
+
+
+def test_breaker_opens_after_threshold_transient_failures():
+    client = ScriptedClient(httpx.ConnectError("connection refused"))
+    llm = resilient(client)
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            llm.complete(model='m', messages=[])
+
+    assert llm.breaker.state == OPEN
+    assert llm.stats()['failed'] == 3
+
+
+def test_open_breaker_fails_fast_without_calling_out():
+    client = ScriptedClient(StatusError(503))
+    llm = resilient(client)
+    for _ in range(3):
+        with pytest.raises(StatusError):
+            llm.complete(model='m', messages=[])
+
+    with pytest.raises(LLMUnavailable):
+        llm.complete(model='m', messages=[])
+    assert client.calls == 3
+    assert llm.stats()['rejected_open'] == 1
+
+
+def test_half_open_probe_closes_breaker_on_success():
+    clock = FakeClock()
+    client = ScriptedClient(StatusError(500), StatusError(500), StatusError(500), 'ok')
+    llm = resilient(client, clock)
+    for _ in range(3):
+        with pytest.raises(StatusError):
+            llm.complete(model='m', messages=[])
+
+    clock.now += 30.0
+    # Only one probe at a time while half-open
+    assert llm.breaker.allow()
+    assert llm.breaker.state == HALF_OPEN
+    assert not llm.breaker.allow()
+    llm.breaker.release_probe()
+
+    assert llm.complete(model='m', messages=[]) == 'ok'
+    assert llm.breaker.state == CLOSED
+    assert llm.breaker.consecutive_failures == 0
+
+
+def test_failed_half_open_probe_reopens_breaker():
+    clock = FakeClock()
+    client = ScriptedClient(httpx.ReadTimeout("timed out"))
+    llm = resilient(client, clock)
+    for _ in range(3):
+        with pytest.raises(httpx.ReadTimeout):
+            llm.complete(model='m', messages=[])
+    assert llm.breaker.times_opened == 1
+
+    clock.now += 30.0
+    with pytest.raises(httpx.ReadTimeout):
+        llm.complete(model='m', messages=[])
+    assert llm.breaker.state == OPEN
+    assert llm.breaker.times_opened == 2
+    assert llm.breaker.opened_at == clock.now
+    assert llm.stats()['timeouts'] == 4
+
+
+def test_client_error_is_not_retried_and_leaves_breaker_unchanged():
+    client = ScriptedClient(StatusError(400))
+    llm = resilient(client, retries=2)
+    for _ in range(5):
+        with pytest.raises(StatusError):
+            llm.complete(model='m', messages=[])
+
+    assert client.calls == 5
+    assert llm.breaker.state == CLOSED
+    assert llm.breaker.consecutive_failures == 0
+    assert llm.stats()['retries'] == 0
+    assert llm.stats()['not_retried'] == 5
+
+
+def test_transient_error_is_retried_within_the_deadline():
+    client = ScriptedClient(StatusError(429), 'ok')
+    llm = resilient(client, retries=1)
+
+    assert llm.complete(model='m', messages=[]) == 'ok'
+    assert client.calls == 2
+    assert llm.stats()['retries'] == 1
+    assert llm.breaker.consecutive_failures == 0
+
+
+def test_stalled_stream_raises_deadline_exceeded():
+    client = ScriptedClient([(0.0, 'a'), (0.0, 'b'), (0.5, 'c')])
+    llm = resilient(client, deadline_seconds=0.2)
+
+    received = []
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        for delta in llm.stream(model='m', messages=[]):
+            received.append(delta)
+
+    assert received == ['a', 'b']
+    assert time.monotonic() - start < 1.0
+    assert llm.stats()['timeouts'] == 1
+    assert llm.breaker.consecutive_failures == 1
+    assert llm.in_flight == 0
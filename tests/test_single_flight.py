@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault('LLM_PROVIDER', 'fallback')
+
+import ai_suggestions
+from llm_client import DeadlineExceeded, ResilientLLMClient
+from single_flight import SingleFlight
+
+WAITERS = 20
+
+ANALYSIS = {
+    'strength': 'weak',
+    'entropy': 28.5,
+    'patterns': ['dictionary word'],
+    'is_common': False,
+    'features': {'length': 8, 'has_lowercase': True, 'has_digit': True}
+}
+
+SUGGESTIONS = {
+    'improved_password': 'M0nkey!Harbor#42',
+    'reasoning': 'Longer and mixes character types.',
+    'vulnerability_details': 'A dictionary word followed by digits.'
+}
+
+
+class CountingClient:
+    """OpenAI-style chat client that counts calls and answers once released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, timeout=None, stream=False, **params):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        message = SimpleNamespace(content=json.dumps(SUGGESTIONS))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def wait_for_waiters(flights, waiters):
+    """Block until `waiters` callers have joined the running flight"""
+    give_up = time.monotonic() + 5
+    while flights.stats()['coalesced'] < waiters:
+        assert time.monotonic() < give_up, "callers did not join the flight"
+        time.sleep(0.005)
+
+
+def run_concurrently(fn, count):
+    results = [None] * count
+    errors = [None] * count
+
+    def call(i):
+        try:
+            results[i] = fn()
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    client = CountingClient()
+    monkeypatch.setattr(ai_suggestions, 'llm_client', ResilientLLMClient(client, deadline_seconds=5.0))
+    monkeypatch.setattr(ai_suggestions, 'suggestion_cache', None)
+    monkeypatch.setattr(ai_suggestions, 'suggestion_flights', SingleFlight())
+    return client
+
+
+def test_identical_requests_share_one_upstream_call(llm):
+    threads, results, errors = run_concurrently(
+        lambda: ai_suggestions.get_ai_suggestions('monkey42', ANALYSIS, 'en'), WAITERS)
+    wait_for_waiters(ai_suggestions.suggestion_flights, WAITERS - 1)
+    llm.release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == [None] * WAITERS
+    assert llm.calls == 1
+    assert all(result == SUGGESTIONS for result in results)
+    # Every caller gets its own copy to modify
+    assert len({id(result) for result in results}) == WAITERS
+
+
+def test_leader_error_reaches_every_waiter():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def failing():
+        calls.append(1)
+        release.wait(5)
+        raise ConnectionError("provider went away")
+
+    threads, results, errors = run_concurrently(lambda: flights.do('key', failing), WAITERS)
+    wait_for_waiters(flights, WAITERS - 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [None] * WAITERS
+    assert all(isinstance(error, ConnectionError) for error in errors)
+    assert len({id(error) for error in errors}) == 1
+    assert flights.stats()['in_flight'] == 0
+
+
+def test_waiters_give_up_at_the_leaders_deadline():
+    flights = SingleFlight()
+    release = threading.Event()
+    outcome = []
+    leader = threading.Thread(target=lambda: outcome.append(flights.do('key', lambda: release.wait(5), 0.2)))
+    leader.start()
+    wait_for_flight = time.monotonic() + 5
+    while flights.stats()['in_flight'] == 0 and time.monotonic() < wait_for_flight:
+        time.sleep(0.005)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        flights.do('key', lambda: None)
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(flights.do_async('key', lambda: None))
+    assert time.monotonic() - start < 1.0
+
+    # Waiters timing out leave the flight intact for its leader
+    release.set()
+    leader.join(5)
+    assert outcome == [True]
+    assert flights.stats() == {'in_flight': 0, 'leaders': 1, 'coalesced': 2}
@@ -1,12 +1,20 @@
 import os
-import pickle
+import argparse
 import logging
-import random
+import math
+import shutil
+import time
 import numpy as np
+import scipy.sparse as sp
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, classification_report
+from hashed_featurizer import HashedNgramFeaturizer
+from forest_inference import ForestArrays
+from linear_inference import LinearArrays
+from model_artifact import featurizer_config, save_model
+from dataset_cache import cached_dataset, file_digest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,100 +49,356 @@ def load_rockyou_dataset(file_path='data/rockyou_sample.txt', max_passwords=1000
     logger.info(f"Loaded {len(passwords)} passwords")
     return passwords
 
-def generate_strong_passwords(count=1000):
+STRONG_CHARS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()_+-=[]{}|;:,.<>?'
+
+def generate_strong_passwords(count=1000, rng=None):
     """Generate strong passwords for training data"""
-    strong_passwords = []
-    chars = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789!@#$%^&*()_+-=[]{}|;:,.<>?'
+    rng = rng if rng is not None else np.random.default_rng()
     
-    for _ in range(count):
-        # Generate a random strong password (12-20 chars, mixed character types)
-        length = random.randint(12, 20)
-        password = ''.join(random.choice(chars) for _ in range(length))
-        strong_passwords.append(password)
+    # Random strong passwords (12-20 chars, mixed character types), drawn
+    # for the whole batch at once and cut into individual passwords
+    lengths = rng.integers(12, 21, size=count)
+    alphabet = np.frombuffer(STRONG_CHARS.encode('ascii'), dtype=np.uint8)
+    text = alphabet[rng.integers(0, len(alphabet), size=int(lengths.sum()))].tobytes().decode('ascii')
     
-    return strong_passwords
+    ends = np.cumsum(lengths).tolist()
+    return [text[end - length:end] for end, length in zip(ends, lengths.tolist())]
+
+# Bump whenever assign_labels changes, so cached datasets are rebuilt
+LABELER_VERSION = 1
+
+# Score contributed by lowercase, uppercase, digit and special characters
+CLASS_WEIGHTS = np.array([1, 2, 2, 3])
 
 def assign_labels(passwords):
-    """Assign strength labels to passwords"""
-    labels = []
-    
-    for password in passwords:
-        # Criteria for password strength
-        length = len(password)
-        has_lower = any(c.islower() for c in password)
-        has_upper = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(not c.isalnum() for c in password)
-        
-        # Calculate a score based on these criteria
-        score = 0
-        
-        # Length contribution (up to 5 points)
-        score += min(5, length / 2)
+    """Assign strength labels to passwords
+    
+    Character classes are looked up once per distinct character and then
+    reduced per password with NumPy, instead of testing every character.
+    """
+    count = len(passwords)
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=count)
+    codes = np.frombuffer(''.join(passwords).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    
+    # Which classes each password contains (lower, upper, digit, special)
+    has_class = np.zeros((count, 4), dtype=bool)
+    if len(codes):
+        unique, inverse = np.unique(codes, return_inverse=True)
+        char_classes = np.array([
+            (c.islower(), c.isupper(), c.isdigit(), not c.isalnum())
+            for c in map(chr, unique.tolist())
+        ], dtype=bool)
+        non_empty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[non_empty]
+        has_class[non_empty] = np.logical_or.reduceat(char_classes[inverse], starts, axis=0)
+    
+    # Length contributes up to 5 points, character types the rest
+    score = np.minimum(5, lengths / 2) + has_class @ CLASS_WEIGHTS
+    
+    # 0=Weak, 1=Medium, 2=Strong
+    return np.where(score < 6, 0, np.where(score < 10, 1, 2)).tolist()
+
+def load_training_data(file_path='data/rockyou_sample.txt', max_passwords=10000, vectorizer=None,
+                       seed=42, use_cache=True):
+    """Labeled, featurized train/test splits, from the dataset cache when possible
+    
+    Returns (splits, cache_directory): a dict with X_train, X_test, y_train
+    and y_test, and the cache entry holding it (None without the cache).
+    """
+    vectorizer = vectorizer or HashedNgramFeaturizer()
+    
+    def build():
+        # Load and prepare data
+        weak_passwords = load_rockyou_dataset(file_path, max_passwords)
+        strong_passwords = generate_strong_passwords(min(1000, len(weak_passwords)),
+                                                     np.random.default_rng(seed))
+        all_passwords = weak_passwords + strong_passwords
         
-        # Character type contribution
-        if has_lower:
-            score += 1
-        if has_upper:
-            score += 2
-        if has_digit:
-            score += 2
-        if has_special:
-            score += 3
+        # Assign labels (0=weak, 1=medium, 2=strong)
+        labels = assign_labels(all_passwords)
         
-        # Assign label based on score
-        if score < 6:
-            labels.append(0)  # Weak
-        elif score < 10:
-            labels.append(1)  # Medium
-        else:
-            labels.append(2)  # Strong
+        # Split, then extract features (stateless, so there is no vocabulary to save)
+        X_train, X_test, y_train, y_test = train_test_split(
+            all_passwords, labels, test_size=0.2, random_state=seed
+        )
+        return {
+            'X_train': vectorizer.transform(X_train),
+            'X_test': vectorizer.transform(X_test),
+            'y_train': np.array(y_train),
+            'y_test': np.array(y_test)
+        }
+    
+    if not use_cache:
+        return build(), None
+    
+    inputs = {
+        'wordlist': file_digest(file_path) if os.path.exists(file_path) else None,
+        'max_passwords': max_passwords,
+        'labeler_version': LABELER_VERSION,
+        'featurizer': featurizer_config(vectorizer)[0],
+        'seed': seed,
+        'test_size': 0.2
+    }
+    return cached_dataset(inputs, build)
+
+def distill_model(teacher, X, C=0.1):
+    """Fit a LinearArrays student to the teacher's class probabilities
+    
+    Every row appears once per class, weighted by the teacher's probability
+    for that class, so the logistic loss is the cross-entropy against the
+    teacher's soft labels rather than its hard predictions.
+    """
+    probs = teacher.predict_proba(X)
+    n_rows, n_classes = probs.shape
+    X_soft = sp.vstack([X] * n_classes, format='csr')
+    y_soft = np.repeat(teacher.classes_, n_rows)
+    weights = probs.T.ravel()
+    keep = weights > 0
     
-    return labels
+    student = LogisticRegression(C=C, max_iter=2000)
+    student.fit(X_soft[keep], y_soft[keep], sample_weight=weights[keep])
+    return LinearArrays.from_sklearn(student)
+
+def single_row_latency(model, X, rows=500):
+    """p50 and p99 seconds of predict_proba on one row, as the web app calls it"""
+    samples = []
+    for i in range(min(rows, X.shape[0])):
+        x = X[i]
+        start = time.perf_counter()
+        model.predict_proba(x)
+        samples.append(time.perf_counter() - start)
+    return np.percentile(samples, 50), np.percentile(samples, 99)
+
+def directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+def report_distillation(teacher, student, X_test, y_test, teacher_path, student_path):
+    """Log how closely the student follows the teacher and what it saves"""
+    teacher_pred = teacher.predict(X_test)
+    student_pred = student.predict(X_test)
+    teacher_p50, _ = single_row_latency(teacher, X_test)
+    student_p50, _ = single_row_latency(student, X_test)
+    teacher_size = directory_size(teacher_path)
+    student_size = directory_size(student_path)
+    
+    logger.info(
+        "Distilled model report:\n"
+        f"  agreement with forest: {np.mean(student_pred == teacher_pred):.4f}\n"
+        f"  accuracy:              forest {accuracy_score(y_test, teacher_pred):.4f}, "
+        f"distilled {accuracy_score(y_test, student_pred):.4f}\n"
+        f"  artifact size:         forest {teacher_size / 1024:.0f} KB, distilled {student_size / 1024:.0f} KB "
+        f"({teacher_size / student_size:.1f}x smaller)\n"
+        f"  one password (p50):    forest {teacher_p50 * 1e6:.0f} us, distilled {student_p50 * 1e6:.0f} us "
+        f"({teacher_p50 / student_p50:.1f}x faster)\n"
+        "Serve it with STRENGTH_MODEL=distilled"
+    )
 
-def train_model():
+def train_model(use_cache=True, distill=True):
     """Train a password strength prediction model"""
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
-    # 1. Load and prepare data
-    weak_passwords = load_rockyou_dataset()
-    strong_passwords = generate_strong_passwords(min(1000, len(weak_passwords)))
+    # 1. Load, label, split and featurize the data
+    vectorizer = HashedNgramFeaturizer()
+    data, _ = load_training_data(vectorizer=vectorizer, use_cache=use_cache)
     
-    # Combine datasets
-    all_passwords = weak_passwords + strong_passwords
+    # 2. Train the model
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(data['X_train'], data['y_train'])
     
-    # Assign labels (0=weak, 1=medium, 2=strong)
-    labels = assign_labels(all_passwords)
+    # 3. Evaluate the model
+    y_pred = model.predict(data['X_test'])
+    accuracy = accuracy_score(data['y_test'], y_pred)
+    logger.info(f"Model accuracy: {accuracy:.2f}")
+    logger.info(f"Classification report:\n{classification_report(data['y_test'], y_pred)}")
     
-    # 2. Split into training and test sets
-    X_train, X_test, y_train, y_test = train_test_split(
-        all_passwords, labels, test_size=0.2, random_state=42
+    # 4. Save the model as plain arrays that workers can memory-map
+    forest = ForestArrays.from_sklearn(model)
+    save_trained_model(
+        forest,
+        vectorizer,
+        {'accuracy': round(accuracy, 4), 'training_samples': data['X_train'].shape[0]}
     )
     
-    # 3. Feature extraction
-    vectorizer = CountVectorizer(analyzer='char', ngram_range=(1, 3))
-    X_train_features = vectorizer.fit_transform(X_train)
-    X_test_features = vectorizer.transform(X_test)
+    # 5. Distill a compact linear model from the forest's probabilities
+    if distill:
+        student = distill_model(forest, data['X_train'])
+        student_accuracy = accuracy_score(data['y_test'], student.predict(data['X_test']))
+        distilled_path = os.path.join('data', 'password_model_distilled')
+        save_model(distilled_path, student, vectorizer, {
+            'accuracy': round(student_accuracy, 4),
+            'agreement': round(float(np.mean(student.predict(data['X_test']) == y_pred)), 4),
+            'distilled_from': 'password_model'
+        })
+        report_distillation(forest, student, data['X_test'], data['y_test'],
+                            os.path.join('data', 'password_model'), distilled_path)
+
+def save_trained_model(forest, vectorizer, metadata):
+    """Write the model artifact to data/password_model"""
+    save_model(os.path.join('data', 'password_model'), forest, vectorizer, metadata)
+    
+    # A student distilled from the previous forest no longer matches it
+    shutil.rmtree(os.path.join('data', 'password_model_distilled'), ignore_errors=True)
     
-    # 4. Train the model
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
-    model.fit(X_train_features, y_train)
+    # Older pickles would otherwise be converted over the new model
+    for legacy_path in ('data/password_model.pkl', 'data/vectorizer.pkl'):
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
     
-    # 5. Evaluate the model
-    y_pred = model.predict(X_test_features)
-    accuracy = accuracy_score(y_test, y_pred)
-    logger.info(f"Model accuracy: {accuracy:.2f}")
-    logger.info(f"Classification report:\n{classification_report(y_test, y_pred)}")
+    logger.info("Model saved to data/password_model")
+
+def count_lines(file_path):
+    """Count lines without decoding the file"""
+    lines = 0
+    last = b''
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block
+    return lines + (1 if last and not last.endswith(b'\n') else 0)
+
+def iter_password_chunks(file_path, chunk_size, max_lines=None):
+    """Yield lists of up to chunk_size passwords, reading the file lazily"""
+    chunk = []
+    with open(file_path, 'r', encoding='latin-1', errors='ignore') as f:
+        for line_number, line in enumerate(f, 1):
+            if max_lines is not None and line_number > max_lines:
+                break
+            password = line.strip()
+            if password:
+                chunk.append(password)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+def train_streaming(file_path, chunk_size=200_000, n_estimators=100, max_leaf_nodes=20_000,
+                    strong_ratio=0.1, holdout_size=20_000, holdout_every=50, max_lines=None,
+                    n_jobs=1, seed=42):
+    """Train on a whole wordlist in bounded memory
+    
+    The wordlist is streamed in chunks of chunk_size passwords. Each chunk is
+    labeled and featurized on its own and fits its own small forest, with
+    the n_estimators trees split evenly across chunks; the forests are
+    merged into one model at the end. With more chunks than trees, one tree
+    is fitted on each of n_estimators evenly spaced chunks and the others
+    are skipped. Peak memory is one chunk's feature matrix and forest fit
+    plus the finished trees, which n_estimators and max_leaf_nodes cap
+    however long the wordlist is.
+    """
+    os.makedirs('data', exist_ok=True)
+    start = time.perf_counter()
     
-    # 6. Save the model and vectorizer
-    with open('data/password_model.pkl', 'wb') as f:
-        pickle.dump(model, f)
+    total = count_lines(file_path)
+    if max_lines is not None:
+        total = min(total, max_lines)
+    n_chunks = max(1, math.ceil(total / chunk_size))
+    # Cumulative shares, so the counts add up to exactly n_estimators
+    trees_per_chunk = [(i + 1) * n_estimators // n_chunks - i * n_estimators // n_chunks
+                       for i in range(n_chunks)]
+    logger.info(f"Training {n_estimators} trees on up to {total} passwords in {n_chunks} chunks, "
+                f"using {sum(1 for trees in trees_per_chunk if trees)} of them")
+    
+    rng = np.random.default_rng(seed)
+    vectorizer = HashedNgramFeaturizer()
+    forests = []
+    holdout = []
+    training_samples = 0
+    
+    for index, chunk in enumerate(iter_password_chunks(file_path, chunk_size, max_lines)):
+        # Every holdout_every-th password is kept back for evaluation
+        if len(holdout) < holdout_size:
+            holdout.extend(chunk[::holdout_every][:holdout_size - len(holdout)])
+            chunk = [p for i, p in enumerate(chunk) if i % holdout_every]
+        
+        n_trees = trees_per_chunk[index] if index < n_chunks else 0
+        if not n_trees:
+            continue
+        passwords = chunk + generate_strong_passwords(int(len(chunk) * strong_ratio), rng)
+        labels = assign_labels(passwords)
+        X = vectorizer.transform(passwords)
+        
+        model = RandomForestClassifier(
+            n_estimators=n_trees, max_leaf_nodes=max_leaf_nodes,
+            n_jobs=n_jobs, random_state=seed + index
+        )
+        model.fit(X, labels)
+        forests.append(ForestArrays.from_sklearn(model))
+        training_samples += len(passwords)
+        
+        # Drop this chunk's data before reading the next one
+        del passwords, labels, X, model
+        logger.info(f"Chunk {index + 1}/{n_chunks}: {training_samples} samples, "
+                    f"{time.perf_counter() - start:.0f}s")
+    
+    if not forests:
+        raise ValueError(f"No passwords found in {file_path}")
+    forest = ForestArrays.concatenate(forests, classes=[0, 1, 2])
+    del forests
+    logger.info(f"Final model: {len(forest.roots)} trees, {len(forest.threshold)} nodes")
+    
+    # Evaluate on the held-out passwords plus fresh strong ones, in chunks
+    test = holdout + generate_strong_passwords(int(len(holdout) * strong_ratio), rng)
+    y_test = assign_labels(test)
+    y_pred = np.concatenate([
+        forest.predict(vectorizer.transform(test[i:i + chunk_size]))
+        for i in range(0, len(test), chunk_size)
+    ]) if test else np.zeros(0, dtype=np.int64)
+    accuracy = accuracy_score(y_test, y_pred) if test else 0.0
+    logger.info(f"Model accuracy: {accuracy:.4f} on {len(test)} held-out passwords")
+    if test:
+        logger.info(f"Classification report:\n{classification_report(y_test, y_pred)}")
+    
+    save_trained_model(forest, vectorizer, {
+        'accuracy': round(accuracy, 4),
+        'training_samples': training_samples,
+        'chunks': n_chunks,
+        'source': os.path.basename(file_path)
+    })
+    
+    # ru_maxrss is in kilobytes on Linux
+    try:
+        import resource
+        peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        logger.info(f"Finished in {time.perf_counter() - start:.0f}s, peak memory {peak_mb:.0f} MB")
+    except ImportError:
+        pass
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the password strength model")
+    parser.add_argument('--stream', metavar='WORDLIST',
+                        help="train on this whole wordlist in chunks instead of the bundled sample")
+    parser.add_argument('--chunk-size', type=int, default=200_000,
+                        help="passwords held in memory at once when streaming (default: 200000)")
+    parser.add_argument('--trees', type=int, default=100, help="trees in the final model (default: 100)")
+    parser.add_argument('--max-leaf-nodes', type=int, default=20_000,
+                        help="leaf limit per tree, which bounds model size (default: 20000)")
+    parser.add_argument('--max-lines', type=int, default=None, help="read at most this many lines")
+    parser.add_argument('--jobs', type=int, default=1, help="parallel jobs for fitting each chunk (-1: all cores)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="rebuild the featurized dataset instead of using data/dataset_cache")
+    parser.add_argument('--no-distill', action='store_true',
+                        help="skip training the compact distilled model")
+    parser.add_argument('--publish', nargs='?', const='forest', choices=['forest', 'distilled'],
+                        help="also copy the trained model into the model registry (data/models), "
+                             "where running servers pick it up")
+    args = parser.parse_args(argv)
+    if args.publish == 'distilled' and (args.no_distill or args.stream):
+        parser.error("--publish distilled needs the distilled model; drop --no-distill and --stream")
     
-    with open('data/vectorizer.pkl', 'wb') as f:
-        pickle.dump(vectorizer, f)
+    if args.stream:
+        train_streaming(args.stream, chunk_size=args.chunk_size, n_estimators=args.trees,
+                        max_leaf_nodes=args.max_leaf_nodes, max_lines=args.max_lines, n_jobs=args.jobs)
+    else:
+        train_model(use_cache=not args.no_cache, distill=not args.no_distill)
     
-    logger.info("Model and vectorizer saved to data directory")
+    if args.publish:
+        # Imported here; the registry pulls in the serving-side model code
+        from model_registry import publish
+        name = 'password_model_distilled' if args.publish == 'distilled' else 'password_model'
+        version = publish(os.path.join('data', name))
+        logger.info(f"Published data/{name} as model version {version}")
 
 if __name__ == "__main__":
-    train_model()
+    main()
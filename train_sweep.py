@@ -0,0 +1,123 @@
+"""
+Hyperparameter sweep for the password strength forest.
+
+Builds (or loads from data/dataset_cache) the train_model.py dataset once,
+then fits every estimator configuration on a process pool. Workers read
+the cached dataset from disk rather than receiving a pickled copy. Fitted
+forests come back as ForestArrays, and single-row latency is measured in
+this process once the pool has finished, so timings do not compete with
+fits.
+
+    python train_sweep.py [--configs sweep.json] [--workers 4] [--output data/sweep_results.csv]
+
+A configs file is a JSON list of RandomForestClassifier keyword arguments.
+"""
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+from dataset_cache import CACHE_DIR, load_dataset
+from forest_inference import ForestArrays
+from train_model import load_training_data, single_row_latency
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIGS = [
+    {'n_estimators': 25},
+    {'n_estimators': 50},
+    {'n_estimators': 100},
+    {'n_estimators': 100, 'max_depth': 20},
+    {'n_estimators': 100, 'min_samples_leaf': 2},
+    {'n_estimators': 200, 'max_leaf_nodes': 500}
+]
+
+RESULT_FIELDS = ['config', 'accuracy', 'trees', 'nodes', 'size_kb', 'fit_s', 'p50_us', 'p99_us']
+
+
+def fit_config(task):
+    """Fit and score one configuration; runs in a pool worker"""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.metrics import accuracy_score
+
+    dataset_dir, config = task
+    data = load_dataset(dataset_dir)
+    params = dict({'random_state': 42}, **config)
+
+    start = time.perf_counter()
+    model = RandomForestClassifier(**params).fit(data['X_train'], data['y_train'])
+    fit_s = time.perf_counter() - start
+
+    forest = ForestArrays.from_sklearn(model)
+    accuracy = accuracy_score(data['y_test'], forest.predict(data['X_test']))
+    return config, forest, accuracy, fit_s
+
+
+def run_sweep(configs, workers=None):
+    """Fit every configuration and return one result row per config"""
+    # Workers read the dataset from the cache, so it has to be writable
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    _, dataset_dir = load_training_data()
+    X_test = load_dataset(dataset_dir)['X_test']
+
+    tasks = [(dataset_dir, config) for config in configs]
+    with multiprocessing.Pool(workers or min(len(configs), os.cpu_count() or 1)) as pool:
+        fitted = []
+        for result in pool.imap(fit_config, tasks):
+            fitted.append(result)
+            logger.info(f"Fitted {result[0]}: accuracy {result[2]:.4f}")
+
+    results = []
+    for config, forest, accuracy, fit_s in fitted:
+        p50, p99 = single_row_latency(forest, X_test)
+        size = sum(array.nbytes for array in forest.arrays().values())
+        results.append({
+            'config': json.dumps(config, sort_keys=True),
+            'accuracy': round(accuracy, 4),
+            'trees': len(forest.roots),
+            'nodes': len(forest.threshold),
+            'size_kb': round(size / 1024, 1),
+            'fit_s': round(fit_s, 2),
+            'p50_us': round(p50 * 1e6, 1),
+            'p99_us': round(p99 * 1e6, 1)
+        })
+    return results
+
+
+def print_table(results, out=sys.stdout):
+    widths = {field: max(len(field), *(len(str(row[field])) for row in results)) for field in RESULT_FIELDS}
+    out.write('  '.join(field.ljust(widths[field]) for field in RESULT_FIELDS).rstrip() + '\n')
+    for row in results:
+        out.write('  '.join(str(row[field]).ljust(widths[field]) for field in RESULT_FIELDS).rstrip() + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep password strength model configurations")
+    parser.add_argument('--configs', help="JSON file with a list of RandomForestClassifier arguments")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--output', default=os.path.join('data', 'sweep_results.csv'),
+                        help="CSV results table (default: data/sweep_results.csv)")
+    args = parser.parse_args(argv)
+
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs, encoding='utf-8') as f:
+            configs = json.load(f)
+
+    results = run_sweep(configs, args.workers)
+    print_table(results)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    logger.info(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 Module for managing translations for the password analyzer.
 This provides translations for password feedback in multiple languages.
 """
+from crack_time import format_duration
 
 # Dictionary of translations by language code
 TRANSLATIONS = {
@@ -36,7 +37,8 @@ TRANSLATIONS = {
             'days': 'days',
             'months': 'months',
             'years': 'years',
-            'centuries': 'centuries'
+            'centuries': 'centuries',
+            'less_than_second': '< 1 second'
         },
         'ui': {
             'loading': 'Our AI security advisor is analyzing your password...',
@@ -77,7 +79,8 @@ TRANSLATIONS = {
             'days': 'días',
             'months': 'meses',
             'years': 'años',
-            'centuries': 'siglos'
+            'centuries': 'siglos',
+            'less_than_second': 'menos de un segundo'
         },
         'ui': {
             'loading': 'Nuestro asesor de seguridad IA está analizando tu contraseña...',
@@ -118,7 +121,8 @@ TRANSLATIONS = {
             'days': 'jours',
             'months': 'mois',
             'years': 'années',
-            'centuries': 'siècles'
+            'centuries': 'siècles',
+            'less_than_second': 'moins d\'une seconde'
         },
         'ui': {
             'loading': 'Notre conseiller en sécurité IA analyse votre mot de passe...',
@@ -159,7 +163,8 @@ TRANSLATIONS = {
             'days': 'Tage',
             'months': 'Monate',
             'years': 'Jahre',
-            'centuries': 'Jahrhunderte'
+            'centuries': 'Jahrhunderte',
+            'less_than_second': 'weniger als eine Sekunde'
         },
         'ui': {
             'loading': 'Unser KI-Sicherheitsberater analysiert Ihr Passwort...',
@@ -200,7 +205,8 @@ TRANSLATIONS = {
             'days': '天',
             'months': '月',
             'years': '年',
-            'centuries': '世纪'
+            'centuries': '世纪',
+            'less_than_second': '不到一秒'
         },
         'ui': {
             'loading': '我们的AI安全顾问正在分析您的密码...',
@@ -241,7 +247,8 @@ TRANSLATIONS = {
             'days': '日',
             'months': '月',
             'years': '年',
-            'centuries': '世紀'
+            'centuries': '世紀',
+            'less_than_second': '1秒未満'
         },
         'ui': {
             'loading': 'AIセキュリティアドバイザーがパスワードを分析しています...',
@@ -282,7 +289,8 @@ TRANSLATIONS = {
             'days': 'дней',
             'months': 'месяцев',
             'years': 'лет',
-            'centuries': 'веков'
+            'centuries': 'веков',
+            'less_than_second': 'меньше секунды'
         },
         'ui': {
             'loading': 'Наш ИИ-консультант по безопасности анализирует ваш пароль...',
@@ -415,4 +423,30 @@ def get_time_unit(unit, language='en'):
     Returns:
         Localized time unit
     """
-    return get_translation(unit, 'time_units', language)
\ No newline at end of file
+    return get_translation(unit, 'time_units', language)
+
+def localize_crack_time(crack_time, language='en'):
+    """
+    Localize a structured crack-time estimate.
+    
+    Adds a localized 'label' for the unit and a 'display' string to the
+    estimate and to each attacker profile. The input is not modified, so
+    cached analysis results can be localized safely.
+    
+    Args:
+        crack_time: Estimate returned by crack_time.estimate
+        language: Language code (default: 'en')
+        
+    Returns:
+        Localized copy of the estimate
+    """
+    def localize(entry):
+        label = get_time_unit(entry['unit'], language)
+        display = format_duration(entry, label, get_time_unit('less_than_second', language))
+        return {**entry, 'label': label, 'display': display}
+    
+    localized = localize(crack_time)
+    localized['profiles'] = {
+        name: localize(entry) for name, entry in crack_time.get('profiles', {}).items()
+    }
+    return localized
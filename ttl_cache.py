@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a size bound and per-entry time-to-live"""
+
+    def __init__(self, max_entries=10000, ttl_seconds=300, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        # Bumped by clear(); writers computed before a clear are dropped
+        self.generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Return the cached value, or default when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, generation=None):
+        """Store a value; a stale generation means it predates a clear()"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """Remove and return a live value, or default; only one caller gets it"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] <= self._clock():
+                return default
+            return entry[1]
+
+    def purge_expired(self):
+        """Drop every expired entry now, rather than when it is next looked up"""
+        with self._lock:
+            now = self._clock()
+            expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def values(self):
+        """Snapshot of the live values, oldest first"""
+        with self._lock:
+            now = self._clock()
+            return [value for expires_at, value in self._entries.values() if expires_at > now]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        """Counters describing how the cache has been used"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'generation': self.generation
+            }